@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from inspect import getmembers, isfunction
 import json
 from pathlib import Path
@@ -6,9 +8,13 @@ import sys
 from box import Box
 
 from robottelo.logging import logger
-from robottelo.utils.ohsnap import dogfood_repository
+from robottelo.utils.ohsnap import OhsnapSession, dogfood_repository
 from robottelo.utils.url import is_url
 
+# key of the cache file holding the Ohsnap responses used for ETag/If-Modified-Since revalidation
+OHSNAP_RESPONSES = '_ohsnap_responses'
+OHSNAP_WORKERS = 8
+
 
 def post(settings):
     settings_cache_path = Path(
@@ -17,8 +23,9 @@ def post(settings):
     if settings.server.version.source == 'nightly':
         data = Box({'REPOS': {}})
     elif getattr(settings.robottelo.settings, 'get_fresh', True):
-        data = get_repos_config(settings)
-        write_cache(settings_cache_path, data)
+        responses = read_responses(settings_cache_path)
+        data = get_repos_config(settings, responses)
+        write_cache(settings_cache_path, data, responses)
     else:
         try:
             data = read_cache(settings_cache_path)
@@ -34,14 +41,25 @@ def post(settings):
     return data
 
 
-def write_cache(path, data):
-    path.write_text(json.dumps(data, indent=4))
+def write_cache(path, data, responses=None):
+    content = {**data, OHSNAP_RESPONSES: responses} if responses else data
+    path.write_text(json.dumps(content, indent=4))
     logger.info(f'Generated settings cache file {path}')
 
 
 def read_cache(path):
     logger.info(f'Using settings cache file: {path}')
-    return Box(json.loads(path.read_text()))
+    data = Box(json.loads(path.read_text()))
+    data.pop(OHSNAP_RESPONSES, None)
+    return data
+
+
+def read_responses(path):
+    """Return the Ohsnap responses stored in the settings cache file for revalidation"""
+    try:
+        return json.loads(path.read_text()).get(OHSNAP_RESPONSES) or {}
+    except (OSError, ValueError):
+        return {}
 
 
 def config_migrations(settings, data):
@@ -69,11 +87,15 @@ def config_migrations(settings, data):
     logger.info('Finished running config migration hooks')
 
 
-def get_repos_config(settings):
+def get_repos_config(settings, responses=None):
+    """Return the repositories config fetched from Ohsnap
+
+    :param dict responses: earlier Ohsnap responses, revalidated and updated in place
+    """
     data = {}
     # check if the Ohsnap URL is valid, our sample configuration does not contain a valid URL
     if is_url(settings.ohsnap.host):
-        data.update(get_ohsnap_repos(settings))
+        data.update(get_ohsnap_repos(settings, responses))
     else:
         logger.error(
             'The Ohsnap URL is invalid! Post-configuration hooks will not run. '
@@ -82,46 +104,60 @@ def get_repos_config(settings):
     return Box({'REPOS': data})
 
 
-def get_ohsnap_repos(settings):
-    data = {}
-    data['CAPSULE_REPO'] = get_ohsnap_repo_url(
-        settings,
-        repo='capsule',
-        product='capsule',
-        release=settings.capsule.version.release,
-        os_release=settings.capsule.version.rhel_version,
-        snap=settings.capsule.version.snap,
-    )
+def _results(data):
+    """Replace the futures in a (nested) dict by their results"""
+    return {
+        key: _results(value) if isinstance(value, dict) else value.result()
+        for key, value in data.items()
+    }
 
-    data['SATELLITE_REPO'] = get_ohsnap_repo_url(
-        settings,
-        repo='satellite',
-        product='satellite',
-        release=settings.server.version.release,
-        os_release=settings.server.version.rhel_version,
-        snap=settings.server.version.snap,
-    )
 
-    data['SATCLIENT_REPO'] = get_dogfood_satclient_repos(settings)
+def get_ohsnap_repos(settings, responses=None):
+    """Fetch the repositories concurrently over a pooled, revalidating session
 
-    data['SATUTILS_REPO'] = get_ohsnap_repo_url(
-        settings,
-        repo='utils',
-        product='utils',
-        release=settings.server.version.release,
-        os_release=settings.server.version.rhel_version,
-        snap=settings.server.version.snap,
-    )
+    :param dict responses: earlier Ohsnap responses, revalidated and updated in place
+    """
+    session = OhsnapSession(responses, pool_size=OHSNAP_WORKERS)
+    with session, ThreadPoolExecutor(max_workers=OHSNAP_WORKERS) as executor:
+
+        def fetch(**kwargs):
+            return executor.submit(get_ohsnap_repo_url, settings, session=session, **kwargs)
+
+        data = {}
+        data['CAPSULE_REPO'] = fetch(
+            repo='capsule',
+            product='capsule',
+            release=settings.capsule.version.release,
+            os_release=settings.capsule.version.rhel_version,
+            snap=settings.capsule.version.snap,
+        )
 
-    data['SATMAINTENANCE_REPO'] = get_ohsnap_repo_url(
-        settings,
-        repo='maintenance',
-        product='satellite',
-        release=settings.server.version.release,
-        os_release=settings.server.version.rhel_version,
-        snap=settings.server.version.snap,
-    )
-    return data
+        data['SATELLITE_REPO'] = fetch(
+            repo='satellite',
+            product='satellite',
+            release=settings.server.version.release,
+            os_release=settings.server.version.rhel_version,
+            snap=settings.server.version.snap,
+        )
+
+        data['SATCLIENT_REPO'] = get_dogfood_satclient_repos(settings, fetch)
+
+        data['SATUTILS_REPO'] = fetch(
+            repo='utils',
+            product='utils',
+            release=settings.server.version.release,
+            os_release=settings.server.version.rhel_version,
+            snap=settings.server.version.snap,
+        )
+
+        data['SATMAINTENANCE_REPO'] = fetch(
+            repo='maintenance',
+            product='satellite',
+            release=settings.server.version.release,
+            os_release=settings.server.version.rhel_version,
+            snap=settings.server.version.snap,
+        )
+        return _results(data)
 
 
 def supported_rhel_versions(settings):
@@ -145,12 +181,17 @@ def get_dogfood_sattools_repos(settings):
     return data
 
 
-def get_dogfood_satclient_repos(settings):
+def get_dogfood_satclient_repos(settings, fetch=None):
+    """Return the client repositories for the supported RHEL versions
+
+    :param fetch: callable getting a repository URL for the ``get_ohsnap_repo_url`` keyword
+        arguments, by default ``get_ohsnap_repo_url`` itself
+    """
+    fetch = fetch or partial(get_ohsnap_repo_url, settings)
     data = {}
     rhels = supported_rhel_versions(settings)
     for ver in rhels:
-        data[f'RHEL{ver}'] = get_ohsnap_repo_url(
-            settings,
+        data[f'RHEL{ver}'] = fetch(
             repo='client',
             product='client',
             release='client',
@@ -159,7 +200,9 @@ def get_dogfood_satclient_repos(settings):
     return data
 
 
-def get_ohsnap_repo_url(settings, repo, product=None, release=None, os_release=None, snap=''):
+def get_ohsnap_repo_url(
+    settings, repo, product=None, release=None, os_release=None, snap='', session=None
+):
     return dogfood_repository(
         settings.ohsnap,
         repo=repo,
@@ -167,4 +210,5 @@ def get_ohsnap_repo_url(settings, repo, product=None, release=None, os_release=N
         release=release,
         os_release=os_release,
         snap=snap,
+        session=session,
     ).baseurl
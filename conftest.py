@@ -5,9 +5,15 @@ import pytest
 pytest_plugins = [
     # Plugins
     'pytest_plugins.auto_vault',
+    'pytest_plugins.collection_cache',
+    'pytest_plugins.collection_pipeline',
+    'pytest_plugins.coordination',
     'pytest_plugins.disable_rp_params',
+    'pytest_plugins.duration_scheduler',
     'pytest_plugins.external_logging',
+    'pytest_plugins.fixture_affinity',
     'pytest_plugins.fixture_markers',
+    'pytest_plugins.func_locker_metrics',
     'pytest_plugins.infra_dependent_markers',
     'pytest_plugins.issue_handlers',
     'pytest_plugins.logging_hooks',
@@ -17,6 +23,7 @@ pytest_plugins = [
     'pytest_plugins.metadata_markers',
     'pytest_plugins.settings_skip',
     'pytest_plugins.rerun_rp.rerun_rp',
+    'pytest_plugins.satellite_facts',
     'pytest_plugins.fspath_plugins',
     'pytest_plugins.factory_collection',
     'pytest_plugins.requirements.update_requirements',
@@ -26,6 +33,7 @@ pytest_plugins = [
     'pytest_plugins.select_random_tests',
     'pytest_plugins.capsule_n-minus',
     'pytest_plugins.upstream_pr',
+    'pytest_plugins.record_replay',
     # Fixtures
     'pytest_fixtures.core.broker',
     'pytest_fixtures.core.sat_cap_factory',
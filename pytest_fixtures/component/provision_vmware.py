@@ -1,8 +1,6 @@
 from broker import Broker
 from fauxfactory import gen_string
 import pytest
-from wrapanapi import VMWareSystem
-from wrapanapi.systems.virtualcenter import VMWareVirtualMachine
 
 from robottelo.config import settings
 from robottelo.hosts import ContentHost
@@ -19,6 +17,8 @@ def vmware(request):
 
 @pytest.fixture
 def vmwareclient(vmware):
+    from wrapanapi import VMWareSystem
+
     vmwareclient = VMWareSystem(
         hostname=vmware.hostname,
         username=settings.vmware.username,
@@ -120,6 +120,8 @@ def module_vmware_image(
 @pytest.fixture
 def provisioning_vmware_host(pxe_loader, vmwareclient, module_ssh_key_file):
     """Fixture to check out blank VM on VMware"""
+    from wrapanapi.systems.virtualcenter import VMWareVirtualMachine
+
     vm_boot_firmware = 'efi' if pxe_loader.vm_firmware.startswith('uefi') else 'bios'
     vm_secure_boot = 'true' if pxe_loader.vm_firmware == 'uefi_secure_boot' else 'false'
     vlan_id = settings.provisioning.vlan_id
@@ -0,0 +1,213 @@
+"""Opt-in cache of collection results for ``--collect-only`` runs
+
+Collecting imports every test module, parametrizes tests and runs the collection plugins before
+listing a single test. With ``--collection-cache --collect-only``, the node ids, markers and
+user_properties of the tests of each file, and whether the collection plugins selected them, are
+stored after collection. Files whose content did not change since are restored from the cache
+without being imported, only changed files are collected again.
+
+Cached results are only valid for the same collection code and configuration, the cache is keyed
+by the content of the conftest, plugin and fixture modules, the settings (see
+``robottelo.config.snapshot.settings_digest``) and the pytest arguments, except test paths.
+Running tests needs the imported test functions, so the cache is not used without
+``--collect-only``, nor with options selecting tests dynamically, like --select-random-tests.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from robottelo.config.snapshot import settings_digest
+from robottelo.logging import collection_logger as logger, robottelo_root_dir
+
+COLLECTION_CODE = (
+    'pyproject.toml',
+    'conftest.py',
+    'tests/**/conftest.py',
+    'pytest_plugins/**/*.py',
+    'pytest_fixtures/**/*.py',
+)
+# arguments which don't change the outcome of collecting a given test file
+IGNORED_ARGS = {
+    '-q',
+    '-qq',
+    '-v',
+    '-vv',
+    '-s',
+    '--quiet',
+    '--verbose',
+    '--co',
+    '--collect-only',
+    '--collection-cache',
+}
+# options selecting tests from outside sources, their results can't be cached per file
+DYNAMIC_OPTIONS = ('select_random_tests', 'upstream_pr', 'only_failed', 'only_skipped', 'user')
+collection_cache_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    """Add the option enabling the collection cache"""
+    parser.addoption(
+        '--collection-cache',
+        action='store_true',
+        default=False,
+        help='With --collect-only, restore the tests of unchanged files from a cache '
+        'instead of importing them.',
+    )
+
+
+def json_safe(value):
+    """Return ``value`` with everything which is not plain JSON data replaced by its repr"""
+    if value is None or isinstance(value, bool | int | float | str):
+        return value
+    if isinstance(value, list | tuple):
+        return [json_safe(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): json_safe(v) for k, v in value.items()}
+    return repr(value)
+
+
+def collection_digest(config, root_dir=robottelo_root_dir):
+    """Return the digest of the collection code, the settings and the collection options"""
+    root_dir = Path(root_dir)
+    digest = hashlib.sha256()
+    for pattern in COLLECTION_CODE:
+        for path in sorted(root_dir.glob(pattern)):
+            digest.update(f'{path.relative_to(root_dir)}\0'.encode())
+            digest.update(path.read_bytes())
+    digest.update(settings_digest(root_dir).encode())
+    # option defaults can differ between runs, like generated seeds, only given ones count
+    paths = set(config.option.file_or_dir or [])
+    args = [
+        arg
+        for arg in [*config.invocation_params.args, os.environ.get('PYTEST_ADDOPTS', '')]
+        if arg not in IGNORED_ARGS and arg not in paths
+    ]
+    digest.update(json.dumps(args).encode())
+    return digest.hexdigest()
+
+
+class CachedItem(pytest.Item):
+    """A test restored from the collection cache, it can be listed but not run"""
+
+    def runtest(self):
+        raise RuntimeError(f'{self.nodeid} was restored from the collection cache and not imported')
+
+    def reportinfo(self):
+        return self.path, None, self.nodeid.split('::', 1)[-1]
+
+
+class CachedModule(pytest.File):
+    """A test file restored from the collection cache"""
+
+    def __init__(self, *, entry, **kwargs):
+        super().__init__(**kwargs)
+        self.entry = entry
+
+    def collect(self):
+        for data in self.entry['items']:
+            item = CachedItem.from_parent(
+                self, name=data['nodeid'].rsplit('::', 1)[-1], nodeid=data['nodeid']
+            )
+            for name, args, kwargs in data['markers']:
+                item.add_marker(getattr(pytest.mark, name)(*args, **kwargs))
+            item.user_properties.extend(tuple(prop) for prop in data['user_properties'])
+            item.stash[collection_cache_key] = data['selected']
+            yield item
+
+
+class CollectionCache:
+    """Plugin restoring unchanged test files and storing the collection results of the others"""
+
+    def __init__(self, config, cache_dir):
+        self.config = config
+        self.path = cache_dir / f'{collection_digest(config)}.json'
+        try:
+            self.entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            self.entries = {}
+        # sha256 of the files collected in this run
+        self.collected = {}
+
+    def key(self, path):
+        return os.path.relpath(path, self.config.rootpath)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_pycollect_makemodule(self, module_path, parent):
+        key = self.key(module_path)
+        digest = hashlib.sha256(module_path.read_bytes()).hexdigest()
+        entry = self.entries.get(key)
+        if entry and entry['sha256'] == digest:
+            return CachedModule.from_parent(parent, path=module_path, entry=entry)
+        self.collected[key] = digest
+        return None
+
+    def pytest_collectreport(self, report):
+        # files failing to collect are collected again, so the error is reported again
+        if report.failed:
+            self.collected.pop(self.key(report.fspath), None)
+
+    @pytest.hookimpl(wrapper=True, tryfirst=True)
+    def pytest_collection_modifyitems(self, session, config, items):
+        # the collection plugins already processed the restored items when they were cached
+        positions = {id(item): position for position, item in enumerate(items)}
+        restored = [item for item in items if collection_cache_key in item.stash]
+        items[:] = [item for item in items if collection_cache_key not in item.stash]
+        collected = list(items)
+        result = yield
+        selected = {id(item) for item in items}
+        self.store(collected, selected)
+        items.extend(item for item in restored if item.stash[collection_cache_key])
+        items.sort(key=lambda item: positions.get(id(item), len(positions)))
+        if deselected := [item for item in restored if not item.stash[collection_cache_key]]:
+            config.hook.pytest_deselected(items=deselected)
+        logger.info(f'Collection cache: {len(restored)} tests restored, {len(collected)} collected')
+        return result
+
+    def store(self, items, selected):
+        """Store the collection results of the files collected in this run"""
+        entries = {key: {'sha256': digest, 'items': []} for key, digest in self.collected.items()}
+        for item in items:
+            if (entry := entries.get(self.key(item.path))) is None:
+                continue
+            entry['items'].append(
+                {
+                    'nodeid': item.nodeid,
+                    # closest markers first, restored as own markers in the same order
+                    'markers': [
+                        [mark.name, json_safe(mark.args), json_safe(mark.kwargs)]
+                        for mark in item.iter_markers()
+                    ],
+                    'user_properties': json_safe(item.user_properties),
+                    'selected': id(item) in selected,
+                }
+            )
+        if not entries:
+            return
+        self.entries.update(entries)
+        staging = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            staging.write_text(json.dumps(self.entries))
+            staging.replace(self.path)
+            # results for other code, settings or options are not reused
+            for stale in self.path.parent.glob('*.json'):
+                if stale != self.path:
+                    stale.unlink(missing_ok=True)
+        except OSError as err:
+            logger.warning(f'Unable to write the collection cache {self.path}: {err}')
+
+
+def pytest_configure(config):
+    if not (config.getoption('collection_cache') and config.getoption('collectonly')):
+        return
+    if dynamic := [opt for opt in DYNAMIC_OPTIONS if config.getoption(opt, None)]:
+        logger.info(f'Collection cache disabled by the {dynamic} options')
+        return
+    if (cache := getattr(config, 'cache', None)) is None:
+        return
+    config.pluginmanager.register(
+        CollectionCache(config, cache.mkdir('collection_cache')), 'collection_cache_plugin'
+    )
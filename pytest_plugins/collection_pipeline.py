@@ -0,0 +1,188 @@
+"""Single pass collection pipeline shared by robottelo's collection plugins
+
+Instead of implementing ``pytest_collection_modifyitems`` and iterating all items themselves,
+plugins register stages with the pipeline in their ``pytest_configure``::
+
+    def pytest_configure(config):
+        get_pipeline(config).register('my_plugin', prepare, order=50)
+
+``prepare(config, items)`` runs once per collection and returns a per-item callable, or None
+when the stage has nothing to do (e.g. its option was not passed). The per-item callable gets
+the item and its ``ItemRecord`` and returns a deselection reason, or None to keep the item.
+Consecutive per-item stages run fused in a single pass over the items, an item deselected by
+a stage is not passed to later stages. Stages needing the whole collection, like random
+sampling, are registered with ``register_collection``. They get the items selected so far and
+return the items to keep.
+
+The pipeline runs in two phases, ``FIRST`` from a ``tryfirst`` and ``LAST`` from a ``trylast``
+``pytest_collection_modifyitems`` hook, so stages keep their place relative to the plugins
+still implementing the hook themselves. Deselected items are reported with a single
+``pytest_deselected`` call per phase and the time spent in each stage is logged.
+"""
+
+from time import perf_counter
+
+import pytest
+
+from robottelo.logging import collection_logger as logger
+
+FIRST = 'first'
+LAST = 'last'
+pipeline_key = pytest.StashKey()
+
+
+class ItemRecord:
+    """Markers of a collected item, computed once and refreshed by ``add_marker``
+
+    :param item: the pytest item
+    """
+
+    __slots__ = ('item', 'markers', 'names', '_closest')
+
+    def __init__(self, item):
+        self.item = item
+        self.refresh()
+
+    def refresh(self):
+        # iter_markers yields the closest markers first
+        self.markers = list(self.item.iter_markers())
+        self.names = {marker.name for marker in self.markers}
+        self._closest = {}
+        for marker in self.markers:
+            self._closest.setdefault(marker.name, marker)
+
+    def closest(self, name, default=None):
+        """Return the closest marker ``name``, like ``item.get_closest_marker``"""
+        return self._closest.get(name, default)
+
+    def iter_markers(self, name=None):
+        """Return the markers of the item, or those named ``name``, closest first"""
+        return [marker for marker in self.markers if name is None or marker.name == name]
+
+    def add_marker(self, *markers):
+        """Add markers to the item and refresh the record"""
+        for marker in markers:
+            self.item.add_marker(marker)
+        self.refresh()
+
+
+class Stage:
+    def __init__(self, name, func, order, per_item):
+        self.name = name
+        self.func = func
+        self.order = order
+        self.per_item = per_item
+
+
+class CollectionPipeline:
+    """Registered collection stages of a pytest run"""
+
+    def __init__(self):
+        self.stages = {FIRST: [], LAST: []}
+
+    def register(self, name, prepare, phase=FIRST, order=0):
+        """Register a per-item stage
+
+        :param name: stage name used in logs
+        :param prepare: callable taking config and items, returning the per-item callable or None
+        :param phase: FIRST or LAST
+        :param order: stages of a phase run in ascending order
+        """
+        self._add(phase, Stage(name, prepare, order, per_item=True))
+
+    def register_collection(self, name, func, phase=FIRST, order=0):
+        """Register a stage processing the whole collection at once
+
+        :param func: callable taking config and the selected items, returning the items to keep,
+            in the order they should run, or None to keep all of them
+        """
+        self._add(phase, Stage(name, func, order, per_item=False))
+
+    def _add(self, phase, stage):
+        self.stages[phase].append(stage)
+        # sort is stable, stages with the same order keep their registration order
+        self.stages[phase].sort(key=lambda s: s.order)
+
+    def _groups(self, phase):
+        """Split the stages of a phase into runs of per-item stages and collection stages"""
+        group = []
+        for stage in self.stages[phase]:
+            if stage.per_item:
+                group.append(stage)
+                continue
+            if group:
+                yield group
+                group = []
+            yield [stage]
+        if group:
+            yield group
+
+    def run(self, phase, items, config):
+        """Run the stages of ``phase`` on ``items``, removing deselected items in place"""
+        timings = {}
+        selected, deselected = list(items), []
+        for group in self._groups(phase):
+            if not group[0].per_item:
+                stage = group[0]
+                start = perf_counter()
+                if (kept := stage.func(config, selected)) is not None:
+                    ids = {id(item) for item in kept}
+                    deselected.extend(item for item in selected if id(item) not in ids)
+                    selected = list(kept)
+                timings[stage.name] = perf_counter() - start
+                continue
+            active = []
+            for stage in group:
+                start = perf_counter()
+                if (check := stage.func(config, selected)) is not None:
+                    active.append((stage.name, check))
+                timings[stage.name] = perf_counter() - start
+            if not active:
+                continue
+            kept = []
+            for item in selected:
+                record = ItemRecord(item)
+                for name, check in active:
+                    start = perf_counter()
+                    reason = check(item, record)
+                    timings[name] += perf_counter() - start
+                    if reason:
+                        logger.debug(f'Deselected test {item.nodeid} by {name}: {reason}')
+                        deselected.append(item)
+                        break
+                else:
+                    kept.append(item)
+            selected = kept
+        if timings:
+            logger.info(
+                f'Collection pipeline {phase} phase: {len(selected)} selected, '
+                f'{len(deselected)} deselected; '
+                + ', '.join(f'{name} {seconds:.3f}s' for name, seconds in timings.items())
+            )
+        items[:] = selected
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+
+
+def get_pipeline(config):
+    """Return the collection pipeline of a pytest run"""
+    if (pipeline := config.stash.get(pipeline_key, None)) is None:
+        pipeline = config.stash[pipeline_key] = CollectionPipeline()
+    return pipeline
+
+
+class LastPhase:
+    """Plugin running the ``LAST`` phase, a module holds one hook implementation per hook"""
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, items, config):
+        get_pipeline(config).run(LAST, items, config)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(LastPhase(), 'collection_pipeline_last_phase')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items, config):
+    get_pipeline(config).run(FIRST, items, config)
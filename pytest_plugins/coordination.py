@@ -0,0 +1,45 @@
+"""Start the coordination server of the test run on the xdist controller
+
+With ``robottelo.coordination.enabled``, the controller serves the function locks, shared
+resources and shared function values of the run (see ``robottelo.utils.coordination``) and hands
+the server address over to the workers in ``workerinput``, so workers on other nodes coordinate
+with the local ones.
+"""
+
+import socket
+
+import pytest
+
+from robottelo.config import settings
+from robottelo.logging import logger
+from robottelo.utils import coordination
+
+coordination_server_key = pytest.StashKey()
+
+
+def pytest_configure(config):
+    if (server := getattr(config, 'workerinput', {}).get('coordination')) is not None:
+        host, port, token = server
+        coordination.configure((host, port), token)
+        return
+    if not settings.robottelo.coordination.enabled:
+        return
+    server = coordination.CoordinationServer(port=settings.robottelo.coordination.port).start()
+    config.stash[coordination_server_key] = server
+    host = settings.robottelo.coordination.host or socket.getfqdn()
+    coordination.configure((host, server.port), server.token)
+    logger.info(f'Coordination server listening on {host}:{server.port}')
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the coordination server address over to the workers"""
+    if coordination_server_key in node.config.stash:
+        client = coordination.get_client()
+        node.workerinput['coordination'] = [*client.address, client.token]
+
+
+def pytest_unconfigure(config):
+    if (server := config.stash.get(coordination_server_key, None)) is not None:
+        coordination.configure(None)
+        server.stop()
@@ -0,0 +1,189 @@
+"""Historical duration aware xdist scheduling
+
+With ``--duration-scheduling``, tests are distributed to the xdist workers by test module, the
+longest modules first. Module-scoped fixtures are set up once per worker running tests of the
+module, so the module is the unit of work. Module durations are predicted from the durations of
+previous runs, stored in the pytest cache after each run, and from junit XML reports passed with
+``--durations-junit``. Handing the longest remaining module to the first free worker is the
+longest-processing-time-first heuristic, which keeps the long tail modules from being started
+last. The predicted and actual makespan are reported at the end of the run.
+
+Usage: pytest -n 8 --duration-scheduling --durations-junit previous-run.xml tests/foreman
+"""
+
+import heapq
+import re
+from statistics import fmean
+import time
+from xml.etree import ElementTree
+
+import pytest
+from xdist.scheduler import LoadFileScheduling
+
+from robottelo.logging import logger
+
+DURATIONS_CACHE_KEY = 'robottelo/durations'
+# duration of tests without any history in their module or the run
+DEFAULT_DURATION = 1.0
+# weight of the latest run in the stored durations
+DURATION_SMOOTHING = 0.5
+run_durations_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    """Add options for duration aware test distribution"""
+    parser.addoption(
+        '--duration-scheduling',
+        action='store_true',
+        default=False,
+        help='Distribute test modules to xdist workers by their historical duration, '
+        'longest first.',
+    )
+    parser.addoption(
+        '--durations-junit',
+        action='append',
+        default=[],
+        help='junit XML report of a previous run to read test durations from, '
+        'can be passed several times. Durations stored by previous runs take precedence.',
+    )
+
+
+def junit_key(nodeid):
+    """Return the ``classname::name`` of a test in junit XML reports, see pytest's junitxml"""
+    path, bracket, params = nodeid.partition('[')
+    names = path.split('::')
+    names[0] = re.sub(r'\.py$', '', names[0].replace('/', '.'))
+    names[-1] += bracket + params
+    return f'{".".join(names[:-1])}::{names[-1]}'
+
+
+def read_junit_durations(paths):
+    """Return a dict of test durations in seconds, keyed by ``junit_key``, read from junit XMLs"""
+    durations = {}
+    for path in paths:
+        try:
+            tree = ElementTree.parse(path)
+        except (OSError, ElementTree.ParseError) as err:
+            logger.warning(f'Unable to read test durations from {path}: {err}')
+            continue
+        for case in tree.iter('testcase'):
+            if (time_attr := case.get('time')) is not None:
+                durations[f'{case.get("classname")}::{case.get("name")}'] = float(time_attr)
+    return durations
+
+
+def predict_durations(units, durations, junit_durations=None):
+    """Predict the duration of work units from the durations of their tests
+
+    Tests without a known duration get the mean duration of the known tests of their unit, or of
+    all known tests if their unit has none.
+
+    :param units: dict mapping work unit names to their test nodeids
+    :param durations: dict of known test durations keyed by nodeid
+    :param junit_durations: dict of known test durations keyed by ``junit_key``
+    :return: dict mapping work unit names to their predicted duration in seconds
+    """
+    junit_durations = junit_durations or {}
+    known = {}
+    for unit, nodeids in units.items():
+        for nodeid in nodeids:
+            if (duration := durations.get(nodeid)) is None:
+                duration = junit_durations.get(junit_key(nodeid))
+            if duration is not None:
+                known.setdefault(unit, {})[nodeid] = duration
+    every = [duration for unit_known in known.values() for duration in unit_known.values()]
+    default = fmean(every) if every else DEFAULT_DURATION
+    predicted = {}
+    for unit, nodeids in units.items():
+        unit_known = known.get(unit, {})
+        unit_default = fmean(unit_known.values()) if unit_known else default
+        predicted[unit] = sum(unit_known.get(nodeid, unit_default) for nodeid in nodeids)
+    return predicted
+
+
+def lpt_makespan(durations, workers):
+    """Return the makespan of running jobs longest first, each on the first free of ``workers``"""
+    loads = [0.0] * max(workers, 1)
+    for duration in sorted(durations, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+class RunDurations:
+    """Plugin recording the test durations of the run, stored in the pytest cache at the end
+
+    With xdist, the reports of the workers are processed by the controller, which stores them.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.cache = getattr(config, 'cache', None)
+        self.durations = {}
+        self.predicted = self.start = self.end = None
+
+    def pytest_runtest_logreport(self, report):
+        # setup and teardown include the module fixtures set up for and torn down after the test
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0) + report.duration
+        self.end = time.monotonic()
+
+    def pytest_sessionfinish(self):
+        """Merge the durations of this run into the durations stored in the pytest cache"""
+        if hasattr(self.config, 'workerinput') or not self.cache or not self.durations:
+            return
+        durations = self.cache.get(DURATIONS_CACHE_KEY, {})
+        for nodeid, duration in self.durations.items():
+            previous = durations.get(nodeid, duration)
+            durations[nodeid] = DURATION_SMOOTHING * duration + (1 - DURATION_SMOOTHING) * previous
+        self.cache.set(DURATIONS_CACHE_KEY, durations)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Report the predicted and actual makespan of a duration scheduled run"""
+        if self.predicted is None or self.end is None:
+            return
+        message = (
+            f'duration scheduling: predicted makespan {self.predicted:.0f}s, '
+            f'actual {self.end - self.start:.0f}s'
+        )
+        terminalreporter.write_line(message)
+        logger.info(message)
+
+
+class DurationScheduling(LoadFileScheduling):
+    """xdist scheduling of test modules by predicted duration, longest first"""
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.run_durations = config.stash[run_durations_key]
+        cache = self.run_durations.cache
+        self.durations = cache.get(DURATIONS_CACHE_KEY, {}) if cache else {}
+        self.junit_durations = read_junit_durations(config.getoption('durations_junit'))
+        self.predicted = None
+
+    def _order_workqueue(self):
+        """Sort the work units by predicted duration, the base class hands them out in order"""
+        self.predicted = predict_durations(self.workqueue, self.durations, self.junit_durations)
+        for scope in sorted(self.workqueue, key=self.predicted.get, reverse=True):
+            self.workqueue.move_to_end(scope)
+        makespan = lpt_makespan(self.predicted.values(), len(self.nodes))
+        self.run_durations.predicted, self.run_durations.start = makespan, time.monotonic()
+        logger.info(
+            f'Scheduling {len(self.workqueue)} test modules on {len(self.nodes)} workers '
+            f'longest first, predicted makespan {makespan:.0f}s'
+        )
+
+    def _assign_work_unit(self, node):
+        if self.predicted is None:
+            self._order_workqueue()
+        super()._assign_work_unit(node)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('duration_scheduling'):
+        return DurationScheduling(config, log)
+    return None
+
+
+def pytest_configure(config):
+    run_durations = config.stash[run_durations_key] = RunDurations(config)
+    config.pluginmanager.register(run_durations, 'duration_scheduler_run_durations')
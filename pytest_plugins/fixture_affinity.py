@@ -0,0 +1,225 @@
+"""Fixture affinity xdist scheduling
+
+An expensive module-scoped fixture, like ``module_sca_manifest_org``, is set up again on every
+worker running a test which uses it. With ``--fixture-affinity``, tests sharing an instance of an
+expensive class, module or package scoped fixture are grouped and each group runs on a single
+worker. Tests without expensive fixtures are distributed one by one, so a module is only kept
+together as far as its fixtures require it. Groups are handed out longest first, as with
+``--duration-scheduling``.
+
+Fixtures are expensive when their setup took at least ``--affinity-threshold`` seconds in previous
+runs, setup times are stored in the pytest cache. Fixtures without recorded setup times are
+considered expensive until measured. Workers compute the groups while collecting and pass them to
+the scheduler through the pytest cache directory. The terminal summary reports how many fixture
+setups, and how much setup time, were saved compared to ``--dist load``.
+
+Usage: pytest -n 8 --fixture-affinity tests/foreman
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from pytest_plugins.collection_pipeline import LAST, get_pipeline
+from pytest_plugins.duration_scheduler import DurationScheduling
+from robottelo.logging import logger
+
+FIXTURE_SETUPS_CACHE_KEY = 'robottelo/fixture_setups'
+AFFINITY_SCOPES = {'class': pytest.Class, 'module': pytest.Module, 'package': pytest.Package}
+fixture_affinity_key = pytest.StashKey()
+
+
+def pytest_addoption(parser):
+    """Add options for fixture affinity test distribution"""
+    parser.addoption(
+        '--fixture-affinity',
+        action='store_true',
+        default=False,
+        help='Run the tests sharing an expensive class, module or package scoped fixture on '
+        'the same xdist worker.',
+    )
+    parser.addoption(
+        '--affinity-threshold',
+        type=float,
+        default=10.0,
+        help='Setup time in seconds from which a fixture is expensive for --fixture-affinity.',
+    )
+
+
+def instance_key(scope_nodeid, argname, param_index=0):
+    """Return the key of a fixture instance, the fixture cached for a scope node and param"""
+    return f'{scope_nodeid}::{argname}[{param_index}]'
+
+
+def item_fixture_instances(item, is_expensive):
+    """Yield the keys of the expensive class, module and package scoped fixtures of an item"""
+    indices = getattr(getattr(item, 'callspec', None), 'indices', {})
+    for argname in item.fixturenames:
+        if not (fixturedefs := item._fixtureinfo.name2fixturedefs.get(argname)):
+            continue
+        scope = fixturedefs[-1].scope
+        if scope not in AFFINITY_SCOPES or not is_expensive(argname):
+            continue
+        # like pytest does, fixtures fall back to the next wider scope without such node
+        if (node := item.getparent(AFFINITY_SCOPES[scope])) is None:
+            continue
+        yield instance_key(node.nodeid, argname, indices.get(argname, 0))
+
+
+def affinity_groups(items, is_expensive):
+    """Group items sharing expensive fixture instances
+
+    :return: tuple of a dict mapping nodeids to their group, and a dict mapping the fixture
+        instances to the number of items using them
+    """
+    parents = {}
+
+    def find(key):
+        while parents.setdefault(key, key) != key:
+            parents[key] = key = parents[parents[key]]
+        return key
+
+    users = {}
+    for item in items:
+        for key in item_fixture_instances(item, is_expensive):
+            users[key] = users.get(key, 0) + 1
+            parents[find(item.nodeid)] = find(key)
+    groups = {item.nodeid: find(item.nodeid) for item in items}
+    return groups, users
+
+
+class FixtureAffinity:
+    """Plugin recording fixture setup times, and reporting the setups saved by the grouping"""
+
+    def __init__(self, config):
+        self.config = config
+        self.cache = getattr(config, 'cache', None)
+        self.threshold = config.getoption('affinity_threshold')
+        self.setup_times = self.cache.get(FIXTURE_SETUPS_CACHE_KEY, {}) if self.cache else {}
+        # fixture instance key: [argname, seconds], per worker with xdist
+        self.setups = {}
+        self.users = self.workers = None
+
+    def is_expensive(self, argname):
+        return self.setup_times.get(argname, self.threshold) >= self.threshold
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        if fixturedef.scope not in AFFINITY_SCOPES:
+            return (yield)
+        start = time.monotonic()
+        try:
+            return (yield)
+        finally:
+            key = instance_key(request.node.nodeid, fixturedef.argname, request.param_index)
+            self.setups.setdefault(self.worker_id, {})[key] = [
+                fixturedef.argname,
+                time.monotonic() - start,
+            ]
+
+    @property
+    def worker_id(self):
+        return getattr(self.config, 'workerinput', {}).get('workerid', 'master')
+
+    def collection_stage(self, config, items):
+        """Write the groups of the collected items for the scheduler, on xdist workers"""
+        if not (workerinput := getattr(config, 'workerinput', None)) or not self.cache:
+            return
+        groups, users = affinity_groups(items, self.is_expensive)
+        path = affinity_path(self.cache, workerinput['testrunuid'])
+        staging = path.with_suffix(f'.{os.getpid()}.tmp')
+        staging.write_text(json.dumps({'groups': groups, 'users': users}))
+        staging.replace(path)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """Collect the fixture setups of a finished xdist worker"""
+        self.setups.update(node.workeroutput.get('fixture_setups', {}))
+
+    def pytest_sessionfinish(self):
+        if hasattr(self.config, 'workerinput'):
+            self.config.workeroutput['fixture_setups'] = self.setups
+            return
+        if not self.cache or not self.setups:
+            return
+        measured = {}
+        for setups in self.setups.values():
+            for argname, seconds in setups.values():
+                measured.setdefault(argname, []).append(seconds)
+        self.setup_times.update(
+            {argname: sum(times) / len(times) for argname, times in measured.items()}
+        )
+        self.cache.set(FIXTURE_SETUPS_CACHE_KEY, self.setup_times)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        """Report the expensive fixture setups saved compared to ``--dist load``"""
+        if not self.users or not self.workers:
+            return
+        setups, seconds, load_setups, load_seconds = 0, 0.0, 0, 0.0
+        for key, users in self.users.items():
+            instance_setups = [s[key] for s in self.setups.values() if key in s]
+            if not instance_setups:
+                continue
+            setups += len(instance_setups)
+            seconds += sum(setup[1] for setup in instance_setups)
+            # --dist load spreads the users of an instance, each worker sets the instance up
+            estimated = min(users, self.workers)
+            load_setups += estimated
+            load_seconds += estimated * sum(s[1] for s in instance_setups) / len(instance_setups)
+        message = (
+            f'fixture affinity: {setups} expensive fixture setups took {seconds:.0f}s, '
+            f'--dist load would need about {load_setups} taking {load_seconds:.0f}s '
+            f'(saved {load_setups - setups} setups, {load_seconds - seconds:.0f}s)'
+        )
+        terminalreporter.write_line(message)
+        logger.info(message)
+
+
+def affinity_path(cache, testrunuid):
+    return cache.mkdir('fixture_affinity') / f'{testrunuid}.json'
+
+
+class AffinityScheduling(DurationScheduling):
+    """xdist scheduling of fixture affinity groups, longest first"""
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.affinity = config.stash[fixture_affinity_key]
+        self.groups = None
+
+    def _load_groups(self):
+        path = affinity_path(self.affinity.cache, self.nodes[0].workerinput['testrunuid'])
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError) as err:
+            logger.warning(f'No fixture affinity groups, scheduling by test module: {err}')
+            data = {'groups': {}, 'users': {}}
+        else:
+            path.unlink(missing_ok=True)
+        self.groups = data['groups']
+        self.affinity.users = data['users']
+        self.affinity.workers = len(self.nodes)
+
+    def _split_scope(self, nodeid):
+        if self.groups is None:
+            self._load_groups()
+        return self.groups.get(nodeid) or super()._split_scope(nodeid)
+
+
+@pytest.hookimpl(optionalhook=True, tryfirst=True)
+def pytest_xdist_make_scheduler(config, log):
+    if config.getoption('fixture_affinity'):
+        return AffinityScheduling(config, log)
+    return None
+
+
+def pytest_configure(config):
+    if not config.getoption('fixture_affinity'):
+        return
+    affinity = config.stash[fixture_affinity_key] = FixtureAffinity(config)
+    config.pluginmanager.register(affinity, 'fixture_affinity_setups')
+    get_pipeline(config).register_collection(
+        'fixture_affinity', affinity.collection_stage, phase=LAST, order=30
+    )
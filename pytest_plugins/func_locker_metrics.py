@@ -0,0 +1,79 @@
+"""Report the most contended function locks of the test run
+
+``robottelo.utils.decorators.func_locker`` records the time waited for and holding every lock in
+each process. xdist workers hand their metrics over to the controller, which reports the locks
+tests waited the longest for in the terminal summary.
+"""
+
+import os
+
+import pytest
+
+from robottelo.logging import logger
+from robottelo.utils.decorators import func_locker
+
+REPORTED_LOCKS = 10
+# locks never waited for that long are not worth reporting
+MIN_REPORTED_WAIT = 1.0
+
+
+def merge_lock_metrics(metrics, other):
+    """Merge the lock metrics ``other`` into ``metrics``"""
+    for path, lock in other.items():
+        merged = metrics.setdefault(
+            path, {'acquired': 0, 'wait': 0.0, 'max_wait': 0.0, 'hold': 0.0}
+        )
+        merged['acquired'] += lock['acquired']
+        merged['wait'] += lock['wait']
+        merged['max_wait'] = max(merged['max_wait'], lock['max_wait'])
+        merged['hold'] += lock['hold']
+    return metrics
+
+
+def contended_locks(metrics):
+    """Return the ``(path, lock)`` of the locks waited the longest for, longest wait first"""
+    return sorted(
+        ((path, lock) for path, lock in metrics.items() if lock['max_wait'] >= MIN_REPORTED_WAIT),
+        key=lambda path_lock: path_lock[1]['wait'],
+        reverse=True,
+    )[:REPORTED_LOCKS]
+
+
+class FuncLockerMetrics:
+    """Plugin gathering the function lock metrics of the run"""
+
+    def __init__(self, config):
+        self.config = config
+        self.metrics = {}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        merge_lock_metrics(self.metrics, node.workeroutput.get('func_locker_metrics', {}))
+
+    # after the teardown of the session fixtures, which may lock functions too
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self):
+        if hasattr(self.config, 'workerinput'):
+            self.config.workeroutput['func_locker_metrics'] = func_locker.LOCK_METRICS
+        else:
+            merge_lock_metrics(self.metrics, func_locker.LOCK_METRICS)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not (contended := contended_locks(self.metrics)):
+            return
+        lock_dir = os.path.join(
+            func_locker.get_temp_dir(), func_locker.TEMP_ROOT_DIR, func_locker.TEMP_FUNC_LOCK_DIR
+        )
+        terminalreporter.write_sep('-', 'most contended function locks')
+        for path, lock in contended:
+            message = (
+                f'{os.path.relpath(path, lock_dir)}: waited {lock["wait"]:.1f}s '
+                f'(max {lock["max_wait"]:.1f}s) for {lock["acquired"]} acquisitions, '
+                f'held {lock["hold"]:.1f}s'
+            )
+            terminalreporter.write_line(message)
+            logger.info(f'Function lock {message}')
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(FuncLockerMetrics(config), 'func_locker_metrics_plugin')
@@ -1,23 +1,78 @@
+"""Collection of the issues blocking, verified by or used in tests
+
+With xdist, the data of the Jira issues referenced in the test sources is resolved once by the
+controller and handed over to the workers in ``workerinput``, so the number of workers doesn't
+multiply the Jira API calls.
+"""
+
 from collections import defaultdict
 import inspect
 import re
+import sys
 
 import pytest
 
+from pytest_plugins.collection_pipeline import LAST, get_pipeline
+from robottelo.config import settings
+from robottelo.logging import collection_logger as logger
 from robottelo.utils import slugify_component
 from robottelo.utils.issue_handlers import (
     add_workaround,
     should_deselect,
 )
+from robottelo.utils.issue_handlers.jira import (
+    preload_jira_data,
+    resolve_jira_issues,
+    sync_jira_cache,
+)
+from robottelo.utils.source_index import SourceScanCache, function_sources
+
+ISSUE_ID = re.compile(r'\bSAT-\d+\b')
+jira_issue_data_key = pytest.StashKey()
 
 
 def pytest_configure(config):
-    """Register custom markers to avoid warnings."""
-    pass
+    """Register the issue collection as a last collection stage"""
+    if (issue_data := getattr(config, 'workerinput', {}).get('jira_issue_data')) is not None:
+        preload_jira_data(issue_data)
+    get_pipeline(config).register_collection(
+        'issue_handlers', issue_collection_stage, phase=LAST, order=20
+    )
+
+
+def referenced_issue_ids(config):
+    """Return the Jira issue ids referenced in the sources of the tests to collect
+
+    BlockedBy and Verifies tokens, skip and deselect reasons and ``is_open`` calls all name the
+    issues, so every issue id in the test paths is taken, without importing the tests.
+    """
+    issue_ids = set()
+    for arg in config.args or [str(config.rootpath / 'tests')]:
+        path = config.invocation_params.dir / arg.split('::')[0]
+        for source in [path] if path.is_file() else sorted(path.rglob('*.py')):
+            try:
+                issue_ids.update(ISSUE_ID.findall(source.read_text()))
+            except (OSError, UnicodeDecodeError):
+                continue
+    return issue_ids
+
+
+def get_jira_issue_data(config):
+    """Return the data of the Jira issues referenced by the tests, resolved once per run"""
+    if (issue_data := config.stash.get(jira_issue_data_key, None)) is None:
+        issue_ids = referenced_issue_ids(config)
+        issue_data = config.stash[jira_issue_data_key] = resolve_jira_issues(issue_ids)
+        logger.info(f'Resolved {len(issue_data)} of {len(issue_ids)} referenced Jira issues')
+    return issue_data
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the Jira issue data resolved by the xdist controller over to the workers"""
+    node.workerinput['jira_issue_data'] = get_jira_issue_data(node.config)
 
 
-@pytest.hookimpl(trylast=True)
-def pytest_collection_modifyitems(session, items, config):
+def issue_collection_stage(config, items):
     """Generate the issue collection
     This collection includes pre-processed `is_open` status for each issue
     """
@@ -48,10 +103,56 @@ IMPORTANCE = re.compile(
 )
 
 
+def is_open_usage(source):
+    """Return the ``is_open`` and ``not is_open`` matches in a source, None if it has none"""
+    if 'is_open(' not in source:
+        return None
+    return {'is_open': IS_OPEN.findall(source), 'not is_open': NOT_IS_OPEN.findall(source)}
+
+
+def scan_is_open_usage(source):
+    """Return the ``is_open`` usage of a module source, per function and in the whole module"""
+    component_matches = COMPONENT.findall(source)
+    return {
+        'component': component_matches[0] if component_matches else None,
+        'usage': is_open_usage(source),
+        'functions': {
+            qualname: is_open_usage(function_source)
+            for qualname, function_source in function_sources(source).items()
+        },
+    }
+
+
+def module_is_open_usage(index, module):
+    """Return the scanned ``is_open`` usage of a test module, None if it cannot be scanned"""
+    path = getattr(module, '__file__', None)
+    if not (path and path.endswith('.py')):
+        return None
+    try:
+        return index.get(path)
+    except (OSError, SyntaxError, ValueError) as err:
+        logger.debug(f'Unable to scan {path} for is_open usage: {err}')
+        return None
+
+
+def function_is_open_usage(index, function):
+    """Return the ``is_open`` usage of a test function, from the cached scan of its module"""
+    module = sys.modules.get(function.__module__)
+    scanned = module_is_open_usage(index, module)
+    code = getattr(function, '__code__', None)
+    # the function may be a wrapper defined in another file than its module
+    if scanned and code and code.co_filename == module.__file__:
+        functions = scanned['functions']
+        if function.__qualname__ in functions:
+            return functions[function.__qualname__]
+    # functions not found statically, e.g. generated ones
+    return is_open_usage(inspect.getsource(function))
+
+
 def generate_issue_collection(items, config):  # pragma: no cover
     """Generates a dictionary with the usage of Issue blockers
 
-    For use in pytest_collection_modifyitems hook
+    For use in the issue_handlers collection stage
 
     Arguments:
         items {list} - List of pytest test case objects.
@@ -94,6 +195,12 @@ def generate_issue_collection(items, config):  # pragma: no cover
     deselect_data = {}  # a local cache for deselected tests
 
     test_modules = set()
+    cache = getattr(config, 'cache', None)
+    index = SourceScanCache(
+        'is_open_usage',
+        scan_is_open_usage,
+        cache_dir=cache.mkdir('source_index') if cache else None,
+    )
 
     # --- Build the issue marked usage collection ---
     for item in items:
@@ -135,8 +242,7 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 deselect_data[item.location] = issue_key
 
         # Then take the workarounds using `is_open` helper.
-        source = inspect.getsource(item.function)
-        if 'is_open(' in source:
+        if usage := function_is_open_usage(index, item.function):
             kwargs = {
                 'filepath': filepath,
                 'lineno': lineno,
@@ -145,22 +251,24 @@ def generate_issue_collection(items, config):  # pragma: no cover
                 'importance': importance_mark,
                 'component_mark': component_slug,
             }
-            add_workaround(collected_data, IS_OPEN.findall(source), 'is_open', **kwargs)
-            add_workaround(collected_data, NOT_IS_OPEN.findall(source), 'not is_open', **kwargs)
+            add_workaround(collected_data, usage['is_open'], 'is_open', **kwargs)
+            add_workaround(collected_data, usage['not is_open'], 'not is_open', **kwargs)
 
     # Take uses of `is_open` from outside of test cases e.g: SetUp methods
     for test_module in test_modules:
-        module_source = inspect.getsource(test_module)
-        component_matches = COMPONENT.findall(module_source)
-        module_component = None
-        if component_matches:
-            module_component = component_matches[0]
-        if 'is_open(' in module_source:
+        if (scanned := module_is_open_usage(index, test_module)) is None:
+            module_source = inspect.getsource(test_module)
+            component_matches = COMPONENT.findall(module_source)
+            scanned = {
+                'component': component_matches[0] if component_matches else None,
+                'usage': is_open_usage(module_source),
+            }
+        if usage := scanned['usage']:
             kwargs = {
                 'filepath': test_module.__file__,
                 'lineno': 1,
                 'testcase': test_module.__name__,
-                'component': module_component,
+                'component': scanned['component'],
             }
 
             def validation(data, issue, usage, **kwargs):
@@ -168,19 +276,26 @@ def generate_issue_collection(items, config):  # pragma: no cover
 
             add_workaround(
                 collected_data,
-                IS_OPEN.findall(module_source),
+                usage['is_open'],
                 'is_open',
                 validation=validation,
                 **kwargs,
             )
             add_workaround(
                 collected_data,
-                NOT_IS_OPEN.findall(module_source),
+                usage['not is_open'],
                 'not is_open',
                 validation=validation,
                 **kwargs,
             )
 
+    index.save()
+
+    # refresh the cached issues changed since the previous run before they are read,
+    # the xdist controller did it when resolving the issues for the workers
+    if settings.jira.delta_sync and 'jira_issue_data' not in getattr(config, 'workerinput', {}):
+        sync_jira_cache([issue for issue in collected_data if issue.startswith('SAT-')])
+
     # --- add deselect markers dynamically ---
     for item in items:
         issue = deselect_data.get(item.location)
@@ -1,5 +1,18 @@
+"""Comment test results on the Jira issues they verify or are blocked by
+
+The results of each issue are aggregated by the process running the session, the xdist controller
+with xdist, and posted as one comment per issue. Comments are posted in the background when the
+session finishes, concurrently over one Jira session. The session waits at most
+``jira.comment_timeout`` seconds for them before reporting what was published, the comments
+still being posted then run in daemon threads, which don't delay the exit of the process.
+"""
+
 from collections import defaultdict
+from concurrent.futures import Future, wait
 import os
+from queue import Empty, SimpleQueue
+import threading
+import time
 
 import pytest
 
@@ -7,7 +20,12 @@ from robottelo.config import settings
 from robottelo.constants import JIRA_TESTS_FAILED_LABEL, JIRA_TESTS_PASSED_LABEL
 from robottelo.logging import logger
 from robottelo.utils import parse_comma_separated_list
-from robottelo.utils.issue_handlers.jira import add_comment_on_jira, get_single_jira
+from robottelo.utils.issue_handlers.jira import (
+    JIRA_FETCH_WORKERS,
+    add_comment_on_jira,
+    get_single_jira,
+    jira_session,
+)
 
 
 def pytest_addoption(parser):
@@ -32,22 +50,18 @@ def pytest_configure(config):
     """Register jira_comments markers to avoid warnings."""
     config.addinivalue_line('markers', 'jira_comments: Add test result comment on Jira issue.')
     pytest.jira_comments = config.getoption('jira_comments')
-
-
-def update_issue_to_tests_map(item, issues, test_result):
-    """If the test has Verifies or BlockedBy doc field,
-    an issue to tests mapping will be added/updated in config.issue_to_tests_map
-    for each test run with outcome of the test.
-    """
-    for issue in issues:
-        item.config.issue_to_tests_map[issue].append(
-            {'nodeid': item.nodeid, 'outcome': test_result}
+    if pytest.jira_comments and settings.jira.enable_comment:
+        config.pluginmanager.register(
+            JiraCommentPublisher(settings.jira.comment_timeout), 'jira_comment_publisher'
         )
 
 
 @pytest.hookimpl(trylast=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
-    """Create jira issue to test result mapping. Used for commenting result on Jira."""
+    """Record the Jira issues to comment the test result on in the teardown report
+
+    Reports are sent to the xdist controller, which aggregates the results of all workers.
+    """
     outcome = yield
     verifies_marker = item.get_closest_marker('verifies_issues')
     blocked_by_marker = item.get_closest_marker('blocked_by')
@@ -65,7 +79,8 @@ def pytest_runtest_makereport(item, call):
     ):
         report = outcome.get_result()
         if report.when == 'teardown':
-            test_result = (
+            report.jira_issues = [*verifies_issues, *blocked_by_issues]
+            report.jira_outcome = (
                 'passed'
                 if (
                     item.report_setup.passed
@@ -74,12 +89,6 @@ def pytest_runtest_makereport(item, call):
                 )
                 else 'failed'
             )
-            if not hasattr(item.config, 'issue_to_tests_map'):
-                item.config.issue_to_tests_map = defaultdict(list)
-            # Update issue_to_tests_map for Verifies testimony marker
-            update_issue_to_tests_map(item, verifies_issues, test_result)
-            # Update issue_to_tests_map for BlockedBy testimony marker
-            update_issue_to_tests_map(item, blocked_by_issues, test_result)
 
 
 def escape_special_characters(text):
@@ -89,51 +98,155 @@ def escape_special_characters(text):
     return text
 
 
-def pytest_sessionfinish(session, exitstatus):
-    """Add test result comment to related Jira issues."""
-    if hasattr(session.config, 'issue_to_tests_map'):
-        user = os.environ.get('USER')
-        build_url = os.environ.get('BUILD_URL')
-        for issue in session.config.issue_to_tests_map:
-            # Sort test result based on the outcome.
-            session.config.issue_to_tests_map[issue].sort(key=lambda x: x['outcome'])
-            all_tests_passed = True
-            comment_body = (
-                f'This is an automated comment from job/user: {build_url if build_url else user} for a Robottelo test run.\n'
-                f'Satellite/Capsule: {settings.server.version.release} Snap: {settings.server.version.snap} \n'
-                f'Result for tests linked with issue: {issue} \n'
+def comment_body(issue, tests):
+    """Return the comment on the test results of an issue, and whether all the tests passed
+
+    :param issue: Jira issue id
+    :param tests: list of dicts with the nodeid and outcome of the tests linked with the issue
+    """
+    user = os.environ.get('USER')
+    build_url = os.environ.get('BUILD_URL')
+    all_tests_passed = True
+    body = (
+        f'This is an automated comment from job/user: {build_url if build_url else user} for a Robottelo test run.\n'
+        f'Satellite/Capsule: {settings.server.version.release} Snap: {settings.server.version.snap} \n'
+        f'Result for tests linked with issue: {issue} \n'
+    )
+    # Sort test result based on the outcome.
+    for test in sorted(tests, key=lambda x: x['outcome']):
+        color_code = '{color:green}'
+        if test['outcome'] == 'failed':
+            all_tests_passed = False
+            color_code = '{color:red}'
+        # Color code test outcome
+        color_coded_result = f'{color_code}{test["outcome"]}{{color}}'
+        # Escape special characters in the node_id.
+        escaped_node_id = escape_special_characters(test['nodeid'])
+        body += f'{escaped_node_id} : {color_coded_result} \n'
+    return body, all_tests_passed
+
+
+class JiraCommentPublisher:
+    """Plugin aggregating test results per Jira issue, and posting them when the session finishes"""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+        # issue id: list of dicts with the nodeid and outcome of the tests linked with the issue
+        self.issue_to_tests_map = defaultdict(list)
+        self.session = None
+        self.futures = {}
+        self.start = None
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != 'teardown' or not getattr(report, 'jira_issues', None):
+            return
+        for issue in report.jira_issues:
+            self.issue_to_tests_map[issue].append(
+                {'nodeid': report.nodeid, 'outcome': report.jira_outcome}
             )
-            for item in session.config.issue_to_tests_map[issue]:
-                color_code = '{color:green}'
-                if item['outcome'] == 'failed':
-                    all_tests_passed = False
-                    color_code = '{color:red}'
-                # Color code test outcome
-                color_coded_result = f'{color_code}{item["outcome"]}{{color}}'
-                # Escape special characters in the node_id.
-                escaped_node_id = escape_special_characters(item['nodeid'])
-                comment_body += f'{escaped_node_id} : {color_coded_result} \n'
+
+    def publish(self, issue, tests):
+        """Comment the test results on an issue
+
+        :return: True if the comment was posted, False if the issue doesn't need one
+        """
+        body, all_tests_passed = comment_body(issue, tests)
+        labels = (
+            [{'add': JIRA_TESTS_PASSED_LABEL}, {'remove': JIRA_TESTS_FAILED_LABEL}]
+            if all_tests_passed
+            else [{'add': JIRA_TESTS_FAILED_LABEL}, {'remove': JIRA_TESTS_PASSED_LABEL}]
+        )
+        data = get_single_jira(issue)
+        # Initially set a Pass/Fail label based on the test result
+        # If the state changes add a comment
+        # If the state is already failing, and test is failing, still add a comment
+        # If the state is already passing, and the test passes, don’t add a comment
+        if (data['status'] in settings.jira.issue_status) and (
+            not all_tests_passed or JIRA_TESTS_PASSED_LABEL not in data['labels']
+        ):
+            add_comment_on_jira(issue, body, labels=labels, session=self.session)
+            return True
+        logger.warning(
+            f'Jira comments are currently disabled for {issue} issue. '
+            f'It could be because jira is in {data["status"]} state or that there are no failing tests. \n'
+            'Please update issue_status in jira.conf to override this behaviour.'
+        )
+        return False
+
+    def _publisher(self, queue):
+        """Publish the comments of the queued issues until none is left"""
+        while True:
             try:
-                labels = (
-                    [{'add': JIRA_TESTS_PASSED_LABEL}, {'remove': JIRA_TESTS_FAILED_LABEL}]
-                    if all_tests_passed
-                    else [{'add': JIRA_TESTS_FAILED_LABEL}, {'remove': JIRA_TESTS_PASSED_LABEL}]
-                )
-                data = get_single_jira(issue)
-                # Initially set a Pass/Fail label based on the test result
-                # If the state changes add a comment
-                # If the state is already failing, and test is failing, still add a comment
-                # If the state is already passing, and the test passes, don’t add a comment
-                if (data['status'] in settings.jira.issue_status) and (
-                    not all_tests_passed or JIRA_TESTS_PASSED_LABEL not in data['labels']
-                ):
-                    add_comment_on_jira(issue, comment_body, labels=labels)
-                else:
-                    logger.warning(
-                        f'Jira comments are currently disabled for {issue} issue. '
-                        f'It could be because jira is in {data["status"]} state or that there are no failing tests. \n'
-                        'Please update issue_status in jira.conf to override this behaviour.'
-                    )
-            except Exception as e:
+                issue, tests, future = queue.get_nowait()
+            except Empty:
+                return
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.publish(issue, tests))
+            except Exception as err:
+                future.set_exception(err)
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_sessionfinish(self, session):
+        """Start posting the comments, while the other plugins finish the session"""
+        if hasattr(session.config, 'workerinput') or not self.issue_to_tests_map:
+            return
+        self.start = time.monotonic()
+        self.session = jira_session()
+        queue = SimpleQueue()
+        for issue, tests in self.issue_to_tests_map.items():
+            future = Future()
+            self.futures[future] = issue
+            queue.put((issue, tests, future))
+        # unlike the workers of a ThreadPoolExecutor, daemon threads aren't joined at exit, so
+        # comments still retrying after the timeout don't keep the process running
+        for index in range(min(JIRA_FETCH_WORKERS, len(self.futures))):
+            threading.Thread(
+                target=self._publisher, args=(queue,), name=f'jira-comments-{index}', daemon=True
+            ).start()
+
+    def wait(self):
+        """Wait for the comments until the timeout, and return a summary of the publishing"""
+        done, pending = wait(
+            self.futures, timeout=max(self.start + self.timeout - time.monotonic(), 0)
+        )
+        published = skipped = failed = 0
+        for future in done:
+            if error := future.exception():
                 # Handle any errors in adding comments to Jira
-                logger.warning(f'Failed to add comment to Jira issue {issue}: {e}')
+                logger.warning(
+                    f'Failed to add comment to Jira issue {self.futures[future]}: {error}'
+                )
+                failed += 1
+            elif future.result():
+                published += 1
+            else:
+                skipped += 1
+        if pending:
+            logger.warning(
+                f'Jira comments not posted within {self.timeout}s: '
+                f'{sorted(self.futures[future] for future in pending)}'
+            )
+        # comments not started yet are cancelled, running ones are abandoned to their thread
+        for future in pending:
+            future.cancel()
+        if not pending:
+            self.session.close()
+        self.futures = {}
+        return (
+            f'jira comments: {published} posted, {skipped} not needed, {failed} failed, '
+            f'{len(pending)} not posted within {self.timeout}s, '
+            f'in {time.monotonic() - self.start:.1f}s'
+        )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if self.futures:
+            message = self.wait()
+            terminalreporter.write_line(message)
+            logger.info(message)
+
+    def pytest_unconfigure(self):
+        # without terminal summary, e.g. with -p no:terminal
+        if self.futures:
+            logger.info(self.wait())
@@ -1,6 +1,4 @@
-import pytest
-
-from robottelo.logging import collection_logger as logger
+from pytest_plugins.collection_pipeline import get_pipeline
 
 
 def pytest_addoption(parser):
@@ -20,32 +18,26 @@ def pytest_addoption(parser):
         parser.addoption(opt, action='store_true', default=False, help=help_text)
 
 
-@pytest.hookimpl(tryfirst=True)
-def pytest_collection_modifyitems(items, config):
+def pytest_configure(config):
+    get_pipeline(config).register('marker_deselection', marker_deselection_stage, order=30)
+
+
+def marker_deselection_stage(config, items):
     """
     Collects and modifies tests collection based on pytest option to deselect tests for new infra
     """
     include_onprem_provision = config.getoption('include_onprem_provisioning', False)
     include_ipv6_provisioning = config.getoption('include_ipv6_provisioning', False)
 
-    selected = []
-    deselected = []
     # Cloud Provisioning Test can be run on new pipeline
-    for item in items:
-        item_marks = [m.name for m in item.iter_markers()]
+    def deselect_infra_dependent(item, record):
         # Include / Exclude On Premises Provisioning Tests
-        if 'on_premises_provisioning' in item_marks:
-            selected.append(item) if include_onprem_provision else deselected.append(item)
-            continue
+        if 'on_premises_provisioning' in record.names:
+            return None if include_onprem_provision else '--include-onprem-provisioning not set'
         # Include / Exclude IPv6 Provisioning Tests
-        if 'ipv6_provisioning' in item_marks:
-            selected.append(item) if include_ipv6_provisioning else deselected.append(item)
-            continue
+        if 'ipv6_provisioning' in record.names:
+            return None if include_ipv6_provisioning else '--include-ipv6-provisioning not set'
         # This Plugin does not applies to this test
-        selected.append(item)
-    logger.debug(
-        f'Selected {len(selected)} and deselected {len(deselected)} '
-        'tests based on auto un-collectable markers and pytest options.'
-    )
-    items[:] = selected or items
-    config.hook.pytest_deselected(items=deselected)
+        return None
+
+    return deselect_infra_dependent
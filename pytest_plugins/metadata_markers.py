@@ -1,19 +1,22 @@
 import datetime
 import inspect
 import re
+import sys
 
+from packaging.version import Version
 import pytest
 
+from pytest_plugins.collection_pipeline import get_pipeline
+from pytest_plugins.satellite_facts import get_satellite_facts
 from robottelo.config import settings
-from robottelo.hosts import get_sat_rhel_version
 from robottelo.logging import collection_logger as logger
 from robottelo.utils import parse_comma_separated_list
 from robottelo.utils.issue_handlers.jira import are_any_jira_open
+from robottelo.utils.source_index import SourceScanCache, docstrings
 
 FMT_XUNIT_TIME = '%Y-%m-%dT%H:%M:%S'
 IMPORTANCE_LEVELS = []
-selected = []
-deselected = []
+docstring_index = pytest.StashKey()
 
 
 def pytest_addoption(parser):
@@ -61,6 +64,7 @@ def pytest_configure(config):
         'verifies_issues: Verifies testimony token, use --verifies_issues to filter',
     ]:
         config.addinivalue_line("markers", marker)
+    get_pipeline(config).register('metadata_markers', metadata_markers_stage, order=20)
 
 
 component_regex = re.compile(
@@ -94,47 +98,99 @@ verifies_regex = re.compile(
 )
 
 
-def handle_verification_issues(item, verifies_marker, verifies_issues):
+# token name, regex and which match is used when a docstring repeats the token
+TOKEN_REGEXES = (
+    ('component', component_regex, 0),
+    ('importance', importance_regex, 0),
+    ('team', team_regex, 0),
+    ('verifies', verifies_regex, -1),
+    ('blocked_by', blocked_by_regex, -1),
+)
+
+
+def docstring_tokens(docstring):
+    """Return a dict of the testimony tokens found in a docstring"""
+    tokens = {}
+    for name, regex, index in TOKEN_REGEXES:
+        if matches := regex.findall(docstring):
+            tokens[name] = matches[index]
+    return tokens
+
+
+def scan_docstring_tokens(source):
+    """Return the testimony tokens of every docstring of a module source"""
+    return {qualname: docstring_tokens(doc) for qualname, doc in docstrings(source).items()}
+
+
+def object_docstring_tokens(index, obj):
+    """Return the testimony tokens of the docstring ``inspect.getdoc`` returns for ``obj``
+
+    Docstrings come from the static index of the file defining ``obj``. Objects missing in it,
+    like classes and methods inheriting their docstring, fall back to ``inspect.getdoc``.
+
+    :return: dict of tokens, None if ``obj`` is None or has no docstring
+    """
+    if obj is None:
+        return None
+    if inspect.ismodule(obj):
+        path, qualname = getattr(obj, '__file__', None), ''
+    elif inspect.isclass(obj):
+        path = getattr(sys.modules.get(obj.__module__), '__file__', None)
+        qualname = obj.__qualname__
+    else:
+        path = getattr(getattr(obj, '__code__', None), 'co_filename', None)
+        qualname = getattr(obj, '__qualname__', None)
+    if path and path.endswith('.py') and qualname is not None:
+        try:
+            tokens = index.get(path)
+        except (OSError, SyntaxError, ValueError) as err:
+            logger.debug(f'Unable to index docstrings of {path}: {err}')
+        else:
+            if qualname in tokens:
+                return tokens[qualname]
+    doc = inspect.getdoc(obj)
+    return None if doc is None else docstring_tokens(doc)
+
+
+def handle_verification_issues(verifies_marker, verifies_issues):
     """Handles the logic for deselecting tests based on Verifies testimony token
     and --verifies-issues pytest option.
+
+    :return: the deselecting option, None if the test is kept
     """
     if verifies_issues:
         if not verifies_marker:
-            log_and_deselect(item, '--verifies-issues')
-            return False
+            return '--verifies-issues'
         if isinstance(verifies_issues, list):
             verifies_args = verifies_marker.args[0]
             if all(issue not in verifies_issues for issue in verifies_args):
-                log_and_deselect(item, '--verifies-issues')
-                return False
-    return True
+                return '--verifies-issues'
+    return None
 
 
-def handle_blocked_by(item, blocked_by_marker, blocked_by):
+def handle_blocked_by(blocked_by_marker, blocked_by):
     """Handles the logic for deselecting tests based on BlockedBy testimony token
     and --blocked-by pytest option.
+
+    :return: the deselecting option, None if the test is kept
     """
     if isinstance(blocked_by, list):
         if not blocked_by_marker:
-            log_and_deselect(item, '--blocked-by')
-            return False
+            return '--blocked-by'
         if all(issue not in blocked_by for issue in blocked_by_marker.args[0]):
-            log_and_deselect(item, '--blocked-by')
-            return False
+            return '--blocked-by'
     elif isinstance(blocked_by, bool) and blocked_by_marker:
         if blocked_by and are_any_jira_open(blocked_by_marker.args[0]):
-            log_and_deselect(item, '--blocked-by')
-            return False
-    return True
+            return '--blocked-by'
+    return None
 
 
-def log_and_deselect(item, option):
-    logger.debug(f'Deselected test {item.nodeid} due to "{option}" pytest option.')
-    deselected.append(item)
+def pytest_collection_finish(session):
+    if (index := session.config.stash.get(docstring_index, None)) is not None:
+        index.save()
 
 
-@pytest.hookimpl(tryfirst=True)
-def pytest_collection_modifyitems(items, config):
+def metadata_markers_stage(config, items):
     """Add markers and user_properties for testimony token metadata
 
     user_properties is used by the junit plugin, and thus by many test report systems
@@ -148,9 +204,11 @@ def pytest_collection_modifyitems(items, config):
 
     """
     # get RHEL version of the satellite
-    rhel_version = get_sat_rhel_version().base_version
+    facts = get_satellite_facts(config)
+    rhel_version = Version(facts['rhel_version']).base_version
     sat_version = settings.server.version.get('release')
     snap_version = settings.server.version.get('snap', '')
+    network_type = facts['network_type']
 
     # split the option string and handle no option, single option, multiple
     # config.getoption(default) doesn't work like you think it does, hence or ''
@@ -159,55 +217,61 @@ def pytest_collection_modifyitems(items, config):
     team = [a.lower() for a in (config.getoption('team') or '').split(',') if a != '']
     verifies_issues = config.getoption('verifies_issues')
     blocked_by = config.getoption('blocked_by')
+    cache = getattr(config, 'cache', None)
+    index = config.stash[docstring_index] = SourceScanCache(
+        'docstring_tokens',
+        scan_docstring_tokens,
+        cache_dir=cache.mkdir('source_index') if cache else None,
+    )
     logger.info('Processing test items to add testimony token markers')
-    for item in items:
+
+    def apply_metadata(item, record):
         item.user_properties.append(
             ("start_time", datetime.datetime.now(datetime.UTC).strftime(FMT_XUNIT_TIME))
         )
         if item.nodeid.startswith('tests/robottelo/') and 'test_junit' not in item.nodeid:
             # Unit test, no testimony markers
-            continue
+            return None
 
         # apply the marks for importance, component, and team
         # Find matches from docstrings starting at smallest scope
-        item_docstrings = [
-            d
-            for d in map(inspect.getdoc, (item.function, getattr(item, 'cls', None), item.module))
-            if d is not None
+        item_tokens = [
+            tokens
+            for tokens in (
+                object_docstring_tokens(index, obj)
+                for obj in (item.function, getattr(item, 'cls', None), item.module)
+            )
+            if tokens is not None
         ]
+        item_mark_names = set(record.names)
+        marks_to_add = []
         blocked_by_marks_to_add = []
         verifies_marks_to_add = []
-        for docstring in item_docstrings:
-            item_mark_names = [m.name for m in item.iter_markers()]
+        for tokens in item_tokens:
             # Add marker starting at smallest docstring scope
             # only add the mark if it hasn't already been applied at a lower scope
-            doc_component = component_regex.findall(docstring)
-            if doc_component and 'component' not in item_mark_names:
-                item.add_marker(pytest.mark.component(doc_component[0].lower()))
-            doc_importance = importance_regex.findall(docstring)
-            if doc_importance and 'importance' not in item_mark_names:
-                item.add_marker(pytest.mark.importance(doc_importance[0].lower()))
-            doc_team = team_regex.findall(docstring)
-            if doc_team and 'team' not in item_mark_names:
-                item.add_marker(pytest.mark.team(doc_team[0].lower()))
-            doc_verifies = verifies_regex.findall(docstring)
-            if doc_verifies and 'verifies_issues' not in item_mark_names:
-                verifies_marks_to_add.extend(str(b.strip()) for b in doc_verifies[-1].split(','))
-            doc_blocked_by = blocked_by_regex.findall(docstring)
-            if doc_blocked_by and 'blocked_by' not in item_mark_names:
+            for name in ('component', 'importance', 'team'):
+                if name in tokens and name not in item_mark_names:
+                    marks_to_add.append(getattr(pytest.mark, name)(tokens[name].lower()))
+                    item_mark_names.add(name)
+            if 'verifies' in tokens and 'verifies_issues' not in item_mark_names:
+                verifies_marks_to_add.extend(str(b.strip()) for b in tokens['verifies'].split(','))
+            if 'blocked_by' in tokens and 'blocked_by' not in item_mark_names:
                 blocked_by_marks_to_add.extend(
-                    str(b.strip()) for b in doc_blocked_by[-1].split(',')
+                    str(b.strip()) for b in tokens['blocked_by'].split(',')
                 )
         if blocked_by_marks_to_add:
-            item.add_marker(pytest.mark.blocked_by(blocked_by_marks_to_add))
+            marks_to_add.append(pytest.mark.blocked_by(blocked_by_marks_to_add))
         if verifies_marks_to_add:
-            item.add_marker(pytest.mark.verifies_issues(verifies_marks_to_add))
+            marks_to_add.append(pytest.mark.verifies_issues(verifies_marks_to_add))
+        if marks_to_add:
+            record.add_marker(*marks_to_add)
 
         # add markers as user_properties so they are recorded in XML properties of the report
         # pytest-ibutsu will include user_properties dict in testresult metadata
         markers_prop_data = []
         exclude_markers = ['parametrize', 'skipif', 'usefixtures', 'skip_if_not_set']
-        for marker in item.iter_markers():
+        for marker in record.markers:
             property = marker.name
             if property in exclude_markers:
                 continue
@@ -223,14 +287,7 @@ def pytest_collection_modifyitems(items, config):
         item.user_properties.append(("BaseOS", rhel_version))
         item.user_properties.append(("SatelliteVersion", sat_version))
         item.user_properties.append(("SnapVersion", snap_version))
-
-        # Network Type user property
-        # Note:
-        # We must convert the network type to a string
-        # because the network type is a class object
-        # and execnet/xdist will not serialize it
-        # properly when running in parallel
-        item.user_properties.append(("SatelliteNetworkType", str(settings.server.network_type)))
+        item.user_properties.append(("SatelliteNetworkType", network_type))
 
         # exit early if no filters were passed
         if importance or component or team:
@@ -241,42 +298,24 @@ def pytest_collection_modifyitems(items, config):
 
             # https://github.com/pytest-dev/pytest/issues/1373  Will make this way easier
             # testimony requires both importance and component, this will blow up if its forgotten
-            importance_marker = item.get_closest_marker('importance').args[0]
+            importance_marker = record.closest('importance').args[0]
             if importance and importance_marker not in importance:
-                logger.debug(
-                    f'Deselected test {item.nodeid} due to "--importance {importance}",'
-                    f'test has importance mark: {importance_marker}'
-                )
-                deselected.append(item)
-                continue
-            component_marker = item.get_closest_marker('component').args[0]
+                return f'"--importance {importance}", test has importance mark: {importance_marker}'
+            component_marker = record.closest('component').args[0]
             if component and component_marker not in component:
-                logger.debug(
-                    f'Deselected test {item.nodeid} due to "--component {component}",'
-                    f'test has component mark: {component_marker}'
-                )
-                deselected.append(item)
-                continue
-            team_marker = item.get_closest_marker('team').args[0]
+                return f'"--component {component}", test has component mark: {component_marker}'
+            team_marker = record.closest('team').args[0]
             if team and team_marker not in team:
-                logger.debug(
-                    f'Deselected test {item.nodeid} due to "--team {team}",'
-                    f'test has team mark: {team_marker}'
-                )
-                deselected.append(item)
-                continue
+                return f'"--team {team}", test has team mark: {team_marker}'
 
         if verifies_issues or blocked_by:
             # Filter tests based on --verifies-issues and --blocked-by pytest options
             # and Verifies and BlockedBy testimony tokens.
-            verifies_marker = item.get_closest_marker('verifies_issues', False)
-            blocked_by_marker = item.get_closest_marker('blocked_by', False)
-            if not handle_verification_issues(item, verifies_marker, verifies_issues):
-                continue
-            if not handle_blocked_by(item, blocked_by_marker, blocked_by):
-                continue
-        selected.append(item)
-
-    # selected will be empty if no filter option was passed, defaulting to full items list
-    items[:] = selected if deselected else items
-    config.hook.pytest_deselected(items=deselected)
+            verifies_marker = record.closest('verifies_issues', False)
+            blocked_by_marker = record.closest('blocked_by', False)
+            return handle_verification_issues(
+                verifies_marker, verifies_issues
+            ) or handle_blocked_by(blocked_by_marker, blocked_by)
+        return None
+
+    return apply_metadata
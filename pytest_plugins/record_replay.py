@@ -0,0 +1,89 @@
+"""Record HTTP and SSH traffic of each test into a cassette, or replay it without a Satellite
+
+Usage:
+    pytest tests/foreman/api/test_organization.py --record-mode record
+    pytest tests/foreman/api/test_organization.py --record-mode replay
+"""
+
+from pathlib import Path
+import random
+import re
+import time
+
+import pytest
+
+from robottelo.logging import logger
+from robottelo.utils.record_replay import RECORD_MODES, use_cassette
+
+_stats = {'tests': 0, 'missing': 0, 'interactions': 0, 'recorded_time': 0.0, 'run_time': 0.0}
+
+
+def pytest_addoption(parser):
+    """Add options to record and replay the HTTP and SSH traffic of tests"""
+    parser.addoption(
+        '--record-mode',
+        action='store',
+        default='off',
+        choices=RECORD_MODES,
+        help='Record the HTTP and SSH traffic of each test into a cassette, '
+        'or replay it from the cassettes without a live Satellite.',
+    )
+    parser.addoption(
+        '--cassette-dir',
+        action='store',
+        default='cassettes',
+        help='Directory where the record/replay cassettes are stored.',
+    )
+
+
+def cassette_path(config, nodeid):
+    """Return the cassette path of a test node id"""
+    module, _, name = nodeid.partition('::')
+    name = re.sub(r'[^\w.-]+', '_', name)
+    return Path(config.getoption('cassette_dir')).joinpath(module, f'{name}.json.gz')
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Wrap setup, call and teardown of each test in its own cassette"""
+    mode = item.config.getoption('record_mode')
+    if mode == 'off':
+        yield
+        return
+    path = cassette_path(item.config, item.nodeid)
+    if mode == 'replay' and not path.exists():
+        # only this test can't be replayed, the session goes on
+        item.add_marker(pytest.mark.skip(reason=f'No cassette to replay: {path}'))
+        _stats['missing'] += 1
+        yield
+        return
+    # random values end up in requests and commands, keep them identical between runs
+    random.seed(item.nodeid)
+    start = time.perf_counter()
+    with use_cassette(path, mode=mode) as cassette:
+        yield
+    _stats['tests'] += 1
+    _stats['run_time'] += time.perf_counter() - start
+    if mode == 'replay':
+        _stats['interactions'] += cassette.played
+        _stats['recorded_time'] += cassette.recorded_time
+    else:
+        _stats['interactions'] += len(cassette.interactions)
+        _stats['recorded_time'] += sum(i['elapsed'] for i in cassette.interactions)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report the time spent in recorded remote calls versus the framework's own time"""
+    mode = config.getoption('record_mode')
+    if mode == 'off' or not (_stats['tests'] or _stats['missing']):
+        return
+    own_time = _stats['run_time'] - (0 if mode == 'replay' else _stats['recorded_time'])
+    message = (
+        f'{mode}: {_stats["tests"]} tests, {_stats["interactions"]} interactions, '
+        f'remote time {_stats["recorded_time"]:.2f}s, framework time {own_time:.2f}s'
+    )
+    if _stats['missing']:
+        message += f', {_stats["missing"]} tests skipped without a cassette'
+    terminalreporter.write_sep('-', 'record/replay summary')
+    terminalreporter.write_line(message)
+    logger.info(f'Record/replay summary: {message}')
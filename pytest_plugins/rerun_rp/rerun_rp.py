@@ -1,7 +1,9 @@
+from packaging.version import Version
 import pytest
 
+from pytest_plugins.collection_pipeline import get_pipeline
+from pytest_plugins.satellite_facts import get_satellite_facts
 from robottelo.config import settings
-from robottelo.hosts import get_sat_version
 from robottelo.logging import logger
 from robottelo.utils.report_portal.portal import ReportPortal
 
@@ -66,8 +68,11 @@ def pytest_addoption(parser):
     parser.addoption("--rp-reference-launch-uuid", nargs='?', help=help_text)
 
 
-@pytest.hookimpl(tryfirst=True)
-def pytest_collection_modifyitems(items, config):
+def pytest_configure(config):
+    get_pipeline(config).register('rerun_rp', rerun_rp_stage, order=10)
+
+
+def rerun_rp_stage(config, items):
     """
     Collects and modifies test collection based on the pytest options to select the tests marked as
     failed/skipped and user-specific tests in Report Portal
@@ -86,7 +91,7 @@ def pytest_collection_modifyitems(items, config):
     )
     tests = []
     if not any([fail_args, skip_arg, user_arg]):
-        return
+        return None
     rp = ReportPortal(rp_url=rp_url, rp_api_key=rp_api_key, rp_project=rp_project)
 
     if ref_launch_uuid:
@@ -97,7 +102,7 @@ def pytest_collection_modifyitems(items, config):
                 f'Provided reference launch {ref_launch_uuid} was not found or is not finished'
             )
     else:
-        sat_release = get_sat_version().base_version
+        sat_release = Version(get_satellite_facts(config)['version']).base_version
         sat_snap = settings.server.version.get('snap', '')
         if not all([sat_release, sat_snap, (len(sat_release.split('.')) == 3)]):
             raise pytest.UsageError(
@@ -139,16 +144,11 @@ def pytest_collection_modifyitems(items, config):
         _validate_launch(ref_launch)
         tests.extend(rp.get_tests(launch=ref_launch, **test_args))
     # remove inapplicable tests from the current test collection
-    deselected = [
-        i
-        for i in items
-        if f'{i.location[0]}.{i.location[2]}'.replace('::', '.')
-        not in [t['name'].replace('::', '.') for t in tests]
-    ]
-    selected = list(set(items) - set(deselected))
-    logger.debug(
-        f'Selected {len(selected)} and deselected {len(deselected)} tests based on latest/given-/ '
-        'launch test results.'
-    )
-    config.hook.pytest_deselected(items=deselected)
-    items[:] = selected
+    test_names = {t['name'].replace('::', '.') for t in tests}
+
+    def select_from_launch(item, record):
+        if f'{item.location[0]}.{item.location[2]}'.replace('::', '.') not in test_names:
+            return 'not selected in the reference Report Portal launches'
+        return None
+
+    return select_from_launch
@@ -0,0 +1,28 @@
+"""Facts of the target Satellite, gathered once per test run
+
+Collection plugins and test modules need the Satellite and RHEL versions of the target Satellite,
+which are read over ssh. ``robottelo.hosts.get_sat_facts`` gathers them once per process, and
+``get_sat_version`` and ``get_sat_rhel_version`` return them when no Satellite is passed. With
+xdist, the controller gathers them while setting up the workers and hands them over in
+``workerinput``, so workers never connect to the Satellite during collection.
+"""
+
+import pytest
+
+from robottelo.hosts import get_sat_facts, set_sat_facts
+
+
+def get_satellite_facts(config):
+    """Return the facts of the target Satellite, see ``robottelo.hosts.get_sat_facts``"""
+    return get_sat_facts()
+
+
+def pytest_configure(config):
+    if (facts := getattr(config, 'workerinput', {}).get('satellite_facts')) is not None:
+        set_sat_facts(facts)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Hand the facts gathered by the xdist controller over to the workers"""
+    node.workerinput['satellite_facts'] = get_satellite_facts(node.config)
@@ -2,8 +2,8 @@ import math
 import random
 
 from fauxfactory import gen_string
-import pytest
 
+from pytest_plugins.collection_pipeline import LAST, get_pipeline
 from robottelo.logging import logger
 
 
@@ -37,11 +37,16 @@ def pytest_configure(config):
     ]
     for marker in markers:
         config.addinivalue_line('markers', marker)
+    get_pipeline(config).register_collection(
+        'select_random_tests', select_random_tests_stage, phase=LAST, order=10
+    )
+
 
+def select_random_tests_stage(config, items):
+    """Select N random tests from the selected test collection.
 
-@pytest.hookimpl(trylast=True)
-def pytest_collection_modifyitems(items, config):
-    """Modify test collection to select and run N random tests from the selected test collection."""
+    :return: the randomly selected tests, None if --select-random-tests was not passed
+    """
     select_random_tests = config.getoption('select_random_tests')
     random_seed = config.getoption('random_seed')
     if select_random_tests:
@@ -63,7 +68,5 @@ def pytest_collection_modifyitems(items, config):
             'Modifying test collection based on --select-random-tests pytest option. '
             f'Tests collected: {len(items)}, Tests to select randomly: {select_random_tests}, Seed value: {random_seed}'
         )
-        deselected = [item for item in items if item not in selected]
-        # selected will be empty if no filter option was passed, defaulting to full items list
-        items[:] = selected if deselected else items
-        config.hook.pytest_deselected(items=deselected)
+        return selected
+    return None
@@ -1,6 +1,27 @@
 import pytest
 
 from robottelo.config import setting_is_set, settings
+from robottelo.logging import collection_logger as logger
+
+settings_index = pytest.StashKey()
+invalid_settings = pytest.StashKey()
+
+
+class SettingsIndex:
+    """Settings sections present in the configuration, and whether they are set
+
+    Sections are listed once per session. ``setting_is_set``, which validates the section, runs
+    at most once per section, the first time a test asks for it.
+    """
+
+    def __init__(self, settings):
+        self.sections = {key for key in settings if not key.endswith('_FOR_DYNACONF')}
+        self._is_set = {}
+
+    def is_set(self, section):
+        if section not in self._is_set:
+            self._is_set[section] = setting_is_set(section)
+        return self._is_set[section]
 
 
 def pytest_configure(config):
@@ -12,28 +33,29 @@ def pytest_configure(config):
     )
 
 
-def pytest_runtest_setup(item):
-    """Skip in setup if settings mark isn't met
+def pytest_collection_modifyitems(session, config, items):
+    """Mark tests requiring sections which are not set to skip, before any fixture setup
 
     settings validate method is used, so required fields are checked
-
-    This will be getting updated before too long when dynaconf consolidation happens
     """
-    skip_marker = item.get_closest_marker('skip_if_not_set', None)
-    if skip_marker and skip_marker.args:
+    index = config.stash.setdefault(settings_index, SettingsIndex(settings))
+    for item in items:
+        skip_marker = item.get_closest_marker('skip_if_not_set', None)
+        if not (skip_marker and skip_marker.args):
+            continue
         options_set = {arg.upper() for arg in skip_marker.args}
-        settings_set = {key for key in settings if not key.endswith('_FOR_DYNACONF')}
-        if not options_set.issubset(settings_set):
-            invalid = options_set.difference(settings_set)
-            raise ValueError(
-                f'Feature(s): {invalid} not found. Available ones are: {settings_set}.'
-            )
-
-        missing = []
-        for option in options_set:
-            # Example: `settings.clients`
-            if not setting_is_set(option):
-                # List of all sections that are not fully configured
-                missing.append(option)
-        if missing:
-            pytest.skip(f'Missing configuration for: {missing}.')
+        if invalid := options_set.difference(index.sections):
+            # reported when the test is set up, like before the index existed
+            item.stash[invalid_settings] = invalid
+            continue
+        # List of all sections that are not fully configured
+        if missing := sorted(option for option in options_set if not index.is_set(option)):
+            logger.debug(f'Marking {item.nodeid} to skip, missing configuration for {missing}')
+            item.add_marker(pytest.mark.skip(reason=f'Missing configuration for: {missing}.'))
+
+
+def pytest_runtest_setup(item):
+    """Fail in setup if the settings mark names unknown settings sections"""
+    if invalid := item.stash.get(invalid_settings, None):
+        sections = item.config.stash[settings_index].sections
+        raise ValueError(f'Feature(s): {invalid} not found. Available ones are: {sections}.')
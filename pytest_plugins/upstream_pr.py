@@ -15,6 +15,7 @@ import re
 from github import Auth, Github
 from github.GithubException import GithubException
 
+from pytest_plugins.collection_pipeline import get_pipeline
 from robottelo.config import settings
 from robottelo.logging import collection_logger as logger
 
@@ -46,7 +47,7 @@ def component_match(item, components, base_marker):
     2. `item` must have a component marker matching one of the given `components`.
 
     Args:
-        item: pytest test item to check
+        item: pytest test item, or its collection pipeline ItemRecord, to check
         components: set of component names to match against
         base_marker: optional base marker that must be present
 
@@ -59,8 +60,8 @@ def component_match(item, components, base_marker):
 
     # Check for component marker matching any of the specified components
     return any(
-        marker.name == 'component' and any(component in marker.args for component in components)
-        for marker in item.iter_markers()
+        any(component in marker.args for component in components)
+        for marker in item.iter_markers('component')
     )
 
 
@@ -87,7 +88,11 @@ def pytest_addoption(parser):
     )
 
 
-def pytest_collection_modifyitems(session, items, config):
+def pytest_configure(config):
+    get_pipeline(config).register('upstream_pr', upstream_pr_stage, order=40)
+
+
+def upstream_pr_stage(config, items):
     """Filter tests based on upstream PRs.
 
     Process:
@@ -97,9 +102,11 @@ def pytest_collection_modifyitems(session, items, config):
     4. Filter collected tests to include only those with matching components
 
     Args:
-        session: pytest session object
-        items: list of collected test items
         config: pytest configuration object
+        items: list of collected test items
+
+    Returns:
+        callable returning the deselection reason of an item, None without --upstream-pr
 
     Raises:
         ValueError: If PR format is invalid or repository key not found
@@ -107,11 +114,11 @@ def pytest_collection_modifyitems(session, items, config):
     """
     # Parse upstream PR option
     if not (upstream_pr_option := config.getoption('upstream_pr')):
-        return
+        return None
 
     upstream_prs = [pr_info.strip() for pr_info in upstream_pr_option.split(',') if pr_info.strip()]
     if not upstream_prs:
-        return
+        return None
 
     components = set()
     gh_settings = settings.github_repos
@@ -211,22 +218,12 @@ def pytest_collection_modifyitems(session, items, config):
     if not components:
         logger.warning("No components matched from upstream PRs, all tests will be deselected")
 
-    selected = []
-    deselected = []
     base_marker = settings.github_repos.base_marker
     logger.info(f"Filtering tests based on components: {sorted(components)}")
 
-    for item in items:
-        if components and component_match(item, components, base_marker):
-            logger.debug(f'Selected test {item.nodeid} (matches components: {components})')
-            selected.append(item)
-        else:
-            logger.debug(f'Deselected test {item.nodeid} (no component match)')
-            deselected.append(item)
-
-    logger.info(f"Test filtering complete: {len(selected)} selected, {len(deselected)} deselected")
+    def select_matching_components(item, record):
+        if components and component_match(record, components, base_marker):
+            return None
+        return 'no component match'
 
-    # Apply the filtering
-    if deselected:
-        config.hook.pytest_deselected(items=deselected)
-    items[:] = selected
+    return select_matching_components
@@ -1,13 +1,17 @@
 import builtins
+import importlib.abc
+import importlib.util
 import logging
 import os
 from pathlib import Path
+import sys
 from urllib.parse import urlunsplit
 
-from dynaconf import LazySettings
+from dynaconf import LazySettings, Validator
 from dynaconf.validator import ValidationError
 from nailgun.config import ServerConfig
 
+from robottelo.config.snapshot import read_snapshot, settings_digest, write_snapshot
 from robottelo.config.validators import VALIDATORS
 from robottelo.logging import logger, robottelo_root_dir
 
@@ -16,32 +20,111 @@ if not os.getenv('ROBOTTELO_DIR'):
     os.environ['ROBOTTELO_DIR'] = str(robottelo_root_dir)
 
 
+def _validator_sections(validator):
+    """Return the top level settings sections a (combined) validator applies to"""
+    if combined := getattr(validator, 'validators', None):
+        return set().union(*(_validator_sections(v) for v in combined))
+    return {name.split('.')[0].lower() for name in validator.names}
+
+
+class LazyValidatedSettings(LazySettings):
+    """LazySettings validating each settings section on its first access
+
+    Validators are grouped by the top level section their names belong to. The first time a
+    section is read, through attribute access, ``get`` or item access, its validators run and
+    apply their defaults. Sections that are never used by a run are never validated.
+    """
+
+    def register_validators(self, validators):
+        """Register validators and defer their validation to the first access of each section
+
+        :param dict validators: mapping of section names to lists of validators
+        """
+        self.validators.register(**validators)
+        pending = {}
+        for validator in self.validators:
+            for section in _validator_sections(validator):
+                pending.setdefault(section, []).append(validator)
+        self.__dict__['_pending_validators'] = pending
+
+    def validate_section(self, section):
+        """Run the validators of ``section`` unless it was already validated"""
+        pending = self.__dict__.get('_pending_validators', {})
+        validators = pending.pop(str(section).lower(), None)
+        if validators is None:
+            return
+        try:
+            for validator in validators:
+                # conditional validators need the sections of their condition validated first
+                if isinstance(when := getattr(validator, 'when', None), Validator):
+                    for dependency in _validator_sections(when):
+                        self.validate_section(dependency)
+                validator.validate(self._wrapped)
+        except ValidationError as err:
+            if not self._wrapped.get('robottelo.settings.ignore_validation_errors'):
+                # keep the section pending so every access reports the error
+                pending[str(section).lower()] = validators
+                raise err
+            logger.warning(f'Dynaconf validation failed with\n{err}')
+
+    def validate_all(self):
+        """Validate all sections not validated yet"""
+        for section in list(self.__dict__.get('_pending_validators', {})):
+            self.validate_section(section)
+
+    def __getattr__(self, name):
+        if name.lower() in self.__dict__.get('_pending_validators', {}):
+            self.validate_section(name)
+        return super().__getattr__(name)
+
+    def __getitem__(self, key):
+        self.validate_section(str(key).split('.')[0])
+        return super().__getitem__(key)
+
+    def get(self, key, *args, **kwargs):
+        self.validate_section(str(key).split('.')[0])
+        return super().__getattr__('get')(key, *args, **kwargs)
+
+
 def get_settings():
-    """Return Lazy settings object after validating
+    """Return Lazy settings object with validation deferred to the first use of each section
+
+    The merged settings are loaded from the settings snapshot when one matches the current
+    settings files and ``ROBOTTELO_*`` environment, see ``robottelo.config.snapshot``.
 
-    :return: A validated Lazy settings object
+    :return: A Lazy settings object validating its sections on first access
     """
     if getattr(builtins, "__sphinx_build__", False):
         return None
-    settings = LazySettings(
+    options = dict(
         envvar_prefix="ROBOTTELO",
-        core_loaders=["YAML"],
         root_path=str(robottelo_root_dir),
-        settings_file="settings.yaml",
-        preload=["conf/*.yaml"],
-        includes=["settings.local.yaml", ".secrets.yaml", ".secrets_*.yaml"],
         envless_mode=True,
         lowercase_read=True,
         load_dotenv=True,
     )
-    settings.validators.register(**VALIDATORS)
-    try:
-        settings.validators.validate()
-    except ValidationError as err:
-        if settings.robottelo.settings.get('ignore_validation_errors'):
-            logger.warning(f'Dynaconf validation failed with\n{err}')
-        else:
-            raise err
+    digest = settings_digest(robottelo_root_dir)
+    data = read_snapshot(
+        robottelo_root_dir, digest, worker=bool(os.environ.get('PYTEST_XDIST_WORKER'))
+    )
+    if data is not None:
+        settings = LazyValidatedSettings(core_loaders=[], settings_file=[], **options)
+        settings.update(data, loader_identifier='settings_snapshot')
+    else:
+        settings = LazyValidatedSettings(
+            core_loaders=["YAML"],
+            settings_file="settings.yaml",
+            preload=["conf/*.yaml"],
+            includes=["settings.local.yaml", ".secrets.yaml", ".secrets_*.yaml"],
+            **options,
+        )
+        write_snapshot(
+            robottelo_root_dir,
+            digest,
+            settings.as_dict(),
+            get_fresh=settings._wrapped.get('robottelo.settings.get_fresh', True),
+        )
+    settings.register_validators(VALIDATORS)
     return settings
 
 
@@ -169,8 +252,40 @@ def configure_nailgun():
 configure_nailgun()
 
 
+class _ConfigureOnImport(importlib.abc.MetaPathFinder):
+    """Import hook calling ``configure`` right after the package ``name`` is first imported"""
+
+    def __init__(self, name, configure):
+        self.name = name
+        self.configure = configure
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname != self.name:
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def exec_and_configure(module):
+            exec_module(module)
+            self.configure()
+
+        spec.loader.exec_module = exec_and_configure
+        return spec
+
+
 def configure_airgun():
-    """Pass required settings to AirGun"""
+    """Pass required settings to AirGun
+
+    AirGun pulls in selenium and widgetastic, and only UI tests need it. If it is not imported
+    yet, it is configured as soon as it is.
+    """
+    if 'airgun' not in sys.modules:
+        if not any(isinstance(hook, _ConfigureOnImport) for hook in sys.meta_path):
+            sys.meta_path.insert(0, _ConfigureOnImport('airgun', configure_airgun))
+        return
     import airgun
 
     airgun.settings.configure(
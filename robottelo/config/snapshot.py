@@ -0,0 +1,146 @@
+"""Compiled snapshot of the merged robottelo settings
+
+Loading the settings parses ``settings.yaml``, every ``conf/*.yaml`` and the secrets includes and
+runs the ``conf/dynaconf_hooks.py`` post hook, which fetches repositories from ohsnap and runs the
+config migrations. Every pytest process and every xdist worker repeats that work.
+
+After a full load the merged, migrated (but not yet validated) settings tree is written as JSON
+to ``<digest>.json`` in a snapshot directory per checkout. The digest covers the content of all
+settings input files and the ``ROBOTTELO_*`` environment variables, so any change to the
+configuration produces a new digest and a full load.
+
+The snapshot holds the resolved secrets, so it's written outside of the checkout, in the user
+cache directory, readable by the user only. Mappings with keys which are not strings, like the
+LDAP hostnames per Active Directory version, are stored as lists of key value pairs to keep the
+type of their keys.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from robottelo.logging import logger
+
+SNAPSHOT_ROOT = Path(
+    os.environ.get('XDG_CACHE_HOME') or Path.home().joinpath('.cache'),
+    'robottelo',
+    'settings_snapshot',
+)
+# marks a mapping stored as key value pairs
+ITEMS_KEY = '__items__'
+SNAPSHOT_INPUTS = (
+    'settings.yaml',
+    'settings.local.yaml',
+    '.secrets.yaml',
+    '.secrets_*.yaml',
+    '.env',
+    'conf/*.yaml',
+    'conf/dynaconf_hooks.py',
+    'conf/migrations.py',
+)
+ENVVAR_PREFIX = 'ROBOTTELO_'
+
+
+def settings_digest(root_dir, environ=None):
+    """Return a digest of the settings input files and ``ROBOTTELO_*`` environment variables
+
+    :param root_dir: robottelo root directory the input patterns are relative to
+    :param environ: environment mapping, defaults to ``os.environ``
+    """
+    root_dir = Path(root_dir)
+    environ = os.environ if environ is None else environ
+    digest = hashlib.sha256()
+    for pattern in SNAPSHOT_INPUTS:
+        for path in sorted(root_dir.glob(pattern)):
+            digest.update(f'{path.relative_to(root_dir)}\0'.encode())
+            digest.update(path.read_bytes())
+            digest.update(b'\0')
+    for name in sorted(environ):
+        if name.startswith(ENVVAR_PREFIX):
+            digest.update(f'{name}={environ[name]}\0'.encode())
+    return digest.hexdigest()
+
+
+def snapshot_path(root_dir, digest):
+    """Return the snapshot path of ``digest``, in the snapshot directory of the checkout"""
+    checkout = hashlib.sha256(str(Path(root_dir).resolve()).encode()).hexdigest()[:16]
+    return SNAPSHOT_ROOT.joinpath(checkout, f'{digest}.json')
+
+
+def _encode(value):
+    """Return ``value`` with the mappings with keys which are not strings as key value pairs"""
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        return {ITEMS_KEY: [[_encode(key), _encode(item)] for key, item in value.items()]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode(value):
+    """Reverse ``_encode``"""
+    if isinstance(value, dict):
+        if list(value) == [ITEMS_KEY]:
+            return {_decode(key): _decode(item) for key, item in value[ITEMS_KEY]}
+        return {key: _decode(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    return value
+
+
+def read_snapshot(root_dir, digest, worker=False):
+    """Return the settings tree stored for ``digest``, None if it cannot be reused
+
+    Snapshots of settings with ``robottelo.settings.get_fresh`` enabled are only reused by xdist
+    workers, so the repositories are fetched fresh once per pytest run by the controller.
+
+    :param root_dir: robottelo root directory
+    :param digest: digest returned by ``settings_digest``
+    :param worker: whether the current process is an xdist worker
+    """
+    path = snapshot_path(root_dir, digest)
+    try:
+        snapshot = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('get_fresh') and not worker:
+        return None
+    logger.debug(f'Using settings snapshot {path}')
+    return _decode(snapshot['settings'])
+
+
+def write_snapshot(root_dir, digest, data, get_fresh=True):
+    """Store the merged settings tree for ``digest`` and remove outdated snapshots
+
+    Settings that do not survive a JSON round trip unchanged are not stored.
+
+    :param root_dir: robottelo root directory
+    :param digest: digest returned by ``settings_digest``
+    :param dict data: merged settings, as returned by ``settings.as_dict()``
+    :param get_fresh: value of ``robottelo.settings.get_fresh`` for the loaded settings
+    """
+    path = snapshot_path(root_dir, digest)
+    try:
+        content = json.dumps({'get_fresh': bool(get_fresh), 'settings': _encode(data)})
+        if _decode(json.loads(content)['settings']) != data:
+            raise ValueError('settings change in a JSON round trip')
+    except (TypeError, ValueError) as err:
+        logger.warning(f'Settings snapshot not written: {err}')
+        return
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        staging = path.with_suffix(f'.{os.getpid()}.tmp')
+        # the settings hold secrets, only the user may read them
+        with open(os.open(staging, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            f.write(content)
+        # atomic, so concurrent xdist workers never read a partial snapshot
+        staging.replace(path)
+        for outdated in path.parent.glob('*.json'):
+            if outdated != path:
+                outdated.unlink(missing_ok=True)
+    except OSError as err:
+        logger.debug(f'Settings snapshot not written: {err}')
+        return
+    logger.debug(f'Generated settings snapshot {path}')
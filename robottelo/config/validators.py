@@ -257,9 +257,12 @@ VALIDATORS = dict(
         Validator('jira.comment_type', default="group"),
         Validator('jira.comment_visibility', default="Red Hat Employee"),
         Validator('jira.enable_comment', default=False),
+        Validator('jira.comment_timeout', default=120, is_type_of=int),
         Validator('jira.issue_status', default=["Testing", "Release Pending"]),
         Validator('jira.cache_file', default='jira_status_cache.json'),
+        Validator('jira.cache_db', default='jira_status_cache.db'),
         Validator('jira.cache_ttl_days', default=7, is_type_of=int),
+        Validator('jira.delta_sync', default=False, is_type_of=bool),
     ],
     ldap=[
         Validator(
@@ -433,9 +436,17 @@ VALIDATORS = dict(
             cast=lambda x: list(map(str, x)),
         ),
         Validator('robottelo.shared_resource_wait', default=60, cast=float),
+        Validator('robottelo.apidoc_cache.enabled', default=True, is_type_of=bool),
+        Validator('robottelo.apidoc_cache.dir', default=None),
+        Validator('robottelo.import_time_budget', default=5.0, cast=float),
+        Validator('robottelo.coordination.enabled', default=False, is_type_of=bool),
+        Validator('robottelo.coordination.host', default=None),
+        Validator('robottelo.coordination.port', default=0, cast=int),
     ],
     shared_function=[
-        Validator('shared_function.storage', is_in=('file', 'redis'), default='file'),
+        Validator(
+            'shared_function.storage', is_in=('file', 'redis', 'sqlite', 'server'), default='file'
+        ),
         Validator('shared_function.share_timeout', lte=86400, default=86400),
         Validator('shared_function.scope', default=None),
         Validator('shared_function.enabled', default=False),
@@ -445,6 +456,7 @@ VALIDATORS = dict(
         Validator('shared_function.redis_db', default=0),
         Validator('shared_function.call_retries', default=2),
         Validator('shared_function.redis_password', default=None),
+        Validator('shared_function.sqlite_path', default=None),
     ],
     upgrade=[
         Validator('upgrade.capsule_ak', must_exist=True),
@@ -14,7 +14,6 @@ from tempfile import NamedTemporaryFile
 import time
 from urllib.parse import urljoin, urlparse, urlunsplit
 
-import apypie
 from box import Box
 from broker import Broker
 from broker.hosts import Host
@@ -26,7 +25,6 @@ import pytest
 import requests
 from ssh2.exceptions import AuthenticationError
 from wait_for import TimedOutError, wait_for
-from wrapanapi.entities.vm import VmState
 import yaml
 
 from robottelo import constants
@@ -70,16 +68,10 @@ from robottelo.host_helpers import (
 )
 from robottelo.logging import logger
 from robottelo.utils import validate_ssh_pub_key
+from robottelo.utils.apidoc import ApidocCache
 from robottelo.utils.datafactory import valid_emails_list
 from robottelo.utils.installer import InstallerCommand
 
-POWER_OPERATIONS = {
-    VmState.RUNNING: 'running',
-    VmState.STOPPED: 'stopped',
-    'reboot': 'reboot',
-    # TODO paused, suspended, shelved?
-}
-
 
 @lru_cache
 def lru_sat_ready_rhel(rhel_ver):
@@ -93,12 +85,13 @@ def lru_sat_ready_rhel(rhel_ver):
     return Broker(**deploy_args, host_class=Satellite).checkout()
 
 
-def get_sat_version():
-    """Try to read sat_version from envvar SATELLITE_VERSION
-    if not available fallback to ssh connection to get it."""
+# facts of the configured Satellite, gathered once per process, see get_sat_facts
+SAT_FACTS = None
+
 
+def _read_sat_version(satellite=None):
     try:
-        sat_version = Satellite().version
+        sat_version = (satellite or Satellite()).version
     except (AuthenticationError, ContentHostError, BoxKeyError) as err:
         logger.warning('Failed to get Satellite version: %s', err)
         if sat_version := str(settings.server.version.get('release')) == 'stream':
@@ -108,12 +101,9 @@ def get_sat_version():
     return Version('9999' if 'nightly' in sat_version else sat_version)
 
 
-def get_sat_rhel_version():
-    """Try to read rhel_version from Satellite host
-    if not available fallback to robottelo configuration."""
-
+def _read_sat_rhel_version(satellite=None):
     try:
-        return Satellite().os_version
+        return (satellite or Satellite()).os_version
     except (AuthenticationError, ContentHostError, BoxKeyError) as err:
         logger.warning('Failed to get RHEL version from Satellite: %s', err)
         if hasattr(settings.server.version, 'rhel_version'):
@@ -123,6 +113,73 @@ def get_sat_rhel_version():
     return Version(rhel_version)
 
 
+def _read_sat_plugins(satellite):
+    try:
+        result = satellite.execute(
+            'rpm -qa --qf "%{NAME}\\n" "rubygem-foreman_*" "rubygem-smart_proxy_*"'
+        )
+    except AuthenticationError as err:
+        logger.warning('Failed to list Satellite plugins: %s', err)
+        return []
+    return sorted(result.stdout.split()) if result.status == 0 else []
+
+
+def get_sat_version(satellite=None):
+    """Try to read sat_version from envvar SATELLITE_VERSION
+    if not available fallback to ssh connection to get it.
+
+    :param satellite: optional Satellite to query, the facts of the configured server by default
+    """
+    if satellite is None:
+        return Version(get_sat_facts()['version'])
+    return _read_sat_version(satellite)
+
+
+def get_sat_rhel_version(satellite=None):
+    """Try to read rhel_version from Satellite host
+    if not available fallback to robottelo configuration.
+
+    :param satellite: optional Satellite to query, the facts of the configured server by default
+    """
+    if satellite is None:
+        return Version(get_sat_facts()['rhel_version'])
+    return _read_sat_rhel_version(satellite)
+
+
+def get_sat_facts():
+    """Gather the facts of the configured Satellite used while collecting tests
+
+    The facts are gathered once per process, over a single ssh connection, unless they were
+    handed over by ``set_sat_facts``. Facts which can't be read from the host fall back to the
+    configuration like ``get_sat_version`` does.
+
+    :return: dict of plain types, so it can be sent to xdist workers
+    """
+    global SAT_FACTS
+    if SAT_FACTS is not None:
+        return SAT_FACTS
+    try:
+        satellite = Satellite()
+    except (ContentHostError, BoxKeyError) as err:
+        logger.warning('No Satellite to gather facts from: %s', err)
+        satellite = None
+    SAT_FACTS = {
+        'version': str(_read_sat_version(satellite)),
+        'rhel_version': str(_read_sat_rhel_version(satellite)),
+        # NetworkType members can't be serialized by execnet
+        'network_type': str(settings.server.network_type),
+        'plugins': _read_sat_plugins(satellite) if satellite else [],
+    }
+    logger.info(f'Gathered target Satellite facts: {SAT_FACTS}')
+    return SAT_FACTS
+
+
+def set_sat_facts(facts):
+    """Use the Satellite facts gathered by another process, e.g. the xdist controller"""
+    global SAT_FACTS
+    SAT_FACTS = facts
+
+
 class ContentHost(Host, ContentHostMixins):
     run = Host.execute
     default_timeout = settings.server.ssh_client.command_timeout
@@ -371,11 +428,11 @@ class ContentHost(Host, ContentHostMixins):
 
         logger.debug('END: tearing down host %s', self)
 
-    def power_control(self, state=VmState.RUNNING, ensure=True):
+    def power_control(self, state=None, ensure=True):
         """Lookup the host workflow for power on and execute
 
         Args:
-            state: A VmState from wrapanapi.entities.vm or 'reboot'
+            state: A VmState from wrapanapi.entities.vm or 'reboot', defaults to VmState.RUNNING
             ensure: boolean indicating whether to try and connect to ensure power state
 
         Raises:
@@ -383,10 +440,20 @@ class ContentHost(Host, ContentHostMixins):
             BrokerError: various error types to do with broker execution
             ContentHostError: if the workflow status isn't successful and broker didn't raise
         """
+        # wrapanapi pulls in the cloud provider SDKs, import it only when it is needed
+        from wrapanapi.entities.vm import VmState
+
         if getattr(self, '_cont_inst', None):
             raise NotImplementedError('Power control not supported for container instances')
+        state = state or VmState.RUNNING
+        power_operations = {
+            VmState.RUNNING: 'running',
+            VmState.STOPPED: 'stopped',
+            'reboot': 'reboot',
+            # TODO paused, suspended, shelved?
+        }
         try:
-            vm_operation = POWER_OPERATIONS.get(state)
+            vm_operation = power_operations.get(state)
             workflow_name = settings.broker.host_workflows.power_control
         except (AttributeError, KeyError) as err:
             raise NotImplementedError(
@@ -2054,17 +2121,37 @@ class Satellite(Capsule, SatelliteMixins):
         self._api._configured = True
         return self._api
 
+    def _apypie_api(self, apidoc_cache_dir=None):
+        """Return an apypie API client for this Satellite"""
+        import apypie
+
+        kwargs = {'apidoc_cache_dir': apidoc_cache_dir} if apidoc_cache_dir else {}
+        return apypie.Api(
+            uri=self.url,
+            username=settings.server.admin_username,
+            password=settings.server.admin_password,
+            api_version=2,
+            verify_ssl=settings.server.verify_ca,
+            **kwargs,
+        )
+
     @property
     def apidoc(self):
-        """Provide Satellite's apidoc via apypie"""
+        """Provide Satellite's apidoc via apypie
+
+        The apidoc is stored in an on-disk cache keyed by hostname, Satellite version and apipie
+        checksum, so it is downloaded once per Satellite build and shared by all processes.
+        """
         if not self._apidoc:
-            self._apidoc = apypie.Api(
-                uri=self.url,
-                username=settings.server.admin_username,
-                password=settings.server.admin_password,
-                api_version=2,
-                verify_ssl=settings.server.verify_ca,
-            ).apidoc
+            if settings.robottelo.apidoc_cache.enabled:
+                cache_dir = settings.robottelo.apidoc_cache.dir or robottelo_tmp_dir.joinpath(
+                    'apidoc_cache'
+                )
+                self._apidoc = ApidocCache(cache_dir, self.hostname, self.version).load(
+                    self._apypie_api
+                )
+            else:
+                self._apidoc = self._apypie_api().apidoc
         return self._apidoc
 
     @property
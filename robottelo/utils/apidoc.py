@@ -0,0 +1,161 @@
+"""Persistent on-disk cache of the Satellite apipie documentation.
+
+The full apidoc of a Satellite is a multi-megabyte JSON document. Fetching and parsing it once
+per Satellite object and per process is expensive when many xdist workers run against the same
+server, so the document is stored in a local cache directory and shared by all processes.
+
+Cache layout::
+
+    <cache_dir>/<hostname>/<version>/current        -> name of the active checksum entry
+    <cache_dir>/<hostname>/<version>/<checksum>/docs.json
+    <cache_dir>/<hostname>/<version>/<checksum>/resources/<resource>.json
+
+The ``checksum`` is the ``Apipie-Checksum`` reported by the server when the apidoc was downloaded.
+``docs.json`` holds the apidoc without the resources, each resource is stored in its own file and
+parsed only when it is accessed for the first time.
+
+Usage::
+
+    cache = ApidocCache(cache_dir, satellite.hostname, satellite.version)
+    apidoc = cache.load(lambda apypie_cache_dir: apypie.Api(..., apidoc_cache_dir=apypie_cache_dir))
+    apidoc['docs']['resources']['capsule_content']['methods']
+"""
+
+from collections.abc import Mapping
+import json
+import os
+from pathlib import Path
+import shutil
+from tempfile import mkdtemp
+
+from broker.helpers import FileLock
+
+from robottelo.logging import logger
+
+APIDOC_CACHE_LOCK_TIMEOUT = 600
+CURRENT_ENTRY_FILE = 'current'
+DOCS_FILE = 'docs.json'
+RESOURCES_DIR = 'resources'
+
+
+def _safe_name(value):
+    """Return a value usable as a single path component"""
+    return str(value).replace(os.sep, '_').replace(':', '_') or 'unknown'
+
+
+class LazyResources(Mapping):
+    """Read-only mapping of apidoc resources parsed on first access
+
+    :param resources_dir: directory with one ``<resource>.json`` file per resource
+    :param names: names of the resources available in ``resources_dir``
+    """
+
+    def __init__(self, resources_dir, names):
+        self._resources_dir = Path(resources_dir)
+        self._names = tuple(names)
+        self._loaded = {}
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            if name not in self._names:
+                raise KeyError(name)
+            resource_file = self._resources_dir.joinpath(f'{_safe_name(name)}.json')
+            self._loaded[name] = json.loads(resource_file.read_text())
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} resources={len(self)} loaded={len(self._loaded)}>'
+
+
+class ApidocCache:
+    """Apidoc cache entry of a single Satellite build, shared between processes
+
+    :param cache_dir: root directory of the apidoc cache
+    :param hostname: hostname of the Satellite the apidoc belongs to
+    :param version: version of the Satellite the apidoc belongs to
+    """
+
+    def __init__(self, cache_dir, hostname, version):
+        self.version_dir = Path(cache_dir).joinpath(_safe_name(hostname), _safe_name(version))
+        self.lock = FileLock(self.version_dir, timeout=APIDOC_CACHE_LOCK_TIMEOUT)
+
+    @property
+    def checksum(self):
+        """Return the checksum of the active cache entry, None if there is no entry"""
+        current = self.version_dir.joinpath(CURRENT_ENTRY_FILE)
+        if not current.exists():
+            return None
+        checksum = current.read_text().strip()
+        if not self.version_dir.joinpath(checksum, DOCS_FILE).exists():
+            return None
+        return checksum
+
+    def _read(self, checksum):
+        entry_dir = self.version_dir.joinpath(checksum)
+        apidoc = json.loads(entry_dir.joinpath(DOCS_FILE).read_text())
+        apidoc['docs']['resources'] = LazyResources(
+            entry_dir.joinpath(RESOURCES_DIR), apidoc['docs'].pop('resource_names')
+        )
+        return apidoc
+
+    def _write(self, apidoc, checksum):
+        """Split the apidoc into the docs and per-resource files and activate the entry"""
+        staging_dir = Path(mkdtemp(prefix=f'.{checksum}-', dir=self.version_dir))
+        resources_dir = staging_dir.joinpath(RESOURCES_DIR)
+        resources_dir.mkdir()
+        docs = dict(apidoc['docs'])
+        resources = docs.pop('resources', {})
+        for name, resource in resources.items():
+            resources_dir.joinpath(f'{_safe_name(name)}.json').write_text(json.dumps(resource))
+        docs['resource_names'] = sorted(resources)
+        staging_dir.joinpath(DOCS_FILE).write_text(json.dumps({**apidoc, 'docs': docs}))
+        entry_dir = self.version_dir.joinpath(checksum)
+        if entry_dir.exists():
+            shutil.rmtree(entry_dir)
+        staging_dir.rename(entry_dir)
+        current = self.version_dir.joinpath(f'.{CURRENT_ENTRY_FILE}-{os.getpid()}')
+        current.write_text(checksum)
+        current.replace(self.version_dir.joinpath(CURRENT_ENTRY_FILE))
+
+    def load(self, get_api):
+        """Return the cached apidoc, downloading it only if no cache entry exists yet
+
+        :param get_api: callable taking a scratch directory for apypie's own cache and
+            returning an ``apypie.Api`` instance for the Satellite
+        :return: the apidoc, with ``['docs']['resources']`` parsed lazily per resource
+        """
+        if checksum := self.checksum:
+            logger.debug(f'Using cached apidoc {self.version_dir}/{checksum}')
+            return self._read(checksum)
+        self.version_dir.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            # another process may have populated the cache while we waited for the lock
+            if checksum := self.checksum:
+                return self._read(checksum)
+            apypie_cache_dir = mkdtemp(prefix='.apypie-', dir=self.version_dir)
+            try:
+                api = get_api(apypie_cache_dir)
+                apidoc = api.apidoc
+                # apypie names its cache file after the server's Apipie-Checksum
+                checksum = _safe_name(api.apidoc_cache_name)
+                self._write(apidoc, checksum)
+            finally:
+                shutil.rmtree(apypie_cache_dir, ignore_errors=True)
+        logger.info(f'Stored apidoc in cache {self.version_dir}/{checksum}')
+        return self._read(checksum)
+
+    def invalidate(self):
+        """Drop all cache entries of this Satellite build"""
+        if not self.version_dir.exists():
+            return
+        with self.lock:
+            shutil.rmtree(self.version_dir, ignore_errors=True)
@@ -0,0 +1,300 @@
+"""Coordination server sharing locks, values and resource statuses between test nodes
+
+Function locks, shared function results and shared resources coordinate the processes of a test
+run through files in /tmp, which only works when all xdist workers run on the same machine. When
+the workers are spread over several nodes, e.g. with ``--tx ssh=...``, the ``coordination``
+plugin starts a ``CoordinationServer`` on the xdist controller and hands its address over to the
+workers. ``func_locker``, the ``server`` storage handler of ``func_shared`` and ``SharedResource``
+then use the ``CoordinationClient`` returned by ``get_client`` instead of files.
+
+The protocol is one JSON object per line over TCP. A client sends a ``hello`` with the token of
+the server, then requests like ``{"op": "lock", "name": "...", "timeout": 60}``, each answered by
+``{"ok": true, "result": ...}`` or ``{"ok": false, "error": "..."}``. Requests waiting for a lock
+or a resource change block on the server until it's released or changed, no client polls.
+Locks belong to the connection taking them and are released when it's closed, so the locks of a
+crashed worker don't stay held.
+"""
+
+from contextlib import contextmanager
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+
+from robottelo.logging import logger
+
+CONNECT_TIMEOUT = 30
+
+# the client of the coordination server used by this process, see configure
+CLIENT = None
+
+
+class CoordinationError(Exception):
+    """A request to the coordination server failed"""
+
+
+class LockRecursionError(CoordinationError):
+    """A connection requested a lock it already holds"""
+
+
+def _new_resource():
+    return {'version': 0, 'removed': False, 'main': None, 'watchers': {}}
+
+
+class CoordinationState:
+    """Locks, shared values and shared resources of a coordination server
+
+    All requests are handled under one condition, notified on every change, so the requests
+    waiting for a lock or a resource change are woken up as soon as it happens.
+    """
+
+    def __init__(self):
+        self.changed = threading.Condition()
+        # lock name: session holding it
+        self.locks = {}
+        self.values = {}
+        self.resources = {}
+
+    def handle(self, session, op, params):
+        """Handle the ``op`` request of the client ``session``, return its result"""
+        if (method := getattr(self, f'op_{op}', None)) is None:
+            raise CoordinationError(f'Unknown coordination request: {op}')
+        with self.changed:
+            try:
+                return method(session, **params)
+            except TypeError as err:
+                raise CoordinationError(f'Invalid coordination request {op}: {err}') from err
+
+    def release_session(self, session):
+        """Release the locks held by a closed client session"""
+        with self.changed:
+            for name in [name for name, owner in self.locks.items() if owner == session]:
+                logger.warning(f'Coordination lock {name} released by a closed connection')
+                del self.locks[name]
+            self.changed.notify_all()
+
+    def op_lock(self, session, name, timeout):
+        if self.locks.get(name) == session:
+            raise LockRecursionError(f'Lock {name} is already held by this connection')
+        if acquired := self.changed.wait_for(lambda: name not in self.locks, timeout):
+            self.locks[name] = session
+        return acquired
+
+    def op_unlock(self, session, name):
+        if self.locks.get(name) == session:
+            del self.locks[name]
+            self.changed.notify_all()
+
+    def op_get(self, session, key):
+        return self.values.get(key)
+
+    def op_set(self, session, key, value):
+        self.values[key] = value
+
+    def _changed(self, resource):
+        resource['version'] += 1
+        self.changed.notify_all()
+
+    def op_resource_register(self, session, name, watcher):
+        resource = self.resources.get(name)
+        if resource is None or resource['removed']:
+            resource = self.resources[name] = _new_resource()
+        # the first watcher to register becomes the main watcher
+        if resource['main'] is None:
+            resource['main'] = [watcher, 'waiting']
+        resource['watchers'][watcher] = 'pending'
+        self._changed(resource)
+        return resource['main'][0]
+
+    def op_resource_unregister(self, session, name, watcher):
+        resource = self.resources[name]
+        resource['watchers'].pop(watcher, None)
+        self._changed(resource)
+
+    def op_resource_status(self, session, name, watcher, status):
+        resource = self.resources[name]
+        if watcher in resource['watchers']:
+            resource['watchers'][watcher] = status
+            self._changed(resource)
+
+    def op_resource_main_status(self, session, name, status):
+        resource = self.resources[name]
+        resource['main'][1] = status
+        self._changed(resource)
+
+    def op_resource_take_over(self, session, name, watcher):
+        resource = self.resources[name]
+        if resource['main'][1] not in ('action_error', 'error'):
+            return False
+        resource['main'] = [watcher, 'recovering']
+        self._changed(resource)
+        return True
+
+    def op_resource_state(self, session, name):
+        return self.resources.get(name)
+
+    def op_resource_wait(self, session, name, version, timeout):
+        """Wait until the resource version is not ``version`` anymore, return the new version"""
+        self.changed.wait_for(lambda: self.resources[name]['version'] != version, timeout)
+        return self.resources[name]['version']
+
+    def op_resource_remove(self, session, name):
+        # the final statuses are kept for the watchers still reading them
+        if (resource := self.resources.get(name)) is not None:
+            resource['removed'] = True
+            self._changed(resource)
+
+
+class _CoordinationHandler(socketserver.StreamRequestHandler):
+    """Handle the requests of one client connection"""
+
+    def reply(self, response):
+        self.wfile.write(json.dumps(response).encode() + b'\n')
+
+    def handle(self):
+        state = self.server.state
+        session = f'{self.client_address[0]}:{self.client_address[1]}'
+        try:
+            hello = json.loads(self.rfile.readline() or 'null')
+            if not (
+                isinstance(hello, dict)
+                and hello.get('op') == 'hello'
+                and secrets.compare_digest(str(hello.get('token')), self.server.token)
+            ):
+                self.reply({'ok': False, 'error': 'Invalid coordination token'})
+                return
+            self.reply({'ok': True, 'result': None})
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                    result = state.handle(session, request.pop('op'), request)
+                except LockRecursionError as err:
+                    self.reply({'ok': False, 'error': str(err), 'recursion': True})
+                except (CoordinationError, ValueError, KeyError) as err:
+                    self.reply({'ok': False, 'error': f'{type(err).__name__}: {err}'})
+                else:
+                    self.reply({'ok': True, 'result': result})
+        except OSError as err:
+            logger.warning(f'Coordination connection {session} failed: {err}')
+        finally:
+            state.release_session(session)
+
+
+class CoordinationServer(socketserver.ThreadingTCPServer):
+    """Coordination server, handling each client connection in its own thread
+
+    :param host: the host to listen on, all interfaces by default
+    :param port: the port to listen on, any free port by default
+    :param token: the token the clients have to send, generated by default
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='', port=0, token=None):
+        super().__init__((host, port), _CoordinationHandler)
+        self.token = token or secrets.token_hex(16)
+        self.state = CoordinationState()
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        """Serve the clients in a background thread"""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name='coordination-server', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the server socket"""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+
+class CoordinationClient:
+    """Client of a coordination server, with one connection per thread and process
+
+    :param address: the ``(host, port)`` of the server
+    :param token: the token of the server
+    """
+
+    def __init__(self, address, token):
+        self.address = (address[0], int(address[1]))
+        self.token = token
+        self._local = threading.local()
+
+    def _stream(self):
+        local = self._local
+        # connections of the parent process can't be used by forked processes
+        if getattr(local, 'pid', None) != os.getpid():
+            sock = socket.create_connection(self.address, timeout=CONNECT_TIMEOUT)
+            # requests waiting for locks are answered when they're acquired
+            sock.settimeout(None)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            local.pid, local.stream, local.locks = os.getpid(), sock.makefile('rwb'), set()
+            self._request(local.stream, {'op': 'hello', 'token': self.token})
+        return local.stream
+
+    def _request(self, stream, request):
+        try:
+            stream.write(json.dumps(request).encode() + b'\n')
+            stream.flush()
+            line = stream.readline()
+        except OSError as err:
+            raise CoordinationError(f'Coordination server {self.address} failed: {err}') from err
+        if not line:
+            raise CoordinationError(f'Coordination server {self.address} closed the connection')
+        response = json.loads(line)
+        if response['ok']:
+            return response['result']
+        if response.get('recursion'):
+            raise LockRecursionError(response['error'])
+        raise CoordinationError(response['error'])
+
+    def call(self, op, **params):
+        """Send the ``op`` request to the server and return its result"""
+        return self._request(self._stream(), {'op': op, **params})
+
+    def acquire(self, name, timeout):
+        """Acquire the lock ``name``, return whether it was acquired before the timeout"""
+        self._stream()
+        if name in self._local.locks:
+            raise LockRecursionError(f'Lock {name} is already held by this thread')
+        if acquired := self.call('lock', name=name, timeout=timeout):
+            self._local.locks.add(name)
+        return acquired
+
+    def release(self, name):
+        """Release the lock ``name``"""
+        self._local.locks.discard(name)
+        self.call('unlock', name=name)
+
+    @contextmanager
+    def lock(self, name, timeout):
+        """Hold the lock ``name``, raise TimeoutError when not acquired before the timeout"""
+        if not self.acquire(name, timeout):
+            raise TimeoutError(f'Timed out after {timeout}s waiting for lock {name}')
+        try:
+            yield
+        finally:
+            self.release(name)
+
+
+def configure(address, token=None):
+    """Use the coordination server at ``address`` in this process, or no server with None"""
+    global CLIENT
+    CLIENT = None if address is None else CoordinationClient(address, token)
+
+
+def get_client():
+    """Return the coordination client of this process, None when no server is configured"""
+    return CLIENT
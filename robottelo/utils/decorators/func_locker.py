@@ -1,4 +1,11 @@
-"""Implements test function locking, using pytest_services file locking
+"""Implements test function locking, using ``flock`` file locking
+
+Waiting processes block on the lock file until the lock is released, the kernel wakes them up.
+When a coordination server is configured (see ``robottelo.utils.coordination``), functions are
+locked on the server instead, by their lock file path relative to the lock directory, so the
+processes of all test nodes exclude each other.
+The time spent waiting for and holding each lock is recorded per process in ``LOCK_METRICS``,
+the ``func_locker_metrics`` plugin reports the most contended locks of a test run.
 
 Usage::
 
@@ -41,15 +48,17 @@ Usage::
 """
 
 from contextlib import contextmanager
+import fcntl
 import functools
 import inspect
 import os
 import tempfile
-
-from pytest_services.locks import file_lock
+import threading
+import time
 
 from robottelo.config import settings
 from robottelo.logging import logger
+from robottelo.utils import coordination
 
 TEMP_ROOT_DIR = 'robottelo'
 TEMP_FUNC_LOCK_DIR = 'lock_functions'
@@ -60,6 +69,10 @@ LOCK_DEFAULT_SCOPE = None
 
 _DEFAULT_CLASS_NAME_DEPTH = 3
 
+# lock file path: acquisitions count, total and max seconds waited, total seconds held
+LOCK_METRICS = {}
+_metrics_lock = threading.Lock()
+
 
 class FunctionLockerError(Exception):
     """the default function locker error"""
@@ -188,6 +201,133 @@ def _write_content(handler, content):
     handler.flush()
 
 
+def _record_lock_metrics(lock_file_path, waited, held):
+    with _metrics_lock:
+        metrics = LOCK_METRICS.setdefault(
+            lock_file_path, {'acquired': 0, 'wait': 0.0, 'max_wait': 0.0, 'hold': 0.0}
+        )
+        metrics['acquired'] += 1
+        metrics['wait'] += waited
+        metrics['max_wait'] = max(metrics['max_wait'], waited)
+        metrics['hold'] += held
+
+
+def _open_lock_file(lock_file_path):
+    return open(os.open(lock_file_path, os.O_RDWR | os.O_CREAT, 0o644), 'r+')
+
+
+def wait_blocking_lock(lock, unlock, timeout):
+    """Take a lock with a blocking call which can't time out, like ``flock`` or ``lockf``
+
+    The lock is waited for in a helper thread. When the timeout expires first, the helper
+    releases the lock with ``unlock`` as soon as it gets it.
+
+    :param lock: function blocking until the lock is acquired
+    :param unlock: function releasing the lock
+    :param timeout: the time in seconds to wait for acquiring the lock
+    :return: whether the lock was acquired before the timeout
+    """
+    acquired = threading.Event()
+    abandoned = threading.Event()
+    handover = threading.Lock()
+
+    def wait():
+        lock()
+        with handover:
+            if not abandoned.is_set():
+                acquired.set()
+                return
+        unlock()
+
+    threading.Thread(target=wait, daemon=True).start()
+    acquired.wait(max(timeout, 0))
+    with handover:
+        if not acquired.is_set():
+            abandoned.set()
+    return acquired.is_set()
+
+
+def _wait_lock(lock_file_path, timeout):
+    """Return the lock file locked by this process, blocking until it's released by others"""
+    handler = _open_lock_file(lock_file_path)
+    try:
+        fcntl.flock(handler, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return handler
+    except BlockingIOError:
+        pass
+    # closing the file releases the lock
+    if wait_blocking_lock(lambda: fcntl.flock(handler, fcntl.LOCK_EX), handler.close, timeout):
+        return handler
+    raise FunctionLockerError(f'Timed out after {timeout}s waiting for lock {lock_file_path}')
+
+
+@contextmanager
+def file_lock(lock_file_path, timeout=LOCK_DEFAULT_TIMEOUT):
+    """Lock a file, shared across processes, and yield its file handler
+
+    :param lock_file_path: the path of the file to lock
+    :param timeout: the time in seconds to wait for acquiring the lock
+    """
+    started = time.monotonic()
+    handler = _wait_lock(lock_file_path, timeout)
+    acquired = time.monotonic()
+    try:
+        yield handler
+    finally:
+        # closing the file releases the lock
+        handler.close()
+        _record_lock_metrics(lock_file_path, acquired - started, time.monotonic() - acquired)
+
+
+@contextmanager
+def server_lock(client, lock_file_path, timeout=LOCK_DEFAULT_TIMEOUT):
+    """Lock a function on the coordination server, shared across nodes
+
+    :param client: the coordination client
+    :param lock_file_path: the path of the function lock file, naming the lock
+    :param timeout: the time in seconds to wait for acquiring the lock
+    """
+    name = f'func_locker:{os.path.relpath(lock_file_path, _get_temp_lock_function_dir())}'
+    started = time.monotonic()
+    try:
+        locked = client.acquire(name, timeout)
+    except coordination.LockRecursionError as err:
+        raise FunctionLockerError(
+            'recursion detected: the function is already locked by the same process'
+        ) from err
+    if not locked:
+        raise FunctionLockerError(f'Timed out after {timeout}s waiting for lock {name}')
+    acquired = time.monotonic()
+    try:
+        yield
+    finally:
+        client.release(name)
+        _record_lock_metrics(lock_file_path, acquired - started, time.monotonic() - acquired)
+
+
+@contextmanager
+def _function_lock(lock_file_path, process_id, timeout):
+    """Lock the function of the lock file, on the coordination server when one is configured
+
+    Yield the locked file handler, None when the function is locked on the server.
+    """
+    if (client := coordination.get_client()) is not None:
+        with server_lock(client, lock_file_path, timeout=timeout):
+            yield None
+        return
+    # to prevent dead lock when recursively calling this function
+    # check if the same process is trying to acquire the lock
+    _check_deadlock(lock_file_path, process_id)
+    with file_lock(lock_file_path, timeout=timeout) as handler:
+        # write the process id that locked this function
+        _write_content(handler, process_id)
+        try:
+            yield handler
+        finally:
+            # clear the file
+            _write_content(handler, None)
+
+
 def lock_function(
     function=None,
     scope=_get_default_scope,
@@ -234,24 +374,12 @@ def lock_function(
                 function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
             )
             process_id = str(os.getpid())
-            # to prevent dead lock when recursively calling this function
-            # check if the same process is trying to acquire the lock
-            _check_deadlock(lock_file_path, process_id)
-
-            with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+            with _function_lock(lock_file_path, process_id, timeout):
                 logger.info(
                     f'process id: {process_id} lock function using file path: {lock_file_path}'
                 )
-                # write the process id that locked this function
-                _write_content(handler, process_id)
                 # call the locked function
-                try:
-                    res = func(*args, **kwargs)
-                finally:
-                    # clear the file
-                    _write_content(handler, None)
-
-            return res
+                return func(*args, **kwargs)
 
         return function_wrapper
 
@@ -295,19 +423,9 @@ def locking_function(
         function_name, scope=scope, scope_kwargs=scope_kwargs, scope_context=scope_context
     )
     process_id = str(os.getpid())
-    # to prevent dead lock when recursively calling this function
-    # check if the same process is trying to acquire the lock
-    _check_deadlock(lock_file_path, process_id)
-
-    with file_lock(lock_file_path, remove=False, timeout=timeout) as handler:
+    with _function_lock(lock_file_path, process_id, timeout) as handler:
         logger.info(
             f'process id: {process_id} - lock function name:{function_name}  - using file path: {lock_file_path}'
         )
-        # write the process id that locked this function
-        _write_content(handler, process_id)
         # let the locked code run
-        try:
-            yield handler
-        finally:
-            # clear the file
-            _write_content(handler, None)
+        yield handler
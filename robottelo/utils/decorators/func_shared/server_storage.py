@@ -0,0 +1,48 @@
+"""Coordination server storage handler
+
+The values and key locks of the shared functions are kept by the coordination server of the test
+run (see ``robottelo.utils.coordination``), so they are shared by the workers of all test nodes.
+Values are kept in memory by the server, for the duration of the test run.
+"""
+
+from robottelo.utils import coordination
+from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
+
+LOCK_TIMEOUT = 7200
+
+
+class ServerStorageHandler(BaseStorageHandler):
+    """Coordination server key value storage handler"""
+
+    def __init__(self, client=None, lock_timeout=None):
+        self._client = client or coordination.get_client()
+        if self._client is None:
+            raise coordination.CoordinationError(
+                'The server storage handler needs a coordination server, '
+                'enable robottelo.coordination'
+            )
+        self._lock_timeout = LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+
+    def lock(self, key):
+        """Return the storage locker context manager"""
+        return self._client.lock(f'func_shared:{key}', self._lock_timeout)
+
+    def when_lock_acquired(self, data):
+        # do nothing
+        pass
+
+    def get(self, key):
+        """Return the key value
+
+        :type key: str
+        """
+        value = self._client.call('get', key=key)
+        return None if value is None else self.decode(value)
+
+    def set(self, key, value):
+        """Write the value of key
+
+        :type key: str
+        :type value: object
+        """
+        self._client.call('set', key=key, value=self.encode(value))
@@ -99,11 +99,23 @@ from nailgun.entities import Entity
 
 from robottelo.config import setting_is_set, settings
 from robottelo.logging import logger
-from robottelo.utils.decorators.func_shared import file_storage, redis_storage
+from robottelo.utils.decorators.func_shared import (
+    file_storage,
+    redis_storage,
+    server_storage,
+    sqlite_storage,
+)
 from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
 from robottelo.utils.decorators.func_shared.redis_storage import RedisStorageHandler
+from robottelo.utils.decorators.func_shared.server_storage import ServerStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SqliteStorageHandler
 
-_storage_handlers = {'file': FileStorageHandler, 'redis': RedisStorageHandler}
+_storage_handlers = {
+    'file': FileStorageHandler,
+    'redis': RedisStorageHandler,
+    'server': ServerStorageHandler,
+    'sqlite': SqliteStorageHandler,
+}
 
 DEFAULT_STORAGE_HANDLER = 'file'
 # by default using the shared data is disabled
@@ -150,6 +162,10 @@ def _check_config():
         redis_storage.REDIS_PORT = settings.shared_function.redis_port
         redis_storage.REDIS_DB = settings.shared_function.redis_db
         redis_storage.REDIS_PASSWORD = settings.shared_function.redis_password
+        server_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        sqlite_storage.LOCK_TIMEOUT = settings.shared_function.lock_timeout
+        sqlite_storage.SHARE_TIMEOUT = settings.shared_function.share_timeout
+        sqlite_storage.DB_PATH = settings.shared_function.sqlite_path
         _set_configured(True)
 
 
@@ -0,0 +1,173 @@
+"""SQLite key value storage handler
+
+The values of all the shared functions are stored in one SQLite database in WAL mode, every
+get and set is a single statement transaction. Key locks are ``fcntl`` byte-range locks on one
+lock file, at an offset derived from the key, so waiting processes are woken up by the kernel
+when the lock is released instead of polling per key lock files. Values older than the share
+timeout are swept when a process first connects to the database.
+"""
+
+import fcntl
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from robottelo.utils.decorators.func_locker import wait_blocking_lock
+from robottelo.utils.decorators.func_shared.base import BaseStorageHandler
+from robottelo.utils.decorators.func_shared.file_storage import TEMP_ROOT_DIR, get_temp_dir
+
+DB_FILE_NAME = 'shared_functions.db'
+DB_PATH = None
+LOCK_TIMEOUT = 7200
+# values older than this are swept, in seconds
+SHARE_TIMEOUT = 86400
+# byte offsets of the key locks in the lock file, keys sharing an offset share their lock
+LOCK_OFFSETS = 2**31
+
+# per process state, connections and locks can't be shared with forked processes
+_process = {'pid': None}
+_process_lock = threading.Lock()
+
+
+def _get_db_path():
+    if DB_PATH:
+        return DB_PATH
+    return os.path.join(get_temp_dir(), TEMP_ROOT_DIR, DB_FILE_NAME)
+
+
+def _process_state(db_path):
+    """Return the connections, lock file and thread locks of the current process"""
+    with _process_lock:
+        if _process['pid'] != os.getpid():
+            _process.clear()
+            _process.update(pid=os.getpid(), connections=threading.local(), dbs={})
+        if db_path not in _process['dbs']:
+            os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+            _process['dbs'][db_path] = {
+                'lock_fd': os.open(f'{db_path}.lock', os.O_RDWR | os.O_CREAT, 0o644),
+                'thread_locks': {},
+                'swept': False,
+            }
+        return _process['dbs'][db_path]
+
+
+class _KeyLock:
+    """Lock of a key, shared by the threads and processes using the same database
+
+    ``fcntl`` locks are owned by processes, so the threads of a process first take a thread lock
+    of the key offset. The ``fcntl`` lock is waited for with ``func_locker.wait_blocking_lock``
+    to be able to give up after the timeout.
+    """
+
+    def __init__(self, state, key, timeout):
+        self._fd = state['lock_fd']
+        self._offset = int(hashlib.sha256(key.encode()).hexdigest(), 16) % LOCK_OFFSETS
+        with _process_lock:
+            self._thread_lock = state['thread_locks'].setdefault(self._offset, threading.Lock())
+        self._timeout = timeout
+        self._key = key
+
+    def _lockf(self, operation):
+        fcntl.lockf(self._fd, operation, 1, self._offset)
+
+    def _acquire(self):
+        deadline = time.monotonic() + self._timeout
+        if not self._thread_lock.acquire(timeout=self._timeout):
+            return False
+        try:
+            self._lockf(fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            pass
+        else:
+            return True
+        return wait_blocking_lock(
+            lambda: self._lockf(fcntl.LOCK_EX), self._release, deadline - time.monotonic()
+        )
+
+    def __enter__(self):
+        if not self._acquire():
+            raise TimeoutError(f'Unable to lock shared function key {self._key}')
+
+    def _release(self):
+        self._lockf(fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def __exit__(self, *exc_info):
+        self._release()
+
+
+class SqliteStorageHandler(BaseStorageHandler):
+    """SQLite key value storage handler"""
+
+    def __init__(self, db_path=None, lock_timeout=None, share_timeout=None):
+        self._db_path = os.path.abspath(db_path or _get_db_path())
+        self._lock_timeout = LOCK_TIMEOUT if lock_timeout is None else lock_timeout
+        self._share_timeout = SHARE_TIMEOUT if share_timeout is None else share_timeout
+        self._state = _process_state(self._db_path)
+
+    @property
+    def db_path(self):
+        return self._db_path
+
+    @property
+    def connection(self):
+        connections = _process['connections'].__dict__.setdefault('by_path', {})
+        if (connection := connections.get(self._db_path)) is None:
+            # autocommit, every statement is a transaction; wait for the writers
+            connection = sqlite3.connect(self._db_path, timeout=60, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS shared_values '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, updated REAL NOT NULL)'
+            )
+            connections[self._db_path] = connection
+            if not self._state['swept']:
+                self._state['swept'] = True
+                self.sweep()
+        return connection
+
+    def sweep(self, max_age=None):
+        """Delete the values not updated for ``max_age`` seconds, the share timeout by default
+
+        :return: the number of deleted values
+        """
+        max_age = self._share_timeout if max_age is None else max_age
+        cursor = self.connection.execute(
+            'DELETE FROM shared_values WHERE updated < ?', (time.time() - max_age,)
+        )
+        return cursor.rowcount
+
+    def lock(self, key, timeout=None):
+        """Return the storage locker context manager"""
+        if timeout is None:
+            timeout = self._lock_timeout
+        return _KeyLock(self._state, key, timeout)
+
+    def when_lock_acquired(self, data):
+        # do nothing
+        pass
+
+    def get(self, key):
+        """Return the key value
+
+        :type key: str
+        """
+        row = self.connection.execute(
+            'SELECT value FROM shared_values WHERE key = ?', (key,)
+        ).fetchone()
+        return self.decode(row[0]) if row else None
+
+    def set(self, key, value):
+        """Write the value of key
+
+        :type key: str
+        :type value: object
+        """
+        self.connection.execute(
+            'INSERT INTO shared_values (key, value, updated) VALUES (?, ?, ?) '
+            'ON CONFLICT (key) DO UPDATE SET value = excluded.value, updated = excluded.updated',
+            (key, self.encode(value), time.time()),
+        )
@@ -1,12 +1,20 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from copy import copy
 import json
+import math
+import os
 from pathlib import Path
 import re
+import sqlite3
+import threading
 import time
 
 import pytest
 import requests
-from wait_for import TimedOutError, wait_for
+from requests.adapters import HTTPAdapter
+from wait_for import TimedOutError
 
 from robottelo.config import settings
 from robottelo.constants import (
@@ -23,72 +31,198 @@ VERSION_RE = re.compile(r'(?:sat-)*?(?P<version>\d\.\d)\.\w*')
 
 common_jira_fields = ['key', 'summary', 'status', 'labels', 'resolution', 'fixVersions']
 
+# How each field is read from a Jira issue:
+# path: dotted keys to the value in the issue
+# default: returned when the value at path is empty, the value at path is required otherwise
+# get: key read from the value at path
+# each: key read from every element of the list at path
 mapped_response_fields = {
-    'key': "{obj_name}['key']",
-    'summary': "{obj_name}['fields']['summary']",
-    'status': "{obj_name}['fields']['status']['name']",
-    'labels': "{obj_name}['fields']['labels']",
-    'resolution': "{obj_name}['fields']['resolution']['name'] if {obj_name}['fields']['resolution'] else ''",
-    'fixVersions': "[ver['name'] for ver in {obj_name}['fields']['fixVersions']] if {obj_name}['fields']['fixVersions'] else []",
+    'key': {'path': 'key'},
+    'summary': {'path': 'fields.summary'},
+    'status': {'path': 'fields.status.name'},
+    'labels': {'path': 'fields.labels'},
+    'resolution': {'path': 'fields.resolution', 'get': 'name', 'default': ''},
+    'fixVersions': {'path': 'fields.fixVersions', 'each': 'name', 'default': []},
     # Custom Field - SFDC Cases Counter
-    'customfield_12313440': "{obj_name}['fields']['customfield_12313440']",
+    'customfield_12313440': {'path': 'fields.customfield_12313440'},
+}
+_REQUIRED = object()
+
+
+def field_extractor(path, get=None, each=None, default=_REQUIRED):
+    """Compile a ``mapped_response_fields`` entry into a function reading the field of an issue
+
+    :param path: dotted keys to the value in the issue
+    :param get: optional key read from the value at path
+    :param each: optional key read from every element of the list at path
+    :param default: returned, as a copy, when the value at path is empty
+    :returns: function taking the json data of a Jira issue
+    """
+    keys = path.split('.')
+
+    def extract(issue):
+        value = issue
+        for key in keys:
+            value = value[key]
+        if not value and default is not _REQUIRED:
+            return copy(default)
+        if get is not None:
+            return value[get]
+        if each is not None:
+            return [element[each] for element in value]
+        return value
+
+    return extract
+
+
+field_extractors = {
+    field: field_extractor(**mapping) for field, mapping in mapped_response_fields.items()
 }
 
 
 class JiraStatusCache:
     """Handles caching of Jira issue statuses to reduce API calls.
-    This class manages a local cache of Jira issue data, allowing for
-    efficient retrieval and storage of issue statuses. The cache is
-    periodically cleaned to remove expired entries based on a configurable
-    time-to-live (TTL) value.
+
+    Issues are stored in a SQLite database in WAL mode, so the processes of a test run, like
+    xdist workers, read and write it concurrently. Every update is an upsert of the issue, and
+    entries older than the configured time-to-live (TTL) are filtered out by the queries.
+    The JSON cache file used by previous versions is imported once, when it exists.
     """
 
-    def __init__(self):
-        self.cache_file = Path(settings.jira.cache_file)
-        self.cache_ttl_days = settings.jira.cache_ttl_days
-        self.cache = self._load_cache()
+    # SQLite versions before 3.32 limit a statement to 999 parameters
+    QUERY_CHUNK_SIZE = 500
 
-    def _load_cache(self):
+    def __init__(self, cache_db=None, cache_file=None, cache_ttl_days=None):
+        self.cache_db = Path(cache_db or settings.jira.cache_db)
+        self.cache_file = Path(cache_file or settings.jira.cache_file)
+        self.cache_ttl_days = (
+            settings.jira.cache_ttl_days if cache_ttl_days is None else cache_ttl_days
+        )
+        # a connection per process and thread, sqlite3 connections can't be shared
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.connection = self._connect()
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def _connect(self):
+        self.cache_db.parent.mkdir(parents=True, exist_ok=True)
+        # autocommit, transactions are explicit; wait for the writers of other processes
+        connection = sqlite3.connect(self.cache_db, timeout=60, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS issues '
+            '(key TEXT PRIMARY KEY, data TEXT NOT NULL, timestamp REAL NOT NULL)'
+        )
+        connection.execute(
+            'CREATE TABLE IF NOT EXISTS imports (path TEXT PRIMARY KEY, timestamp REAL NOT NULL)'
+        )
+        connection.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value REAL)')
         if self.cache_file.exists():
-            logger.debug(f"Loading Jira cache from {self.cache_file}")
-            data = json.loads(self.cache_file.read_text())
-            self._clean_expired_entries(data)
-            logger.debug(f"Loaded {len(self.cache)} entries from Jira cache")
-            return self.cache
-        logger.debug("Jira cache file does not exist, using empty cache")
-        return {}
+            self._import_json(connection, self.cache_file)
+        return connection
+
+    @staticmethod
+    @contextmanager
+    def _transaction(connection):
+        """Write transaction, taking the database write lock up front"""
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            yield connection
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+
+    def _import_json(self, connection, path):
+        """Import the issues of a JSON cache file, once, keeping newer entries of the database"""
+        source = str(path.resolve())
+        with self._transaction(connection):
+            if connection.execute('SELECT 1 FROM imports WHERE path = ?', (source,)).fetchone():
+                return
+            try:
+                issues = json.loads(path.read_text()).get('issues', {})
+            except (OSError, ValueError) as err:
+                logger.warning(f"Unable to import the Jira cache file {path}: {err}")
+                issues = {}
+            connection.executemany(
+                'INSERT INTO issues (key, data, timestamp) VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET data = excluded.data, '
+                'timestamp = excluded.timestamp WHERE excluded.timestamp > issues.timestamp',
+                [
+                    (key, json.dumps(entry['data']), entry.get('timestamp', 0))
+                    for key, entry in issues.items()
+                    if 'data' in entry
+                ],
+            )
+            connection.execute(
+                'INSERT INTO imports (path, timestamp) VALUES (?, ?)', (source, time.time())
+            )
+        logger.debug(f"Imported {len(issues)} entries from Jira cache file {path}")
 
     def get(self, issue_id):
-        return self.cache.get(issue_id)
+        return self.get_many([issue_id])[issue_id]
 
     def get_many(self, issue_ids):
-        results = {issue_id: self.cache.get(issue_id) for issue_id in issue_ids}
-        logger.debug(
-            f"Retrieved {sum(1 for v in results.values() if v is not None)} entries from cache"
-        )
+        issue_ids = list(issue_ids)
+        oldest = time.time() - self.cache_ttl_days * 86400
+        found = {}
+        for index in range(0, len(issue_ids), self.QUERY_CHUNK_SIZE):
+            chunk = issue_ids[index : index + self.QUERY_CHUNK_SIZE]
+            rows = self.connection.execute(
+                'SELECT key, data, timestamp FROM issues '
+                f'WHERE key IN ({", ".join("?" * len(chunk))}) AND timestamp >= ?',
+                (*chunk, oldest),
+            )
+            found.update(
+                {key: {"data": json.loads(data), "timestamp": stamp} for key, data, stamp in rows}
+            )
+        results = {issue_id: found.get(issue_id) for issue_id in issue_ids}
+        logger.debug(f"Retrieved {len(found)} entries from cache")
         return results
 
     def update(self, issue_id, data):
-        self.cache[issue_id] = {"data": data, "timestamp": time.time()}
+        self.update_many({issue_id: data})
 
     def update_many(self, issues_data):
-        for issue_id, data in issues_data.items():
-            self.update(issue_id, data)
-
-    def save(self):
-        logger.debug(f"Saving {len(self.cache)} entries to Jira cache file")
-        self.cache_file.write_text(json.dumps({"issues": self.cache}))
-
-    def _clean_expired_entries(self, data):
         now = time.time()
-        ttl = self.cache_ttl_days * 86400
-        old_count = len(data.get("issues", {}))
-        self.cache = {
-            key: value
-            for key, value in data.get("issues", {}).items()
-            if now - value.get("timestamp", 0) <= ttl
-        }
-        logger.debug(f"Cleaned expired cache entries: {old_count} → {len(self.cache)}")
+        with self._transaction(self.connection) as connection:
+            connection.executemany(
+                'INSERT INTO issues (key, data, timestamp) VALUES (?, ?, ?) '
+                'ON CONFLICT (key) DO UPDATE SET data = excluded.data, '
+                'timestamp = excluded.timestamp',
+                [(issue_id, json.dumps(data), now) for issue_id, data in issues_data.items()],
+            )
+
+    def touch_many(self, issue_ids, timestamp):
+        """Mark the cached issues as up to date at ``timestamp``, keeping newer entries"""
+        issue_ids = list(issue_ids)
+        with self._transaction(self.connection) as connection:
+            for index in range(0, len(issue_ids), self.QUERY_CHUNK_SIZE):
+                chunk = issue_ids[index : index + self.QUERY_CHUNK_SIZE]
+                connection.execute(
+                    'UPDATE issues SET timestamp = ? '
+                    f'WHERE key IN ({", ".join("?" * len(chunk))}) AND timestamp < ?',
+                    (timestamp, *chunk, timestamp),
+                )
+
+    @property
+    def last_sync(self):
+        """Time of the last delta sync, see ``sync_jira_cache``, or None"""
+        row = self.connection.execute("SELECT value FROM meta WHERE name = 'last_sync'").fetchone()
+        return row and row[0]
+
+    @last_sync.setter
+    def last_sync(self, timestamp):
+        self.connection.execute(
+            "INSERT INTO meta (name, value) VALUES ('last_sync', ?) "
+            'ON CONFLICT (name) DO UPDATE SET value = excluded.value',
+            (timestamp,),
+        )
 
 
 # Create a global instance of JiraStatusCache
@@ -103,9 +237,7 @@ def sanitized_issue_data(issue, out_fields):
     :param out_fields: The fields to return from the jira issue
     :type out_fields: list
     """
-    return {
-        field: eval(mapped_response_fields[field].format(obj_name=issue)) for field in out_fields
-    }
+    return {field: field_extractors[field](issue) for field in out_fields}
 
 
 def is_open_jira(issue_id, data=None):
@@ -209,6 +341,10 @@ def try_from_cache(issue_id, data=None):
         ):
             return pytest.issue_data[issue_id]['data']
 
+        # Then try from the data resolved by the xdist controller, see preload_jira_data
+        if preloaded := CACHED_RESPONSES['get_single'].get(issue_id):
+            return preloaded
+
         # Finally try from JiraStatusCache
         cached_data = jira_cache.get(issue_id)
         if cached_data:
@@ -278,47 +414,136 @@ def collect_dupes(jira, collected_data, cached_data=None):  # pragma: no cover
 
 # cannot use lru_cache in functions that has unhashable args
 CACHED_RESPONSES = defaultdict(dict)
-
-
-def get_jira(jql, fields=None):
+# issue ids per search query, keeps the JQL and URL length bounded
+JIRA_BATCH_SIZE = 50
+JIRA_PAGE_SIZE = 50
+JIRA_FETCH_WORKERS = 4
+JIRA_MAX_ATTEMPTS = 4
+# seconds, doubled on every attempt unless Jira sends Retry-After
+JIRA_RETRY_DELAY = 5
+
+
+def jira_session():
+    """Return a keep-alive session to the Jira REST API, shared by the concurrent requests"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=JIRA_FETCH_WORKERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Authorization'] = f"Bearer {settings.jira.api_key}"
+    return session
+
+
+def jira_request(session, method, path, retry_errors=True, **kwargs):
+    """Send a request to the Jira REST API, retrying when Jira can't answer it
+
+    Requests hitting the API rate limit (429) are retried after the ``Retry-After`` delay sent
+    by Jira, server and connection errors are retried with an exponential backoff.
+
+    :param session: requests session, see ``jira_session()``
+    :param method: HTTP method
+    :param path: path of the endpoint, relative to ``{jira.url}/rest/api/latest/``
+    :param retry_errors: retry server and connection errors, only rate limited requests are
+        retried otherwise, for requests which must not be sent twice
+    :param kwargs: passed to ``session.request``
+    :returns: the response
+    :rtype: requests.Response
+    """
+    url = f"{settings.jira.url}/rest/api/latest/{path}"
+    for attempt in range(JIRA_MAX_ATTEMPTS):
+        delay = JIRA_RETRY_DELAY * 2**attempt
+        try:
+            response = session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+        except requests.exceptions.HTTPError as err:
+            if err.response.status_code == 429:
+                delay = float(err.response.headers.get('Retry-After', delay))
+                logger.warning(f"Hit Jira API rate limit (429). Retrying in {delay}s.")
+            elif err.response.status_code < 500 or not retry_errors:
+                raise
+            else:
+                logger.warning(f"Jira API error {err}. Retrying in {delay}s.")
+        except requests.exceptions.ConnectionError as err:
+            if not retry_errors:
+                raise
+            logger.warning(f"Unable to reach Jira API: {err}. Retrying in {delay}s.")
+        if attempt + 1 < JIRA_MAX_ATTEMPTS:
+            time.sleep(delay)
+    logger.error(f"Maximum retries reached when accessing Jira API {method} {path}")
+    raise TimedOutError(f"Jira API did not answer after {JIRA_MAX_ATTEMPTS} attempts")
+
+
+def get_jira(jql, fields=None, session=None, start_at=0, max_results=JIRA_PAGE_SIZE):
     """Accepts the jql to retrieve the data from Jira for the given fields
 
     :param jql: The query for retrieving the issue(s) details from jira
     :type jql: str
     :param fields: The custom fields in query to retrieve the data for
     :type fields: list
+    :param session: requests session to use, ``jira_session()`` by default
+    :param start_at: index of the first issue of the returned page
+    :param max_results: page size, Jira may return smaller pages
     :returns: Jira object of response after status check
     :rtype: dict
     """
-    params = {"jql": jql}
+    params = {"jql": jql, "startAt": start_at, "maxResults": max_results}
     if fields:
         params.update({"fields": ",".join(fields)})
+    return jira_request(session or jira_session(), 'GET', 'search/', params=params)
 
-    def _make_request():
-        try:
-            response = requests.get(
-                f"{settings.jira.url}/rest/api/latest/search/",
-                params=params,
-                headers={"Authorization": f"Bearer {settings.jira.api_key}"},
-            )
-            response.raise_for_status()
-            return response
-        except requests.exceptions.HTTPError as err:
-            if err.response.status_code == 429:
-                logger.warning("Hit Jira API rate limit (429). Will retry after wait period.")
-            raise
 
+def search_jira(issue_ids, fields=None, session=None, jql_filter=None):
+    """Fetch the given issues with paged searches, run concurrently over one session
+
+    Issue ids are split into queries of at most ``JIRA_BATCH_SIZE`` issues. The first page of
+    every query is fetched first, then the remaining pages of all queries.
+
+    :param issue_ids: Jira issue ids to fetch
+    :type issue_ids: list
+    :param fields: The fields to retrieve for each issue
+    :type fields: list
+    :param jql_filter: optional JQL condition the returned issues must also match
+    :type jql_filter: str
+    :returns: list of raw issues as returned by Jira, in query and page order
+    """
+    batches = [
+        issue_ids[start : start + JIRA_BATCH_SIZE]
+        for start in range(0, len(issue_ids), JIRA_BATCH_SIZE)
+    ]
+    jqls = [f"key in ({', '.join(batch)})" for batch in batches]
+    if jql_filter:
+        jqls = [f"{jql} AND {jql_filter}" for jql in jqls]
+    own_session = session is None
+    session = session or jira_session()
     try:
-        return wait_for(
-            _make_request,
-            timeout=80,
-            delay=20,
-            attempts=4,
-            handle_exception=True,
-        ).out
-    except TimedOutError as err:
-        logger.error(f"Maximum retries reached when accessing Jira API: {err}")
-        raise
+        return _search_pages(jqls, fields, session)
+    finally:
+        if own_session:
+            session.close()
+
+
+def _search_pages(jqls, fields, session):
+    """Return the issues found by the queries, merged by key"""
+    with ThreadPoolExecutor(max_workers=JIRA_FETCH_WORKERS) as executor:
+
+        def fetch(jql, start_at=0):
+            return get_jira(jql, fields, session=session, start_at=start_at).json()
+
+        first_pages = list(executor.map(fetch, jqls))
+        next_pages = {}
+        for jql, page in zip(jqls, first_pages, strict=True):
+            # Jira can return less issues than requested, use the actual page size
+            page_size = len(page.get('issues') or []) or JIRA_PAGE_SIZE
+            for start_at in range(page_size, page.get('total', 0), page_size):
+                next_pages[jql, start_at] = executor.submit(fetch, jql, start_at)
+        issues = {}
+        for jql, first_page in zip(jqls, first_pages, strict=True):
+            pages = [first_page] + [
+                future.result() for (query, _), future in next_pages.items() if query == jql
+            ]
+            for page in pages:
+                issues.update((issue['key'], issue) for issue in page.get('issues') or [] if issue)
+    return list(issues.values())
 
 
 def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no cover
@@ -366,9 +591,7 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
         # Provide default data for collected Jira's.
         default_data = [get_default_jira(issue_id) for issue_id in remaining_issues]
         # Update cache with defaults
-        for issue in default_data:
-            jira_cache.update(issue['key'], issue)
-        jira_cache.save()
+        jira_cache.update_many({issue['key']: issue for issue in default_data})
 
         # Return combination of cached and default data
         return [
@@ -381,19 +604,14 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     for field in ('is_open', 'version'):
         assert field not in jira_fields
 
-    # Generate jql
     if isinstance(remaining_issues, str):
         remaining_issues = [issue_id.strip() for issue_id in remaining_issues.split(',')]
-    jql = ' OR '.join([f"id = {issue_id}" for issue_id in remaining_issues])
-    response = get_jira(jql, jira_fields)
-    data = response.json().get('issues')
+    data = search_jira(remaining_issues, jira_fields)
     # Clean the data, only keep the required info.
-    fetched_data = [sanitized_issue_data(issue, jira_fields) for issue in data if issue is not None]
+    fetched_data = [sanitized_issue_data(issue, jira_fields) for issue in data]
 
     # Update cache with new data
-    for issue in fetched_data:
-        jira_cache.update(issue['key'], issue)
-    jira_cache.save()
+    jira_cache.update_many({issue['key']: issue for issue in fetched_data})
 
     # Combine cached and fetched data
     result_data = [
@@ -403,6 +621,98 @@ def get_data_jira(issue_ids, cached_data=None, jira_fields=None):  # pragma: no
     return result_data
 
 
+def sync_jira_cache(issue_ids, jira_fields=None):
+    """Refresh the cached issues which changed in Jira since the last sync
+
+    Issues cached since the last sync are queried with ``updated >=`` the last sync, only the
+    issues updated in the meantime are returned and refreshed, the others are marked up to date.
+    Issues which are not cached, expired or older than the last sync are fetched.
+
+    :param issue_ids: Jira issue ids to sync, e.g: ['SAT-12345']
+    :type issue_ids: list
+    :param jira_fields: List of fields to be retrieved by a jira issue GET request
+    :type jira_fields: list
+    :returns: dict of the refreshed and fetched issue data, by issue id
+    :rtype: dict
+    """
+    if not settings.jira.api_key:
+        logger.warning("Config file is missing jira api_key, Jira cache is not synced.")
+        return {}
+    jira_fields = jira_fields or common_jira_fields
+    started = time.time()
+    last_sync = jira_cache.last_sync
+    cached = jira_cache.get_many(issue_ids)
+    synced, fetched = [], []
+    for issue_id, entry in cached.items():
+        if entry and last_sync and entry['timestamp'] >= last_sync:
+            synced.append(issue_id)
+        else:
+            fetched.append(issue_id)
+    refreshed = {}
+    with jira_session() as session:
+        if synced:
+            # relative dates, JQL dates are in the timezone of the Jira user; minute precision
+            minutes = math.ceil((started - last_sync) / 60) + 1
+            for issue in search_jira(synced, jira_fields, session, f'updated >= "-{minutes}m"'):
+                data = sanitized_issue_data(issue, jira_fields)
+                previous = cached[data['key']]['data']
+                if (data['status'], data['resolution']) != (
+                    previous.get('status'),
+                    previous.get('resolution'),
+                ):
+                    logger.info(
+                        f"{data['key']} changed from {previous.get('status')} "
+                        f"{previous.get('resolution')} to {data['status']} {data['resolution']}"
+                    )
+                refreshed[data['key']] = data
+        if fetched:
+            for issue in search_jira(fetched, jira_fields, session):
+                data = sanitized_issue_data(issue, jira_fields)
+                refreshed[data['key']] = data
+    jira_cache.update_many(refreshed)
+    jira_cache.touch_many(synced, started)
+    jira_cache.last_sync = started
+    logger.debug(
+        f"Synced Jira cache: {len(synced)} issues checked for updates, {len(fetched)} fetched, "
+        f"{len(refreshed)} refreshed"
+    )
+    return refreshed
+
+
+def resolve_jira_issues(issue_ids):
+    """Get the data of all the given issues at once, from the Jira cache or the Jira API
+
+    The cache is synced first when ``jira.delta_sync`` is enabled.
+
+    :param issue_ids: Jira issue ids, e.g: ['SAT-12345']
+    :type issue_ids: list
+    :returns: dict of issue data by issue id, see ``preload_jira_data``
+    :rtype: dict
+    """
+    issue_ids = sorted(set(issue_ids))
+    if not issue_ids:
+        return {}
+    if settings.jira.delta_sync:
+        sync_jira_cache(issue_ids)
+    try:
+        data = get_data_jira(issue_ids)
+    except TimedOutError:
+        logger.warning(
+            f"Failed to fetch data for {len(issue_ids)} Jira issues, not resolving them."
+        )
+        return {}
+    return {issue['key']: issue for issue in data}
+
+
+def preload_jira_data(issue_data):
+    """Use issue data resolved by another process, like the xdist controller, for the lookups
+
+    :param issue_data: dict of issue data by issue id, see ``resolve_jira_issues``
+    :type issue_data: dict
+    """
+    CACHED_RESPONSES['get_single'].update(issue_data)
+
+
 def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
     """Call Jira API to get a single Jira data and cache it
 
@@ -438,7 +748,6 @@ def get_single_jira(issue_id, cached_data=None):  # pragma: no cover
                     # Update cache with new data if found
                     if jira_data:
                         jira_cache.update(issue_id, jira_data)
-                        jira_cache.save()
         except (KeyError, TypeError):
             # Return default if anything goes wrong
             jira_data = get_default_jira(issue_id)
@@ -465,6 +774,7 @@ def add_comment_on_jira(
     comment_type=settings.jira.comment_type,
     comment_visibility=settings.jira.comment_visibility,
     labels=None,
+    session=None,
 ):
     """Adds a new comment to a Jira issue.
 
@@ -478,6 +788,7 @@ def add_comment_on_jira(
     :type comment_visibility: str
     :param labels: Add/Remove Jira labels, ex. [{'add':'tests_passed'},{'remove':'tests_failed'}]
     :type labels: list
+    :param session: requests session to use, ``jira_session()`` by default
     :returns: Response from Jira API
     :rtype: list of dicts
     """
@@ -490,17 +801,17 @@ def add_comment_on_jira(
             'and provide --jira-comment pytest option."'
         )
         return None
+    session = session or jira_session()
     if labels:
         logger.debug(f"Updating labels for {issue_id} issue. \n labels: \n {labels}")
-        response = requests.put(
-            f"{settings.jira.url}/rest/api/latest/issue/{issue_id}/",
-            json={"update": {"labels": labels}},
-            headers={"Authorization": f"Bearer {settings.jira.api_key}"},
-        )
-        response.raise_for_status()
+        jira_request(session, 'PUT', f"issue/{issue_id}/", json={"update": {"labels": labels}})
     logger.debug(f"Adding a new comment on {issue_id} Jira issue. \n comment: \n {comment}")
-    response = requests.post(
-        f"{settings.jira.url}/rest/api/latest/issue/{issue_id}/comment",
+    # a comment sent twice is posted twice, only rate limited requests are retried
+    response = jira_request(
+        session,
+        'POST',
+        f"issue/{issue_id}/comment",
+        retry_errors=False,
         json={
             "body": comment,
             "visibility": {
@@ -508,7 +819,5 @@ def add_comment_on_jira(
                 "value": comment_visibility,
             },
         },
-        headers={"Authorization": f"Bearer {settings.jira.api_key}"},
     )
-    response.raise_for_status()
     return response.json()
@@ -1,8 +1,11 @@
 """Utility module to communicate with Ohsnap API"""
 
+from threading import Lock
+
 from box import Box
 from packaging.version import Version
 import requests
+from requests.adapters import HTTPAdapter
 from wait_for import wait_for
 
 from robottelo import constants
@@ -21,8 +24,60 @@ def ohsnap_response_hook(r, *args, **kwargs):
     r.raise_for_status()
 
 
-def ohsnap_repo_url(ohsnap, request_type, product, release, os_release, snap=''):
-    """Returns a URL pointing to Ohsnap "repo_file" or "repositories" API endpoint"""
+class OhsnapSession(requests.Session):
+    """Pooled session revalidating cached Ohsnap API responses
+
+    JSON responses carrying an ``ETag`` or ``Last-Modified`` header are stored in ``cache``.
+    Later requests for the same URL send ``If-None-Match``/``If-Modified-Since`` and a ``304 Not
+    Modified`` answer is replaced by the cached body, with ``response.revalidated`` set to True.
+    The session is safe to share between the threads fetching repositories concurrently.
+
+    :param dict cache: url to ``{'etag', 'last_modified', 'body'}`` mapping of earlier responses
+    :param int pool_size: number of pooled connections per host
+    """
+
+    def __init__(self, cache=None, pool_size=10):
+        super().__init__()
+        self.cache = {} if cache is None else cache
+        self._lock = Lock()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+
+    def get(self, url, **kwargs):
+        with self._lock:
+            cached = self.cache.get(url)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached and cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        response = super().get(url, headers=headers, **kwargs)
+        response.revalidated = response.status_code == 304 and cached is not None
+        if response.revalidated:
+            logger.debug(f'Ohsnap response for {url} not modified, using the cached one')
+            response.status_code = 200
+            response._content = cached['body'].encode()
+        elif response.ok and 'json' in response.headers.get('Content-Type', ''):
+            etag, last_modified = (
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+            )
+            if etag or last_modified:
+                with self._lock:
+                    self.cache[url] = {
+                        'etag': etag,
+                        'last_modified': last_modified,
+                        'body': response.text,
+                    }
+        return response
+
+
+def ohsnap_repo_url(ohsnap, request_type, product, release, os_release, snap='', session=None):
+    """Returns a URL pointing to Ohsnap "repo_file" or "repositories" API endpoint
+
+    :param session: ``requests`` session to use, e.g. an ``OhsnapSession``
+    """
     if request_type not in ['repo_file', 'repositories']:
         raise InvalidArgumentError('Type must be one of "repo_file" or "repositories"')
     if not all([product, release, os_release]):
@@ -47,7 +102,7 @@ def ohsnap_repo_url(ohsnap, request_type, product, release, os_release, snap='')
                 'hooks': {'response': ohsnap_response_hook},
             }
             res, _ = wait_for(
-                lambda: requests.get(**request_query),
+                lambda: (session or requests).get(**request_query),
                 handle_exception=True,
                 raise_original=True,
                 timeout=ohsnap.request_retry.timeout,
@@ -75,13 +130,18 @@ def dogfood_repofile_url(ohsnap, product, release, os_release, snap=''):
 
 
 def dogfood_repository(
-    ohsnap, repo, product, release, os_release, snap='', arch=None, repo_check=True
+    ohsnap, repo, product, release, os_release, snap='', arch=None, repo_check=True, session=None
 ):
-    """Returns a repository definition based on the arguments provided"""
+    """Returns a repository definition based on the arguments provided
+
+    :param session: ``requests`` session to use, e.g. an ``OhsnapSession``. Repositories of a
+        revalidated, not modified Ohsnap response are not checked on the remote server again.
+    """
     arch = arch or constants.DEFAULT_ARCHITECTURE
+    session = session or requests
     res, _ = wait_for(
-        lambda: requests.get(
-            ohsnap_repo_url(ohsnap, 'repositories', product, release, os_release, snap),
+        lambda: session.get(
+            ohsnap_repo_url(ohsnap, 'repositories', product, release, os_release, snap, session),
             hooks={'response': ohsnap_response_hook},
         ),
         handle_exception=True,
@@ -96,14 +156,16 @@ def dogfood_repository(
             f'Repository "{repo}" is not provided by the given product'
         ) from None
     repository['baseurl'] = repository['baseurl'].replace('$basearch', arch)
-    # If repo check is enabled, check that the repository actually exists on the remote server
-    dogfood_req = requests.get(repository['baseurl'])
-    if repo_check and not dogfood_req.ok:
-        logger.warning(
-            f'Unable to locate the repo at the URL: {repository["baseurl"]} ; '
-            f'HTTP response: {dogfood_req.status_code}; Arguments used: {repo=}, '
-            f'{product=}, {release=}, {os_release=}, {snap=}'
-        )
+    # If repo check is enabled, check that the repository actually exists on the remote server.
+    # Repositories of a not modified Ohsnap response were checked when they were first fetched.
+    if repo_check and not getattr(res, 'revalidated', False):
+        dogfood_req = session.get(repository['baseurl'])
+        if not dogfood_req.ok:
+            logger.warning(
+                f'Unable to locate the repo at the URL: {repository["baseurl"]} ; '
+                f'HTTP response: {dogfood_req.status_code}; Arguments used: {repo=}, '
+                f'{product=}, {release=}, {os_release=}, {snap=}'
+            )
     return Box(**repository)
 
 
@@ -0,0 +1,228 @@
+"""Record and replay HTTP and SSH traffic of the framework
+
+In ``record`` mode every HTTP request sent through :mod:`requests` (which covers nailgun, apypie
+and direct ``requests`` usage) and every SSH command run through ``ContentHost.execute`` (which
+covers hammer via :mod:`robottelo.cli.base` and :func:`robottelo.ssh.command`) is captured
+together with its response into a cassette. In ``replay`` mode the same calls are answered from
+the cassette without touching the network and without any delay.
+
+Interactions are matched by kind (``http`` or ``ssh``) and a key (``METHOD scheme://host/path`` for
+HTTP, the hostname for SSH), each key replaying its recorded responses in order. Request bodies,
+query strings and the commands themselves are stored for reference only, as they usually contain
+randomly generated values.
+
+Usage::
+
+    with use_cassette('cassettes/test_foo.json.gz', mode='record'):
+        target_sat.api.Organization().create()
+"""
+
+import base64
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import timedelta
+import gzip
+import json
+from pathlib import Path
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+from broker.helpers import Result
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from robottelo.logging import logger
+
+RECORD_MODES = ('off', 'record', 'replay')
+CASSETTE_VERSION = 1
+
+
+class CassetteError(Exception):
+    """Raised when a replayed call has no matching recorded interaction"""
+
+
+def _encode_body(body):
+    if body is None:
+        return None
+    if isinstance(body, str):
+        return {'text': body}
+    try:
+        return {'text': body.decode('utf-8')}
+    except UnicodeDecodeError:
+        return {'base64': base64.b64encode(body).decode('ascii')}
+
+
+def _decode_body(body):
+    if body is None:
+        return b''
+    if 'text' in body:
+        return body['text'].encode('utf-8')
+    return base64.b64decode(body['base64'])
+
+
+def http_key(method, url):
+    """Return the replay key of an HTTP request, without the query string"""
+    scheme, netloc, path, _, _ = urlsplit(url)
+    return f'{method.upper()} {urlunsplit((scheme, netloc, path, "", ""))}'
+
+
+class Cassette:
+    """Ordered list of recorded interactions stored as a gzipped JSON document
+
+    :param path: path of the cassette file
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.interactions = []
+        self._queues = defaultdict(deque)
+        self.recorded_time = 0.0
+        self.played = 0
+
+    @classmethod
+    def load(cls, path):
+        """Load a cassette from disk and prepare it for replay"""
+        cassette = cls(path)
+        with gzip.open(cassette.path, 'rt', encoding='utf-8') as cassette_file:
+            data = json.load(cassette_file)
+        cassette.interactions = data['interactions']
+        for interaction in cassette.interactions:
+            cassette._queues[(interaction['kind'], interaction['key'])].append(interaction)
+        return cassette
+
+    def save(self):
+        """Write the recorded interactions to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'version': CASSETTE_VERSION, 'interactions': self.interactions}
+        with gzip.open(self.path, 'wt', encoding='utf-8') as cassette_file:
+            json.dump(data, cassette_file, separators=(',', ':'))
+
+    def record(self, kind, key, request, response, elapsed):
+        """Append an interaction to the cassette"""
+        self.interactions.append(
+            {
+                'kind': kind,
+                'key': key,
+                'request': request,
+                'response': response,
+                'elapsed': elapsed,
+            }
+        )
+
+    def play(self, kind, key):
+        """Return the next recorded interaction for ``kind`` and ``key``
+
+        :raises CassetteError: if there is no recorded interaction left for the key
+        """
+        try:
+            interaction = self._queues[(kind, key)].popleft()
+        except IndexError as err:
+            raise CassetteError(f'No recorded {kind} interaction for {key} in {self.path}') from err
+        self.played += 1
+        self.recorded_time += interaction['elapsed']
+        return interaction
+
+
+def _build_response(request, recorded):
+    """Rebuild a ``requests.Response`` from a recorded HTTP response"""
+    response = requests.Response()
+    response.status_code = recorded['status_code']
+    response.reason = recorded['reason']
+    response.headers = CaseInsensitiveDict(recorded['headers'])
+    response.url = recorded['url']
+    response.encoding = recorded['encoding']
+    response._content = _decode_body(recorded['body'])
+    response.request = request
+    response.elapsed = timedelta(0)
+    return response
+
+
+def _ssh_targets():
+    """Return the (class, attribute) pairs through which SSH commands are executed"""
+    from robottelo.hosts import ContentHost
+
+    return [(ContentHost, 'execute'), (ContentHost, 'run')]
+
+
+@contextmanager
+def use_cassette(path, mode='replay', ssh_targets=None):
+    """Record or replay the HTTP and SSH traffic within the context
+
+    :param path: path of the cassette file
+    :param mode: one of ``off``, ``record`` or ``replay``
+    :param ssh_targets: list of ``(class, attribute)`` pairs of SSH execute methods to patch,
+        defaults to ``ContentHost.execute`` and ``ContentHost.run``
+    :return: the active :class:`Cassette`, None when ``mode`` is ``off``
+    """
+    if mode not in RECORD_MODES:
+        raise ValueError(f'Record mode must be one of {RECORD_MODES}, got {mode!r}')
+    if mode == 'off':
+        yield None
+        return
+    cassette = Cassette.load(path) if mode == 'replay' else Cassette(path)
+    originals = []
+    if ssh_targets is None:
+        ssh_targets = _ssh_targets()
+    orig_send = HTTPAdapter.send
+
+    def send(adapter, request, *args, **kwargs):
+        key = http_key(request.method, request.url)
+        if mode == 'replay':
+            recorded = cassette.play('http', key)
+            return _build_response(request, recorded['response'])
+        start = time.perf_counter()
+        response = orig_send(adapter, request, *args, **kwargs)
+        cassette.record(
+            'http',
+            key,
+            {'url': request.url, 'body': _encode_body(request.body)},
+            {
+                'status_code': response.status_code,
+                'reason': response.reason,
+                'headers': dict(response.headers),
+                'url': response.url,
+                'encoding': response.encoding,
+                'body': _encode_body(response.content),
+            },
+            time.perf_counter() - start,
+        )
+        return response
+
+    def wrap_execute(orig_execute):
+        def execute(host, command, *args, **kwargs):
+            if mode == 'replay':
+                recorded = cassette.play('ssh', host.hostname)['response']
+                return Result(**recorded)
+            start = time.perf_counter()
+            result = orig_execute(host, command, *args, **kwargs)
+            cassette.record(
+                'ssh',
+                host.hostname,
+                {'command': command},
+                {'status': result.status, 'stdout': result.stdout, 'stderr': result.stderr},
+                time.perf_counter() - start,
+            )
+            return result
+
+        return execute
+
+    try:
+        HTTPAdapter.send = send
+        for owner, attr in ssh_targets:
+            orig = owner.__dict__.get(attr, getattr(owner, attr))
+            originals.append((owner, attr, orig, attr in owner.__dict__))
+            setattr(owner, attr, wrap_execute(getattr(owner, attr)))
+        yield cassette
+    finally:
+        HTTPAdapter.send = orig_send
+        for owner, attr, orig, owned in reversed(originals):
+            if owned:
+                setattr(owner, attr, orig)
+            else:
+                delattr(owner, attr)
+        if mode == 'record':
+            cassette.save()
+            logger.debug(
+                f'Recorded {len(cassette.interactions)} interactions to cassette {cassette.path}'
+            )
@@ -4,12 +4,20 @@ This is useful for cases where multiple processes need to wait for all other pro
 before continuing with some common action. The most common use case in this framework will likely
 be to wait for all pre-upgrade setups to be ready before performing the upgrade.
 
-The system works by creating a file in /tmp with the name of the resource. This is a common file
-where each process can communicate its status. The first process to register will be the main
-watcher. The main watcher will wait for all other processes to be ready, then perform the action.
-If the main actor fails to complete the action, and the action is recoverable, another process
-will take over as the main watcher and attempt to perform the action. If the action is not
-recoverable, the main watcher will fail and release all other processes.
+The system works by creating a SQLite database in /tmp with the name of the resource. Each process
+registers a row holding its status, status changes are single row updates instead of rewrites of
+the whole resource. The first process to register will be the main watcher. The main watcher will
+wait for all other processes to be ready, then perform the action. If the main actor fails to
+complete the action, and the action is recoverable, another process will take over as the main
+watcher and attempt to perform the action. If the action is not recoverable, the main watcher will
+fail and release all other processes.
+
+Waiting processes don't poll the resource. Each watcher listens on its own named pipe in the
+``<resource>.notify`` directory, and every status change writes a byte to the pipes of the other
+watchers, waking them up to check the statuses again.
+
+When a coordination server is configured (see ``robottelo.utils.coordination``), the statuses are
+kept by the server instead, so watchers running on different test nodes share the resource.
 
 It is recommended to use this class as a context manager, as it will automatically register and
 report when the process is done.
@@ -23,22 +31,242 @@ Example:
 """
 
 import datetime
-import json
 import os
 from pathlib import Path
-import time
+import select
+import shutil
+import sqlite3
+import threading
 from uuid import uuid4
 
-from broker.helpers import FileLock
 from wait_for import wait_for
 
 from robottelo.config import settings
+from robottelo.logging import robottelo_log_dir
+from robottelo.utils import coordination
+
+# log files opened by this process, shared by all its resources
+_log_files = {}
+_log_lock = threading.Lock()
 
 
 class SharedResourceError(Exception):
     """An exception class for SharedResource errors."""
 
 
+class _LocalResourceStore:
+    """Statuses of a resource in a SQLite database in /tmp, shared by the local processes
+
+    Each watcher listens on its own named pipe in the notification directory, every change
+    writes a byte to the pipes of the other watchers.
+    """
+
+    def __init__(self, resource_file, notify_dir, watcher_id):
+        self.resource_file = resource_file
+        self.notify_dir = notify_dir
+        self.watcher_id = watcher_id
+        self._connection = None
+        self._notify_fd = None
+
+    @property
+    def connection(self):
+        """The connection to the resource database, opened when registering"""
+        if self._connection is None:
+            # autocommit, writes use explicit transactions; wait for the other writers
+            self._connection = sqlite3.connect(self.resource_file, timeout=60, isolation_level=None)
+        return self._connection
+
+    def _transaction(self, *statements):
+        """Run the ``(sql, parameters)`` statements in one write transaction
+
+        The other watchers are notified when the last statement changed rows.
+
+        Returns:
+            int: The number of rows changed by the last statement.
+        """
+        connection = self.connection
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            for sql, parameters in statements:
+                cursor = connection.execute(sql, parameters)
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        connection.execute('COMMIT')
+        if cursor.rowcount:
+            self._notify()
+        return cursor.rowcount
+
+    def _notify(self):
+        """Wake up the other watchers of the resource"""
+        try:
+            pipes = list(os.scandir(self.notify_dir))
+        except FileNotFoundError:
+            return
+        for pipe in pipes:
+            if pipe.name == self.watcher_id:
+                continue
+            try:
+                fd = os.open(pipe.path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError:
+                # the watcher is gone, or did not open its pipe yet and checks the resource next
+                continue
+            try:
+                os.write(fd, b'\0')
+            except BlockingIOError:
+                # the pipe is full of notifications the watcher did not read yet
+                pass
+            finally:
+                os.close(fd)
+
+    def wait_for_change(self, timeout):
+        """Waits until another watcher changes the resource, at most timeout seconds"""
+        readable, _, _ = select.select([self._notify_fd], [], [], timeout)
+        if readable:
+            while True:
+                try:
+                    if not os.read(self._notify_fd, 4096):
+                        break
+                except BlockingIOError:
+                    break
+
+    def register(self):
+        """Registers the watcher, returns the main watcher ID"""
+        # listen before registering, so no change is missed
+        self.notify_dir.mkdir(exist_ok=True)
+        pipe = self.notify_dir / self.watcher_id
+        os.mkfifo(pipe)
+        # also opened for writing, so the pipe never reports the end of file to select
+        self._notify_fd = os.open(pipe, os.O_RDWR | os.O_NONBLOCK)
+        self._transaction(
+            (
+                'CREATE TABLE IF NOT EXISTS watchers (id TEXT PRIMARY KEY, status TEXT NOT NULL)',
+                (),
+            ),
+            (
+                'CREATE TABLE IF NOT EXISTS main '
+                '(singleton INTEGER PRIMARY KEY CHECK (singleton = 0), '
+                'watcher TEXT NOT NULL, status TEXT NOT NULL)',
+                (),
+            ),
+            # the first watcher to register becomes the main watcher
+            (
+                "INSERT OR IGNORE INTO main (singleton, watcher, status) VALUES (0, ?, 'waiting')",
+                (self.watcher_id,),
+            ),
+            ("INSERT INTO watchers (id, status) VALUES (?, 'pending')", (self.watcher_id,)),
+        )
+        return self.main()[0]
+
+    def unregister(self):
+        self._transaction(('DELETE FROM watchers WHERE id = ?', (self.watcher_id,)))
+
+    def set_status(self, status):
+        self._transaction(
+            ('UPDATE watchers SET status = ? WHERE id = ?', (status, self.watcher_id))
+        )
+
+    def set_main_status(self, status):
+        self._transaction(('UPDATE main SET status = ?', (status,)))
+
+    def take_over(self):
+        """Becomes the recovering main watcher if the main watcher failed, returns whether it did"""
+        return bool(
+            self._transaction(
+                (
+                    "UPDATE main SET status = 'recovering', watcher = ? "
+                    "WHERE status IN ('action_error', 'error')",
+                    (self.watcher_id,),
+                )
+            )
+        )
+
+    def all_status(self, status):
+        return not self.connection.execute(
+            'SELECT EXISTS (SELECT 1 FROM watchers WHERE status != ?)', (status,)
+        ).fetchone()[0]
+
+    def main(self):
+        """Returns the main watcher ID and the main status"""
+        return tuple(self.connection.execute('SELECT watcher, status FROM main').fetchone())
+
+    def exists(self):
+        return self.resource_file.exists()
+
+    def remove(self):
+        """Removes the resource file and the notification pipes of all watchers"""
+        self.resource_file.unlink(missing_ok=True)
+        shutil.rmtree(self.notify_dir, ignore_errors=True)
+
+    def close(self):
+        """Closes the resource database and stops listening for changes"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        if self._notify_fd is not None:
+            os.close(self._notify_fd)
+            self._notify_fd = None
+            (self.notify_dir / self.watcher_id).unlink(missing_ok=True)
+
+
+class _ServerResourceStore:
+    """Statuses of a resource kept by the coordination server, shared by all test nodes
+
+    Waiting requests block on the server until the resource changes.
+    """
+
+    def __init__(self, client, resource_name, watcher_id):
+        self.client = client
+        self.resource_name = resource_name
+        self.watcher_id = watcher_id
+        self._version = None
+
+    def _call(self, op, **params):
+        return self.client.call(op, name=self.resource_name, **params)
+
+    def _state(self):
+        state = self._call('resource_state')
+        self._version = state['version']
+        return state
+
+    def wait_for_change(self, timeout):
+        """Waits until the resource changes since it was last read, at most timeout seconds"""
+        self._version = self._call('resource_wait', version=self._version, timeout=timeout)
+
+    def register(self):
+        """Registers the watcher, returns the main watcher ID"""
+        return self._call('resource_register', watcher=self.watcher_id)
+
+    def unregister(self):
+        self._call('resource_unregister', watcher=self.watcher_id)
+
+    def set_status(self, status):
+        self._call('resource_status', watcher=self.watcher_id, status=status)
+
+    def set_main_status(self, status):
+        self._call('resource_main_status', status=status)
+
+    def take_over(self):
+        """Becomes the recovering main watcher if the main watcher failed, returns whether it did"""
+        return self._call('resource_take_over', watcher=self.watcher_id)
+
+    def all_status(self, status):
+        return all(value == status for value in self._state()['watchers'].values())
+
+    def main(self):
+        """Returns the main watcher ID and the main status"""
+        return tuple(self._state()['main'])
+
+    def exists(self):
+        return not (self._call('resource_state') or {'removed': True})['removed']
+
+    def remove(self):
+        self._call('resource_remove')
+
+    def close(self):
+        pass
+
+
 class SharedResource:
     """A class representing a shared resource.
 
@@ -48,7 +276,8 @@ class SharedResource:
         action_kwargs (dict): The keyword arguments to be passed to the action function.
         action_is_recoverable (bool): Whether the action is recoverable or not.
         id (str): The unique identifier of the shared resource.
-        resource_file (Path): The path to the file representing the shared resource.
+        resource_file (Path): The path to the database representing the shared resource.
+        notify_dir (Path): The directory of the named pipes notifying the watchers.
         is_main (bool): Whether the current instance is the main watcher or not.
         is_recovering (bool): Whether the current instance is recovering from an error or not.
     """
@@ -72,19 +301,26 @@ class SharedResource:
             action_validator (function): The function to validate the action results.
             action_kwargs (dict): The keyword arguments to be passed to the action function.
         """
+        self.resource_name = resource_name
         self.resource_file = Path(f"/tmp/{resource_name}.shared")
-        self.lock_file = FileLock(self.resource_file)
+        self.notify_dir = Path(f"/tmp/{resource_name}.shared.notify")
         self.id = str(uuid4().fields[-1])
         self.action = action
         self.action_validator = action_validator
         self.action_is_recoverable = action_kwargs.pop("action_is_recoverable", False)
         self.action_args = action_args
         self.action_kwargs = action_kwargs
+        self.is_main = False
         self.is_recovering = False
         self.retries = retries
         self.delay = delay
+        self._registered = False
+        if (client := coordination.get_client()) is not None:
+            self.store = _ServerResourceStore(client, resource_name, self.id)
+        else:
+            self.store = _LocalResourceStore(self.resource_file, self.notify_dir, self.id)
 
-    def log(message, level="DEBUG"):
+    def log(self, message, level="DEBUG"):
         """Pytest has a limitation to use logging.logger from conftest.py
         so we need to emulate the logger by std-out the output
         """
@@ -93,7 +329,11 @@ class SharedResource:
             date=now.strftime("%Y-%m-%d %H:%M:%S"), level=level, message=message
         )
         print(full_message)  # noqa
-        with open(f'logs/robottelo_{os.environ.get("PYTEST_XDIST_WORKER")}.log', 'a') as log_file:
+        log_path = robottelo_log_dir / f'robottelo_{os.environ.get("PYTEST_XDIST_WORKER")}.log'
+        with _log_lock:
+            if (log_file := _log_files.get(log_path)) is None:
+                # line buffered, nothing is left in the buffer to be written again by forks
+                log_file = _log_files[log_path] = log_path.open('a', buffering=1)
             log_file.write(full_message)
 
     def _update_status(self, status):
@@ -102,11 +342,12 @@ class SharedResource:
         Args:
             status (str): The new status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["statuses"][self.id] = status
-            self.log(f"Updating watcher status to {status}")
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        if not self._registered:
+            # statuses of unregistered watchers are not checked by anyone
+            self.log(f"Watcher already unregistered, not updating its status to {status}")
+            return
+        self.log(f"Updating watcher status to {status}")
+        self.store.set_status(status)
 
     def _update_main_status(self, status):
         """Updates the main status of the shared resource.
@@ -114,10 +355,7 @@ class SharedResource:
         Args:
             status (str): The new main status of the shared resource.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            curr_data["main_status"] = status
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self.store.set_main_status(status)
 
     def _check_all_status(self, status):
         """Checks if all watchers have the specified status.
@@ -128,12 +366,11 @@ class SharedResource:
         Returns:
             bool: True if all watchers have the specified status, False otherwise.
         """
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            for watcher_id in curr_data["watchers"]:
-                if curr_data["statuses"].get(watcher_id) != status:
-                    return False
-            return True
+        return self.store.all_status(status)
+
+    def _wait_for_change(self):
+        """Waits until another watcher changes the resource, or the resource wait is over"""
+        self.store.wait_for_change(settings.robottelo.shared_resource_wait)
 
     def _wait_for_status(self, status):
         """Waits until all watchers have the specified status.
@@ -144,62 +381,50 @@ class SharedResource:
         while not self._check_all_status(status):
             if status == "done":
                 self.log("Main worker still waiting for all workers to report status 'done'.")
-            time.sleep(1)
+            self._wait_for_change()
 
     def _wait_for_main_watcher(self):
         """Waits for the main watcher to finish."""
         while True:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] == "error":
-                raise Exception(f"Error in main watcher: {curr_data['main_watcher']}")
-            if curr_data["main_status"] == "action_error":
+            main_watcher, main_status = self.store.main()
+            if main_status == "error":
+                raise Exception(f"Error in main watcher: {main_watcher}")
+            if main_status == "action_error":
                 self._try_take_over()
-            elif curr_data["main_status"] != "done":
-                time.sleep(settings.robottelo.shared_resource_wait)
+            elif main_status != "done":
+                self._wait_for_change()
             else:
                 self.log("Main status now done, breaking wait loop")
                 break
 
     def _try_take_over(self):
         """Tries to take over as the main watcher."""
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            if curr_data["main_status"] in ("action_error", "error"):
-                curr_data["main_status"] = "recovering"
-                curr_data["main_watcher"] = self.id
-                self.resource_file.write_text(json.dumps(curr_data, indent=4))
-                self.is_main = True
-                self.is_recovering = True
+        if self.store.take_over():
+            self.is_main = True
+            self.is_recovering = True
         self.wait()
 
     def register(self):
         """Registers the current process as a watcher."""
-        with self.lock_file:
-            if self.resource_file.exists():
-                curr_data = json.loads(self.resource_file.read_text())
-                self.is_main = False
-            else:  # First watcher to register, becomes the main watcher, and creates the file
-                curr_data = {
-                    "watchers": [],
-                    "statuses": {},
-                    "main_watcher": self.id,
-                    "main_status": "waiting",
-                }
-                self.is_main = True
-            curr_data["watchers"].append(self.id)
-            curr_data["statuses"][self.id] = "pending"
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        self.is_main = self.store.register() == self.id
+        self._registered = True
 
     def unregister(self):
         """Unregisters the current process as a watcher."""
         self.log(f"Unregistering {os.environ.get('PYTEST_XDIST_WORKER')}")
-        with self.lock_file:
-            curr_data = json.loads(self.resource_file.read_text())
-            self.log("Removing watcher ID from resource file")
-            curr_data["watchers"].remove(self.id)
-            del curr_data["statuses"][self.id]
-            self.log("Writing new resource file")
-            self.resource_file.write_text(json.dumps(curr_data, indent=4))
+        if not self.store.exists():
+            raise FileNotFoundError(f'Shared resource {self.resource_name} was already removed')
+        self.log("Removing watcher ID from resource file")
+        self.store.unregister()
+        self._registered = False
+
+    def remove(self):
+        """Removes the shared resource."""
+        self.store.remove()
+
+    def close(self):
+        """Stops using the shared resource, once unregistered."""
+        self.store.close()
 
     def ready(self):
         """Marks the current process as ready to perform the action."""
@@ -221,7 +446,7 @@ class SharedResource:
         except Exception as err:
             if not self.action_is_recoverable:
                 self._update_main_status("error")
-                self.resource_file.unlink()
+                self.remove()
                 raise SharedResourceError('Main worker failed during action') from err
             self._update_main_status('action_error')
             raise SharedResourceError('Recoverable failures in main worker') from err
@@ -246,18 +471,27 @@ class SharedResource:
 
     def __enter__(self):
         """Registers the current process as a watcher and returns the instance."""
-        self.register()
+        try:
+            self.register()
+        except BaseException:
+            self.close()
+            raise
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
         """Marks the current process as done and updates the main watcher if needed."""
+        try:
+            self._exit(exc_type, exc_value)
+        finally:
+            self.close()
+
+    def _exit(self, exc_type, exc_value):
         try:
             self.unregister()
         except Exception as e:
             self.log(
                 f'WARNING: Failed to unregister watcher '
-                f'(resource: {getattr(self, "resource_name", "unknown")}, '
-                f'watcher ID: {getattr(self, "watcher_id", "unknown")}): {e}'
+                f'(resource: {self.resource_name}, watcher ID: {self.id}): {e}'
             )
 
         if exc_type is FileNotFoundError:
@@ -271,14 +505,14 @@ class SharedResource:
             if self.is_main:
                 self._wait_for_status("done")
                 self.log("All workers done, removing resource file")
-                self.resource_file.unlink()
+                self.remove()
         else:
             self._update_status("error")
             if self.is_main:
                 if self._check_all_status("error"):
                     # All have failed, delete the file
                     self.log("All workers FAILED, removing resource file")
-                    self.resource_file.unlink()
+                    self.remove()
                 else:
                     self.log("Setting main status to ERROR")
                     self._update_main_status("error")
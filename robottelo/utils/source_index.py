@@ -0,0 +1,131 @@
+"""Per-file results of static source scans, cached on disk
+
+Collection plugins scan the sources of test modules (docstring tokens, ``is_open`` usage, ...)
+for every collected item. ``SourceScanCache`` runs a scanner once per source file and stores its
+JSON serializable result keyed by the file path, modification time and content hash. Unchanged
+files are neither read nor parsed again by later runs or by the other xdist workers.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from robottelo.logging import collection_logger as logger
+
+
+def definitions(tree):
+    """Yield the qualified name and node of every class and function defined in an ast tree
+
+    Qualified names are the ``__qualname__`` of the objects at runtime.
+    """
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.ClassDef | ast.FunctionDef | ast.AsyncFunctionDef):
+                qualname = f'{prefix}{child.name}'
+                yield qualname, child
+                local = '.<locals>.' if not isinstance(child, ast.ClassDef) else '.'
+                yield from visit(child, f'{qualname}{local}')
+            elif not isinstance(child, ast.expr):
+                # definitions inside if/try/with blocks belong to the enclosing scope
+                yield from visit(child, prefix)
+
+    yield from visit(tree, '')
+
+
+def docstrings(source):
+    """Return the cleaned docstrings of a module source, as ``inspect.getdoc`` returns them
+
+    :return: dict mapping qualified names to docstrings, the module docstring has the key ``''``.
+        Functions, classes and modules without a docstring are not included.
+    """
+    tree = ast.parse(source)
+    found = {}
+    if (doc := ast.get_docstring(tree)) is not None:
+        found[''] = doc
+    for qualname, node in definitions(tree):
+        if (doc := ast.get_docstring(node)) is not None:
+            found[qualname] = doc
+    return found
+
+
+def function_sources(source):
+    """Return the source of every function of a module source, as ``inspect.getsource`` does
+
+    :return: dict mapping qualified names to the function source, including decorators
+    """
+    lines = source.splitlines(keepends=True)
+    return {
+        qualname: ''.join(
+            lines[
+                min([node.lineno] + [d.lineno for d in node.decorator_list]) - 1 : node.end_lineno
+            ]
+        )
+        for qualname, node in definitions(ast.parse(source))
+        if not isinstance(node, ast.ClassDef)
+    }
+
+
+class SourceScanCache:
+    """Cache of ``scanner(source)`` results per source file
+
+    :param name: cache name, used for the cache file name
+    :param scanner: callable taking the source text of a file and returning JSON data
+    :param cache_dir: directory of the cache file, results are only kept in memory if None
+    :param version: bump when the scanner output changes to discard cached results
+    """
+
+    def __init__(self, name, scanner, cache_dir=None, version=1):
+        self.scanner = scanner
+        self.path = Path(cache_dir, f'{name}-v{version}.json') if cache_dir else None
+        self._entries = self._load()
+        self._checked = {}
+        self._changed = set()
+
+    def _load(self):
+        if self.path is None:
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, path):
+        """Return the scanner result for the file at ``path``"""
+        path = str(path)
+        if path in self._checked:
+            return self._checked[path]
+        stat = os.stat(path)
+        entry = self._entries.get(path)
+        if not (entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size):
+            content = Path(path).read_bytes()
+            digest = hashlib.sha256(content).hexdigest()
+            if not (entry and entry['sha256'] == digest):
+                logger.debug(f'Scanning source file {path}')
+                entry = {'sha256': digest, 'result': self.scanner(content.decode())}
+            entry.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            self._entries[path] = entry
+            self._changed.add(path)
+        self._checked[path] = entry['result']
+        return entry['result']
+
+    def save(self):
+        """Write the results of files scanned by this process to the cache file
+
+        Entries written meanwhile by other processes, e.g. other xdist workers, are kept.
+        """
+        if self.path is None or not self._changed:
+            return
+        entries = self._load()
+        entries.update({path: self._entries[path] for path in self._changed})
+        staging = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            staging.write_text(json.dumps(entries))
+            staging.replace(self.path)
+        except OSError as err:
+            logger.warning(f'Unable to write source scan cache {self.path}: {err}')
+            return
+        self._changed.clear()
@@ -0,0 +1,125 @@
+"""Local Satellite stand-in for framework self-tests and benchmarks
+
+The stand-in emulates a useful subset of a Satellite without any network or infrastructure:
+
+* an HTTP server on localhost serving the Foreman/Katello v2 API for common entities
+  (organizations, products, repositories, content views, ...) including foreman tasks that are
+  ``running`` for a configurable number of polls before they finish
+* a hammer shim answering ``hammer`` command lines in csv, json and info output formats
+* canned answers for other commands run on the Satellite host
+
+Both the API and hammer operate on the same in-memory state, so an entity created through
+``target_sat.api`` is visible to ``target_sat.cli`` and vice versa.
+
+Usage::
+
+    with SatelliteStandin() as standin, standin.patch_hosts():
+        sat = standin.attach(Satellite(hostname=standin.hostname))
+        org = sat.cli_factory.make_org()
+        assert sat.api.Organization(id=org.id).read().name == org.name
+"""
+
+from contextlib import contextmanager
+import re
+
+from broker.helpers import Result
+
+from robottelo.utils.standin.hammer import HammerShim
+from robottelo.utils.standin.server import StandinHTTPServer
+from robottelo.utils.standin.state import StandinError, StandinState
+
+__all__ = ['SatelliteStandin', 'StandinError', 'StandinState']
+
+
+class SatelliteStandin:
+    """In-process stand-in for a Satellite API server and hammer host
+
+    :param hostname: hostname the stand-in answers SSH commands for
+    :param version: Satellite version reported by the API and ``rpm -q``
+    :param rhel_version: RHEL version reported by ``/etc/os-release``
+    :param task_polls: number of polls a foreman task stays ``running``
+    """
+
+    def __init__(
+        self, hostname='satellite.standin.test', version='6.17.0', rhel_version='9.5', task_polls=1
+    ):
+        self.hostname = hostname
+        self.version = version
+        self.state = StandinState(task_polls=task_polls)
+        self.hammer = HammerShim(self.state)
+        self.server = StandinHTTPServer(self.state, version)
+        self.commands = {
+            r'^rpm -q --qf "%\{VERSION\}"': version,
+            r'^rpm -q satellite': f'satellite-{version}-1.el{rhel_version.split(".")[0]}.noarch',
+            r'^cat /etc/os-release': (
+                f'NAME="Red Hat Enterprise Linux"\nVERSION_ID="{rhel_version}"\nID="rhel"\n'
+            ),
+            r'^cat /etc/redhat-release': f'Red Hat Enterprise Linux release {rhel_version}',
+        }
+
+    @property
+    def url(self):
+        return self.server.url
+
+    def start(self):
+        self.server.start()
+        return self
+
+    def stop(self):
+        self.server.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def execute(self, command):
+        """Answer a command run on the Satellite host
+
+        Hammer commands go to the hammer shim, commands matching a pattern in ``self.commands``
+        get the canned stdout, anything else succeeds with empty output.
+        """
+        if re.search(r'(^|\s)hammer\s', command):
+            return self.hammer.execute(command)
+        for pattern, stdout in self.commands.items():
+            if re.search(pattern, command):
+                return Result(status=0, stdout=stdout, stderr='')
+        return Result(status=0, stdout='', stderr='')
+
+    def attach(self, satellite):
+        """Point a ``Satellite`` object at the stand-in API and pre-set its remote facts"""
+        satellite.__dict__.update(url=self.url, version=self.version, is_upstream=False)
+        return satellite
+
+    @contextmanager
+    def patch_hosts(self, targets=None):
+        """Route SSH commands for ``self.hostname`` to the stand-in
+
+        :param targets: list of ``(class, attribute)`` pairs of execute methods to patch,
+            defaults to ``ContentHost.execute`` and ``ContentHost.run``
+        """
+        if targets is None:
+            from robottelo.hosts import ContentHost
+
+            targets = [(ContentHost, 'execute'), (ContentHost, 'run')]
+        originals = [(owner, attr, owner.__dict__.get(attr)) for owner, attr in targets]
+
+        def wrap(orig_execute):
+            def execute(host, command, *args, **kwargs):
+                if host.hostname == self.hostname:
+                    return self.execute(command)
+                return orig_execute(host, command, *args, **kwargs)
+
+            return execute
+
+        try:
+            for owner, attr in targets:
+                setattr(owner, attr, wrap(getattr(owner, attr)))
+            yield self
+        finally:
+            for owner, attr, orig in originals:
+                if orig is None:
+                    delattr(owner, attr)
+                else:
+                    setattr(owner, attr, orig)
@@ -0,0 +1,213 @@
+"""Execution shim answering hammer commands in hammer's csv, json and info output formats"""
+
+import csv
+import io
+import json
+import shlex
+
+from broker.helpers import Result
+
+from robottelo.utils.standin.state import RESOURCES, StandinError
+
+HAMMER_RESOURCES = {
+    'activation-key': 'activation_keys',
+    'architecture': 'architectures',
+    'content-view': 'content_views',
+    'content-view version': 'content_view_versions',
+    'domain': 'domains',
+    'host': 'hosts',
+    'host-collection': 'host_collections',
+    'hostgroup': 'hostgroups',
+    'lifecycle-environment': 'environments',
+    'location': 'locations',
+    'organization': 'organizations',
+    'os': 'operatingsystems',
+    'product': 'products',
+    'repository': 'repositories',
+    'subnet': 'subnets',
+    'sync-plan': 'sync_plans',
+    'task': 'tasks',
+    'user': 'users',
+}
+TASK_SUBCOMMANDS = {
+    'synchronize': 'Actions::Katello::Repository::Sync',
+    'publish': 'Actions::Katello::ContentView::Publish',
+    'promote': 'Actions::Katello::ContentViewVersion::Promote',
+}
+# hammer exit codes, see hammer_cli/exit_codes.rb
+HAMMER_EXIT_USAGE = 64
+HAMMER_EXIT_NOT_FOUND = 65
+_GLOBAL_OPTIONS_WITH_VALUE = ('-u', '--username', '-p', '--password', '--interactive', '--output')
+_SKIPPED_FIELDS = ('created_at', 'updated_at', 'input', 'humanized', 'polls', 'uuid')
+
+
+def _header(field):
+    return field.replace('_', ' ').title()
+
+
+def _title(resource):
+    return RESOURCES[resource][0].replace('_', ' ').capitalize()
+
+
+def parse_hammer_command(command):
+    """Split a hammer command line into output format, command words and options
+
+    :return: tuple of ``(output_format, words, options)``, None if it is not a hammer command
+    """
+    tokens = shlex.split(command)
+    if 'hammer' not in tokens:
+        return None
+    tokens = tokens[tokens.index('hammer') + 1 :]
+    output_format, words, options = None, [], {}
+    while tokens and tokens[0].startswith('-'):
+        token = tokens.pop(0)
+        name, _, value = token.partition('=')
+        if name in _GLOBAL_OPTIONS_WITH_VALUE and not value:
+            value = tokens.pop(0)
+        if name == '--output':
+            output_format = value
+    while tokens and not tokens[0].startswith('-'):
+        words.append(tokens.pop(0))
+    for token in tokens:
+        if not token.startswith('--'):
+            continue
+        name, sep, value = token[2:].partition('=')
+        options[name.replace('-', '_')] = value if sep else True
+    return output_format, words, options
+
+
+def _scalar_fields(entity):
+    return {
+        key: value
+        for key, value in entity.items()
+        if key not in _SKIPPED_FIELDS and not isinstance(value, dict | list)
+    }
+
+
+def format_records(records, output_format):
+    """Render entities as hammer renders a list"""
+    if output_format == 'json':
+        return json.dumps(
+            [{_header(k): v for k, v in _scalar_fields(r).items()} for r in records], indent=2
+        )
+    fields = []
+    for record in records:
+        fields.extend(key for key in _scalar_fields(record) if key not in fields)
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow([_header(field) for field in fields])
+    for record in records:
+        writer.writerow([record.get(field, '') for field in fields])
+    return out.getvalue()
+
+
+def format_record(record, output_format):
+    """Render a single entity as hammer renders an ``info`` command"""
+    if output_format == 'json':
+        return json.dumps({_header(k): v for k, v in _scalar_fields(record).items()}, indent=2)
+    if output_format == 'csv':
+        return format_records([record], output_format)
+    lines = []
+    for key, value in record.items():
+        if key in _SKIPPED_FIELDS or isinstance(value, list):
+            continue
+        if isinstance(value, dict):
+            lines.append(f'{_header(key)}:')
+            lines.extend(f'    {_header(k)}: {v}' for k, v in value.items())
+        else:
+            lines.append(f'{_header(key)}: {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def format_message(message, record, output_format):
+    """Render the message hammer prints after create, update and delete"""
+    if output_format == 'csv':
+        return format_records(
+            [{'message': message, 'id': record['id'], 'name': record.get('name', '')}], 'csv'
+        )
+    if output_format == 'json':
+        return json.dumps({'Message': message, 'Id': record['id'], 'Name': record.get('name')})
+    return f'{message}\n'
+
+
+class HammerShim:
+    """Answer hammer command lines from a ``StandinState``
+
+    :param state: the ``StandinState`` shared with the stand-in API server
+    """
+
+    def __init__(self, state):
+        self.state = state
+
+    def _lookup(self, resource, options):
+        if 'id' in options:
+            return self.state.read(resource, options['id'])
+        if 'name' in options:
+            return self.state.find(resource, options['name'])
+        raise StandinError(
+            HAMMER_EXIT_USAGE, 'Error: At least one of options --id, --name is required.'
+        )
+
+    def _run(self, output_format, words, options):
+        if words == ['ping']:
+            return 'database:\n    Status:          ok\n'
+        if len(words) < 2:
+            raise StandinError(HAMMER_EXIT_USAGE, f'Error: unknown command {" ".join(words)}')
+        entity, sub = ' '.join(words[:-1]), words[-1]
+        if entity not in HAMMER_RESOURCES:
+            raise StandinError(HAMMER_EXIT_USAGE, f'Error: unknown command {entity}')
+        resource = HAMMER_RESOURCES[entity]
+        options.pop('per_page', None)
+        if resource == 'tasks':
+            return self._task(sub, output_format, options)
+        if sub == 'create':
+            record = self.state.create(resource, options)
+            return format_message(f'{_title(resource)} created.', record, output_format)
+        if sub == 'info':
+            return format_record(self._lookup(resource, options), output_format)
+        if sub == 'list':
+            search = options.pop('search', None)
+            options.pop('order', None)
+            filters = {key: value for key, value in options.items() if key.endswith('_id')}
+            return format_records(self.state.search(resource, search, filters), output_format)
+        if sub == 'update':
+            record = self._lookup(resource, options)
+            if 'new_name' in options:
+                options['name'] = options.pop('new_name')
+            record = self.state.update(resource, record['id'], options)
+            return format_message(f'{_title(resource)} updated.', record, output_format)
+        if sub == 'delete':
+            record = self.state.delete(resource, self._lookup(resource, options)['id'])
+            return format_message(f'{_title(resource)} deleted.', record, output_format)
+        if sub in TASK_SUBCOMMANDS:
+            record = self._lookup(resource, options)
+            task = self.state.create_task(TASK_SUBCOMMANDS[sub], {RESOURCES[resource][0]: record})
+            if options.get('async'):
+                return f'Task {task["id"]} running\n'
+            while task['pending']:
+                task = self.state.read_task(task['id'])
+            return f'Task {task["id"]} {task["result"]}: 100%\n'
+        raise StandinError(HAMMER_EXIT_USAGE, f'Error: unknown command {entity} {sub}')
+
+    def _task(self, sub, output_format, options):
+        if sub == 'list':
+            return format_records(self.state.search_tasks(options.get('search')), output_format)
+        if sub in ('info', 'progress'):
+            task = self.state.read_task(options['id'])
+            while sub == 'progress' and task['pending']:
+                task = self.state.read_task(options['id'])
+            return format_record(task, output_format)
+        raise StandinError(HAMMER_EXIT_USAGE, f'Error: unknown command task {sub}')
+
+    def execute(self, command):
+        """Run a hammer command line and return a ``Result`` like ``ContentHost.execute``"""
+        parsed = parse_hammer_command(command)
+        if parsed is None:
+            return Result(status=127, stdout='', stderr=f'not a hammer command: {command}')
+        try:
+            stdout = self._run(*parsed)
+        except StandinError as err:
+            status = HAMMER_EXIT_NOT_FOUND if err.status == 404 else err.status
+            message = str(err) if str(err).startswith('Error') else f'Error: {err}'
+            return Result(status=status, stdout='', stderr=f'{message}\n')
+        return Result(status=0, stdout=stdout, stderr='')
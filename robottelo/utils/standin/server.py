@@ -0,0 +1,163 @@
+"""HTTP server emulating a subset of the Foreman and Katello v2 API"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+from threading import Thread
+from urllib.parse import parse_qsl, urlsplit
+
+from robottelo.utils.standin.state import RESOURCES, StandinError
+
+# actions answered with a foreman task, as Katello does for long running operations
+TASK_ACTIONS = {
+    'sync': 'Actions::Katello::Repository::Sync',
+    'publish': 'Actions::Katello::ContentView::Publish',
+    'promote': 'Actions::Katello::ContentViewVersion::Promote',
+}
+_API_PATH = re.compile(
+    r'^/(?:katello/)?api(?:/v2)?/(?P<resource>\w+)(?:/(?P<id>[^/]+))?(?:/(?P<action>\w+))?/?$'
+)
+_TASK_PATH = re.compile(r'^/foreman_tasks/api/tasks(?:/(?P<id>[^/]+))?/?$')
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """Translate API requests into operations on the server's ``StandinState``"""
+
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        """Do not write the access log to stderr"""
+
+    def _params(self):
+        """Return the query string merged with the JSON body, nailgun sends GET data as body"""
+        params = dict(parse_qsl(urlsplit(self.path).query))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            body = self.rfile.read(length)
+            try:
+                data = json.loads(body)
+            except ValueError:
+                data = dict(parse_qsl(body.decode()))
+            if isinstance(data, dict):
+                params.update(data)
+        return params
+
+    def _respond(self, status, data):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _fields(self, resource, params):
+        """Return entity fields, unwrapping ``{'<singular>': {...}}`` payloads"""
+        singular = RESOURCES[resource][0]
+        fields = dict(params)
+        if isinstance(fields.get(singular), dict):
+            fields.update(fields.pop(singular))
+        return fields
+
+    def _list(self, resource, params):
+        filters = {key: value for key, value in params.items() if key.endswith('_id')}
+        results = self.state.search(resource, params.get('search'), filters)
+        page = int(params.get('page', 1))
+        per_page = int(params.get('per_page', 20))
+        return {
+            'total': len(results),
+            'subtotal': len(results),
+            'page': page,
+            'per_page': per_page,
+            'search': params.get('search'),
+            'results': results[(page - 1) * per_page : page * per_page],
+        }
+
+    def _dispatch(self, method):
+        path = urlsplit(self.path).path
+        params = self._params()
+        if path in ('/api/status', '/api/v2/status'):
+            return 200, {'result': 'ok', 'version': self.server.version, 'api_version': 2}
+        if path in ('/api/ping', '/api/v2/ping', '/katello/api/v2/ping'):
+            return 200, {'status': 'ok', 'services': {}}
+        if match := _TASK_PATH.match(path):
+            if match['id']:
+                return 200, self.state.read_task(match['id'])
+            results = self.state.search_tasks(params.get('search'))
+            return 200, {'total': len(results), 'subtotal': len(results), 'results': results}
+        if not (match := _API_PATH.match(path)):
+            raise StandinError(404, f'Route {method} {path} not found')
+        resource = self.state.resource(match['resource'])
+        entity_id, action = match['id'], match['action']
+        if action:
+            entity = self.state.read(resource, entity_id)
+            if action not in TASK_ACTIONS:
+                raise StandinError(404, f'Action {action} of {resource} not found')
+            task = self.state.create_task(
+                TASK_ACTIONS[action], {RESOURCES[resource][0]: entity, **params}
+            )
+            return 202, task
+        if entity_id is None:
+            if method == 'GET':
+                return 200, self._list(resource, params)
+            if method == 'POST':
+                return 201, self.state.create(resource, self._fields(resource, params))
+        elif method == 'GET':
+            return 200, self.state.read(resource, entity_id)
+        elif method == 'PUT':
+            return 200, self.state.update(resource, entity_id, self._fields(resource, params))
+        elif method == 'DELETE':
+            return 200, self.state.delete(resource, entity_id)
+        raise StandinError(405, f'Method {method} not allowed for {path}')
+
+    def _handle(self, method):
+        try:
+            status, data = self._dispatch(method)
+        except StandinError as err:
+            status, data = err.status, {'error': {'message': str(err)}}
+        self._respond(status, data)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class StandinHTTPServer(ThreadingHTTPServer):
+    """Threaded localhost server serving the stand-in API from a background thread
+
+    :param state: the ``StandinState`` the API operates on
+    :param version: the Satellite version reported by ``/api/status``
+    :param port: port to listen on, a free port is picked by default
+    """
+
+    daemon_threads = True
+
+    def __init__(self, state, version, port=0):
+        self.state = state
+        self.version = version
+        super().__init__(('127.0.0.1', port), StandinRequestHandler)
+        self._thread = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def start(self):
+        self._thread = Thread(target=self.serve_forever, name='satellite-standin', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
@@ -0,0 +1,219 @@
+"""In-memory entity store shared by the stand-in API server and hammer shim"""
+
+from datetime import UTC, datetime
+import re
+from threading import RLock
+from uuid import uuid4
+
+# resource name: (singular name used in payloads and messages, field holding the entity name)
+RESOURCES = {
+    'activation_keys': ('activation_key', 'name'),
+    'architectures': ('architecture', 'name'),
+    'content_view_versions': ('content_view_version', 'name'),
+    'content_views': ('content_view', 'name'),
+    'domains': ('domain', 'name'),
+    'environments': ('environment', 'name'),
+    'host_collections': ('host_collection', 'name'),
+    'hostgroups': ('hostgroup', 'name'),
+    'hosts': ('host', 'name'),
+    'locations': ('location', 'name'),
+    'operatingsystems': ('operatingsystem', 'name'),
+    'organizations': ('organization', 'name'),
+    'products': ('product', 'name'),
+    'repositories': ('repository', 'name'),
+    'subnets': ('subnet', 'name'),
+    'sync_plans': ('sync_plan', 'name'),
+    'tasks': ('task', 'label'),
+    'users': ('user', 'login'),
+}
+RESOURCE_ALIASES = {'lifecycle_environments': 'environments'}
+TASK_ACTIVE_STATES = ('planning', 'planned', 'running')
+_SEARCH_TERM = re.compile(r'(\w+)\s*(=|~)\s*(?:"([^"]*)"|\'([^\']*)\'|(\S+))')
+
+
+class StandinError(Exception):
+    """Raised for requests the stand-in cannot serve, carries an HTTP status code"""
+
+    def __init__(self, status, message):
+        self.status = status
+        super().__init__(message)
+
+
+def _now():
+    return datetime.now(UTC).strftime('%Y-%m-%d %H:%M:%S UTC')
+
+
+def _label(name):
+    return re.sub(r'\W', '_', str(name))
+
+
+def _coerce(fields):
+    """Drop unset fields and turn numeric ``*_id`` values sent as strings by hammer into ints"""
+    return {
+        key: int(value) if key.endswith('_id') and str(value).isdigit() else value
+        for key, value in fields.items()
+        if value is not None
+    }
+
+
+class StandinState:
+    """Thread safe store of Foreman/Katello entities
+
+    :param task_polls: number of reads a task stays ``running`` before it is ``stopped``
+    """
+
+    def __init__(self, task_polls=1):
+        self.task_polls = task_polls
+        self._lock = RLock()
+        self._entities = {name: {} for name in RESOURCES}
+        self._next_id = 1
+
+    @staticmethod
+    def resource(name):
+        """Return the canonical resource name, raise a 404 StandinError if unknown"""
+        name = RESOURCE_ALIASES.get(name, name)
+        if name not in RESOURCES:
+            raise StandinError(404, f'Resource {name} not found')
+        return name
+
+    def _expand(self, entity):
+        """Add the nested ``{'id', 'name'}`` references Foreman returns for ``*_id`` fields"""
+        expanded = dict(entity)
+        for field, value in entity.items():
+            ref = field[: -len('_id')]
+            if not field.endswith('_id') or ref in entity:
+                continue
+            for resource, (singular, name_field) in RESOURCES.items():
+                if singular == ref and value in self._entities[resource]:
+                    referenced = self._entities[resource][value]
+                    expanded[ref] = {'id': value, 'name': referenced.get(name_field)}
+        return expanded
+
+    def create(self, resource, fields):
+        """Create an entity and return it"""
+        resource = self.resource(resource)
+        with self._lock:
+            entity_id = self._next_id
+            self._next_id += 1
+            entity = {'id': entity_id}
+            entity.update(_coerce(fields))
+            entity['id'] = entity_id
+            if RESOURCES[resource][1] == 'name' and 'name' in entity:
+                entity.setdefault('label', _label(entity['name']))
+            entity.update(created_at=_now(), updated_at=_now())
+            self._entities[resource][entity_id] = entity
+            return self._expand(entity)
+
+    def _get(self, resource, entity_id):
+        try:
+            return self._entities[resource][int(entity_id)]
+        except (KeyError, ValueError) as err:
+            singular = RESOURCES[resource][0]
+            raise StandinError(404, f'{singular} with id {entity_id} not found') from err
+
+    def read(self, resource, entity_id):
+        """Return a single entity"""
+        resource = self.resource(resource)
+        with self._lock:
+            return self._expand(self._get(resource, entity_id))
+
+    def find(self, resource, name):
+        """Return the entity of ``resource`` with the given name"""
+        resource = self.resource(resource)
+        name_field = RESOURCES[resource][1]
+        with self._lock:
+            for entity in self._entities[resource].values():
+                if str(entity.get(name_field)) == str(name):
+                    return self._expand(entity)
+        raise StandinError(404, f'{RESOURCES[resource][0]} {name} not found')
+
+    def update(self, resource, entity_id, fields):
+        """Update an entity and return it"""
+        resource = self.resource(resource)
+        with self._lock:
+            entity = self._get(resource, entity_id)
+            entity.update({key: value for key, value in _coerce(fields).items() if key != 'id'})
+            entity['updated_at'] = _now()
+            return self._expand(entity)
+
+    def delete(self, resource, entity_id):
+        """Delete an entity and return it"""
+        resource = self.resource(resource)
+        with self._lock:
+            entity = self._get(resource, entity_id)
+            del self._entities[resource][entity['id']]
+            return self._expand(entity)
+
+    def search(self, resource, search=None, filters=None):
+        """Return entities matching a simple ``field=value and field~value`` search and filters"""
+        resource = self.resource(resource)
+        terms = [
+            (field, op, next((v for v in values if v), ''))
+            for field, op, *values in _SEARCH_TERM.findall(search or '')
+        ]
+        filters = {key: str(value) for key, value in (filters or {}).items()}
+        with self._lock:
+            results = []
+            for entity in self._entities[resource].values():
+                if any(str(entity.get(key)) != value for key, value in filters.items()):
+                    continue
+                if all(
+                    (str(entity.get(field)) == value)
+                    if op == '='
+                    else (value.lower() in str(entity.get(field, '')).lower())
+                    for field, op, value in terms
+                ):
+                    results.append(self._expand(entity))
+            return results
+
+    def create_task(self, label, input_data=None):
+        """Create a foreman task that completes after ``task_polls`` reads"""
+        with self._lock:
+            task = self.create(
+                'tasks',
+                {
+                    'label': label,
+                    'state': 'planned',
+                    'result': 'pending',
+                    'progress': 0.0,
+                    'input': input_data or {},
+                    'humanized': {'action': label, 'errors': []},
+                },
+            )
+            stored = self._entities['tasks'][task['id']]
+            # foreman tasks are identified by uuid, keep the numeric key for storage
+            stored['uuid'] = str(uuid4())
+            stored['polls'] = 0
+            return self._task_view(stored)
+
+    def _advance_task(self, task):
+        if task['state'] not in TASK_ACTIVE_STATES:
+            return
+        task['polls'] += 1
+        if task['polls'] > self.task_polls:
+            task.update(state='stopped', result='success', progress=1.0, ended_at=_now())
+        else:
+            task.update(state='running', progress=task['polls'] / (self.task_polls + 1))
+
+    @staticmethod
+    def _task_view(task):
+        view = {key: value for key, value in task.items() if key not in ('uuid', 'polls')}
+        view.update(id=task['uuid'], pending=task['state'] in TASK_ACTIVE_STATES)
+        return view
+
+    def read_task(self, task_uuid):
+        """Return a task by its uuid, advancing its state"""
+        with self._lock:
+            for task in self._entities['tasks'].values():
+                if task['uuid'] == task_uuid:
+                    self._advance_task(task)
+                    return self._task_view(task)
+        raise StandinError(404, f'task with id {task_uuid} not found')
+
+    def search_tasks(self, search=None):
+        """Return tasks matching ``search``"""
+        with self._lock:
+            return [
+                self._task_view(self._entities['tasks'][task['id']])
+                for task in self.search('tasks', search)
+            ]
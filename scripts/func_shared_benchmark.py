@@ -0,0 +1,83 @@
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "click",
+# ]
+# ///
+"""Compare the contention of the file and sqlite func_shared storage handlers
+
+Every process increments shared counters, each under its key lock, like shared functions read and
+write their stored results. All processes start together to contend for the same keys.
+
+Usage:
+    python scripts/func_shared_benchmark.py --processes 16 --keys 200 --rounds 5
+"""
+
+import multiprocessing
+from pathlib import Path
+import tempfile
+import time
+
+import click
+
+from robottelo.utils.decorators.func_shared.file_storage import FileStorageHandler
+from robottelo.utils.decorators.func_shared.sqlite_storage import SqliteStorageHandler
+
+
+def make_handler(name, root_dir):
+    if name == 'file':
+        return FileStorageHandler(root_dir=str(root_dir))
+    return SqliteStorageHandler(db_path=str(root_dir / 'shared_functions.db'))
+
+
+def increment(name, root_dir, keys, rounds, start):
+    handler = make_handler(name, root_dir)
+    start.wait()
+    for _ in range(rounds):
+        for index in range(keys):
+            key = f'shared_function_{index}'
+            with handler.lock(key) as data:
+                handler.when_lock_acquired(data)
+                handler.set(key, (handler.get(key) or 0) + 1)
+
+
+def run(name, processes, keys, rounds):
+    ctx = multiprocessing.get_context('fork')
+    with tempfile.TemporaryDirectory() as root_dir:
+        root_dir = Path(root_dir)
+        start = ctx.Event()
+        workers = [
+            ctx.Process(target=increment, args=(name, root_dir, keys, rounds, start))
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        started = time.perf_counter()
+        start.set()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        handler = make_handler(name, root_dir)
+        if any(
+            handler.get(f'shared_function_{index}') != processes * rounds for index in range(keys)
+        ):
+            raise click.ClickException(f'{name} handler lost updates')
+    return elapsed
+
+
+@click.command()
+@click.option('--processes', default=16, help='Number of contending processes')
+@click.option('--keys', default=200, help='Number of shared function keys')
+@click.option('--rounds', default=5, help='Increments of every key per process')
+def benchmark(processes, keys, rounds):
+    operations = processes * keys * rounds
+    for name in ('file', 'sqlite'):
+        elapsed = run(name, processes, keys, rounds)
+        click.echo(
+            f'{name:6}: {elapsed:6.2f}s for {operations} locked updates, '
+            f'{operations / elapsed:8.0f} per second'
+        )
+
+
+if __name__ == '__main__':
+    benchmark()
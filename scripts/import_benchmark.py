@@ -0,0 +1,81 @@
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "click",
+# ]
+# ///
+"""Measure how long importing a robottelo module takes in a fresh interpreter
+
+Usage:
+    python scripts/import_benchmark.py robottelo.hosts --runs 5 --top 15
+"""
+
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+
+import click
+
+ROBOTTELO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _importtime(code):
+    """Run ``code`` in a fresh interpreter and return its ``-X importtime`` records
+
+    :return: list of ``(depth, module, cumulative seconds)`` tuples
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROBOTTELO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumul, name = line[len('import time:') :].split('|')
+        # importtime indents nested imports by two spaces per level
+        records.append(((len(name) - len(name.lstrip()) - 1) // 2, name.strip(), int(cumul) / 1e6))
+    return records
+
+
+def import_time(module):
+    """Import ``module`` in a fresh interpreter, ignoring the interpreter startup imports
+
+    :return: tuple of the total import time in seconds and a dict mapping the modules imported
+        directly by the statement or one level below to their cumulative import time in seconds
+    """
+    startup = {name for depth, name, _ in _importtime('pass') if depth == 0}
+    total, cumulative = 0.0, {}
+    for depth, name, seconds in _importtime(f'import {module}'):
+        if depth == 0 and name in startup:
+            continue
+        if depth == 0:
+            total += seconds
+        if depth <= 1:
+            cumulative[name] = seconds
+    return total, cumulative
+
+
+@click.command()
+@click.argument('module', default='robottelo.hosts')
+@click.option('--runs', default=5, show_default=True, help='Number of fresh imports to time.')
+@click.option('--top', default=10, show_default=True, help='Number of slowest modules to list.')
+def import_benchmark(module, runs, top):
+    """Report the median import time of MODULE and its slowest imports."""
+    timings = [import_time(module) for _ in range(runs)]
+    totals = [total for total, _ in timings]
+    click.echo(
+        f'import {module}: median {statistics.median(totals):.3f}s, '
+        f'min {min(totals):.3f}s, max {max(totals):.3f}s over {runs} runs'
+    )
+    _, cumulative = timings[-1]
+    for name, seconds in sorted(cumulative.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        click.echo(f'  {seconds:8.3f}s  {name}')
+
+
+if __name__ == '__main__':
+    import_benchmark()
@@ -0,0 +1,71 @@
+# /// script
+# requires-python = ">=3.11"
+# dependencies = [
+#     "click",
+# ]
+# ///
+"""Compare the compiled Jira field extractors with the former per field ``eval``
+
+The issues of a Jira search response are repeated up to the requested number of issues and
+sanitized with both implementations, which must return the same data.
+
+Usage:
+    python scripts/jira_fields_benchmark.py --issues 5000 --runs 5
+"""
+
+import json
+from pathlib import Path
+import statistics
+import time
+
+import click
+
+from robottelo.utils.issue_handlers.jira import mapped_response_fields, sanitized_issue_data
+
+ROBOTTELO_ROOT = Path(__file__).resolve().parent.parent
+SEARCH_RESPONSE = ROBOTTELO_ROOT / 'tests/robottelo/data/jira_search_response.json'
+EVAL_FIELDS = {
+    'key': "{obj_name}['key']",
+    'summary': "{obj_name}['fields']['summary']",
+    'status': "{obj_name}['fields']['status']['name']",
+    'labels': "{obj_name}['fields']['labels']",
+    'resolution': "{obj_name}['fields']['resolution']['name'] "
+    "if {obj_name}['fields']['resolution'] else ''",
+    'fixVersions': "[ver['name'] for ver in {obj_name}['fields']['fixVersions']] "
+    "if {obj_name}['fields']['fixVersions'] else []",
+    'customfield_12313440': "{obj_name}['fields']['customfield_12313440']",
+}
+
+
+def eval_issue_data(issue, out_fields):
+    return {field: eval(EVAL_FIELDS[field].format(obj_name=issue)) for field in out_fields}
+
+
+def _timed(func, issues, fields, runs):
+    timings, result = [], None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = [func(issue, fields) for issue in issues]
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+@click.command()
+@click.option('--response', type=click.Path(exists=True), default=str(SEARCH_RESPONSE))
+@click.option('--issues', default=5000, help='Number of issues to sanitize per run')
+@click.option('--runs', default=5, help='Runs per implementation, the median is reported')
+def benchmark(response, issues, runs):
+    recorded = json.loads(Path(response).read_text())['issues']
+    sample = (recorded * (issues // len(recorded) + 1))[:issues]
+    fields = list(mapped_response_fields)
+    eval_time, expected = _timed(eval_issue_data, sample, fields, runs)
+    compiled_time, result = _timed(sanitized_issue_data, sample, fields, runs)
+    if result != expected:
+        raise click.ClickException('Compiled extractors and eval returned different data')
+    click.echo(f'eval:     {eval_time * 1000:8.1f} ms for {issues} issues')
+    click.echo(f'compiled: {compiled_time * 1000:8.1f} ms for {issues} issues')
+    click.echo(f'speedup:  {eval_time / compiled_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -4,12 +4,13 @@
 #     "click",
 # ]
 # ///
+from datetime import datetime
 from pathlib import Path
 import re
 
 import click
 
-from robottelo.utils.issue_handlers.jira import get_data_jira, jira_cache
+from robottelo.utils.issue_handlers.jira import get_data_jira, jira_cache, sync_jira_cache
 
 # Regex patterns to find Jira issues in docstrings
 JIRA_PATTERNS = [
@@ -21,7 +22,13 @@ JIRA_PATTERNS = [
 @click.command()
 @click.argument('tests_dir', type=click.Path(exists=True, file_okay=False))
 @click.option('--fresh', is_flag=True, help='Ignore existing cache and fetch all issue data.')
-def populate_jira_cache(tests_dir, fresh):
+@click.option(
+    '--delta',
+    is_flag=True,
+    help='Refresh the cached issues updated in Jira since the last delta sync, '
+    'and fetch the issues which are not cached.',
+)
+def populate_jira_cache(tests_dir, fresh, delta):
     """Scan test files for Jira issues and populate the Jira cache."""
 
     def extract_jira_issues_from_file(file_path):
@@ -54,6 +61,16 @@ def populate_jira_cache(tests_dir, fresh):
 
     click.echo(f"Found {len(issues)} unique Jira issues")
 
+    if delta:
+        last_sync = jira_cache.last_sync
+        since = (
+            datetime.fromtimestamp(last_sync).isoformat(timespec='seconds') if last_sync else None
+        )
+        click.echo(f"Syncing issues updated since the last sync: {since or 'never'}...")
+        refreshed = sync_jira_cache(list(issues))
+        click.echo(f"Cache updated with {len(refreshed)} issues")
+        return
+
     if fresh:
         click.echo("Fresh mode enabled. Fetching all issues regardless of cache status...")
         new_issues = issues
@@ -71,10 +88,7 @@ def populate_jira_cache(tests_dir, fresh):
     jira_data = get_data_jira(list(new_issues))
 
     # Update cache with new data
-    for issue in jira_data:
-        jira_cache.update(issue['key'], issue)
-
-    jira_cache.save()
+    jira_cache.update_many({issue['key']: issue for issue in jira_data})
     click.echo(f"Cache updated with {len(jira_data)} issues")
 
 
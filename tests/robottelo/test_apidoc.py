@@ -0,0 +1,80 @@
+from pathlib import Path
+
+import pytest
+
+from robottelo.utils.apidoc import ApidocCache, LazyResources
+
+APIDOC = {
+    'docs': {
+        'name': 'Foreman',
+        'api_url': '/api',
+        'resources': {
+            'architectures': {'name': 'Architectures', 'methods': [{'name': 'index'}]},
+            'capsule_content': {'name': 'Capsule content', 'methods': [{'name': 'sync'}]},
+        },
+    }
+}
+
+
+class FakeApi:
+    """Stand-in for apypie.Api that counts apidoc downloads"""
+
+    downloads = 0
+
+    def __init__(self, apidoc_cache_dir):
+        self.apidoc_cache_dir = apidoc_cache_dir
+        self.apidoc_cache_name = 'abc123'
+
+    @property
+    def apidoc(self):
+        FakeApi.downloads += 1
+        return APIDOC
+
+
+@pytest.fixture
+def apidoc_cache(tmp_path):
+    FakeApi.downloads = 0
+    return ApidocCache(tmp_path, 'sat.example.com', '6.17.0')
+
+
+def test_apidoc_cache_download_once(apidoc_cache):
+    """The apidoc is downloaded on the first load only and restored from disk afterwards"""
+    assert apidoc_cache.checksum is None
+    first = apidoc_cache.load(FakeApi)
+    assert apidoc_cache.checksum == 'abc123'
+    second = ApidocCache(apidoc_cache.version_dir.parent.parent, 'sat.example.com', '6.17.0').load(
+        FakeApi
+    )
+    assert FakeApi.downloads == 1
+    for apidoc in (first, second):
+        assert apidoc['docs']['name'] == 'Foreman'
+        assert dict(apidoc['docs']['resources']) == APIDOC['docs']['resources']
+
+
+def test_apidoc_cache_lazy_resources(apidoc_cache):
+    """Resources are parsed only when accessed"""
+    resources = apidoc_cache.load(FakeApi)['docs']['resources']
+    assert isinstance(resources, LazyResources)
+    assert sorted(resources) == ['architectures', 'capsule_content']
+    assert 'capsule_content' in resources
+    assert not resources._loaded
+    assert resources['capsule_content']['methods'] == [{'name': 'sync'}]
+    assert list(resources._loaded) == ['capsule_content']
+    with pytest.raises(KeyError):
+        resources['hosts']
+
+
+def test_apidoc_cache_keyed_by_version(apidoc_cache, tmp_path):
+    """A different Satellite version does not reuse the cached apidoc"""
+    apidoc_cache.load(FakeApi)
+    ApidocCache(tmp_path, 'sat.example.com', '6.18.0').load(FakeApi)
+    assert FakeApi.downloads == 2
+
+
+def test_apidoc_cache_invalidate(apidoc_cache):
+    """Invalidated entries are downloaded again"""
+    apidoc_cache.load(FakeApi)
+    apidoc_cache.invalidate()
+    assert not Path(apidoc_cache.version_dir).exists()
+    apidoc_cache.load(FakeApi)
+    assert FakeApi.downloads == 2
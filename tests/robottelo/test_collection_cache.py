@@ -0,0 +1,62 @@
+import os
+import subprocess
+import sys
+
+from robottelo.logging import robottelo_root_dir
+
+CONFTEST = '''
+pytest_plugins = ['pytest_plugins.collection_pipeline', 'pytest_plugins.collection_cache']
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'tier1: tier1')
+'''
+TEST_MODULE = '''
+import pytest
+
+print('imported {name}')
+
+
+@pytest.mark.tier1
+@pytest.mark.parametrize('value', [1, 2])
+def test_{name}(value):
+    pass
+
+
+def test_{name}_untiered():
+    pass
+'''
+
+
+def collect(path, *args):
+    result = subprocess.run(
+        [sys.executable, '-m', 'pytest', '--collect-only', '-q', '-s', '--collection-cache', *args],
+        cwd=path,
+        env={**os.environ, 'PYTHONPATH': str(robottelo_root_dir)},
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout
+
+
+def test_collection_cache(tmp_path):
+    """Unchanged test files are restored from the cache without being imported"""
+    (tmp_path / 'conftest.py').write_text(CONFTEST)
+    for name in ('first', 'second'):
+        (tmp_path / f'test_{name}.py').write_text(TEST_MODULE.format(name=name))
+    output = collect(tmp_path, '-m', 'tier1')
+    assert 'imported first' in output
+    assert 'imported second' in output
+    assert '4/6 tests collected (2 deselected)' in output
+
+    (tmp_path / 'test_second.py').write_text(TEST_MODULE.format(name='second') + '\n# changed')
+    output = collect(tmp_path, '-m', 'tier1')
+    assert 'imported first' not in output
+    assert 'imported second' in output
+    assert 'test_first.py::test_first[1]' in output
+    assert '4/6 tests collected (2 deselected)' in output
+
+    # the cache depends on the arguments, another marker expression collects everything again
+    output = collect(tmp_path, '-m', 'not tier1')
+    assert 'imported first' in output
+    assert '2/6 tests collected (4 deselected)' in output
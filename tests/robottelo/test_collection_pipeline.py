@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_plugins.collection_pipeline import FIRST, LAST, CollectionPipeline
+
+
+class FakeItem:
+    def __init__(self, name, *markers):
+        self.nodeid = f'tests/foreman/api/test_fake.py::{name}'
+        self.markers = list(markers)
+
+    def iter_markers(self, name=None):
+        return (m for m in reversed(self.markers) if name is None or m.name == name)
+
+    def add_marker(self, marker):
+        if isinstance(marker, str):
+            marker = getattr(pytest.mark, marker)
+        self.markers.append(marker.mark)
+
+
+@pytest.fixture
+def config():
+    deselected = []
+    return SimpleNamespace(
+        deselected=deselected,
+        hook=SimpleNamespace(pytest_deselected=lambda items: deselected.extend(items)),
+    )
+
+
+def test_pipeline_single_pass(config):
+    """Stages run in order over each item once, with one pytest_deselected call"""
+    items = [
+        FakeItem('test_one', pytest.mark.tier1.mark),
+        FakeItem('test_two', pytest.mark.tier2.mark),
+        FakeItem('test_three', pytest.mark.tier1.mark),
+    ]
+    calls = []
+
+    def annotate(config, items):
+        def check(item, record):
+            calls.append(('annotate', item.nodeid))
+            record.add_marker(pytest.mark.component('Repositories'))
+
+        return check
+
+    def filter_tier(config, items):
+        def check(item, record):
+            calls.append(('filter', item.nodeid))
+            assert record.closest('component').args == ('Repositories',)
+            return None if 'tier1' in record.names else 'not tier1'
+
+        return check
+
+    pipeline = CollectionPipeline()
+    pipeline.register('filter', filter_tier, order=20)
+    pipeline.register('annotate', annotate, order=10)
+    pipeline.register('inactive', lambda config, items: None)
+    pipeline.run(FIRST, items, config)
+    assert [item.nodeid.split('::')[1] for item in items] == ['test_one', 'test_three']
+    assert [item.nodeid.split('::')[1] for item in config.deselected] == ['test_two']
+    # both stages of the fused pass see an item before the next item is processed
+    assert [name for name, _ in calls] == ['annotate', 'filter'] * 3
+
+
+def test_pipeline_collection_stage(config):
+    """Collection stages get the items selected so far and decide their order"""
+    items = [FakeItem(f'test_{n}') for n in range(5)]
+    pipeline = CollectionPipeline()
+    pipeline.register(
+        'drop_first',
+        lambda config, items: lambda item, record: 'first' if item is items[0] else None,
+        phase=LAST,
+    )
+    pipeline.register_collection(
+        'reverse', lambda config, items: list(reversed(items[1:])), phase=LAST, order=10
+    )
+    pipeline.run(FIRST, items, config)
+    assert len(items) == 5
+    pipeline.run(LAST, items, config)
+    assert [item.nodeid[-6:] for item in items] == ['test_4', 'test_3', 'test_2']
+    assert [item.nodeid[-6:] for item in config.deselected] == ['test_0', 'test_1']
@@ -0,0 +1,161 @@
+from pathlib import Path
+import shutil
+import stat
+import sys
+
+from dynaconf import Validator
+from dynaconf.validator import ValidationError
+import pytest
+
+from robottelo.config import LazyValidatedSettings, _ConfigureOnImport, snapshot
+from robottelo.config.snapshot import (
+    read_snapshot,
+    settings_digest,
+    snapshot_path,
+    write_snapshot,
+)
+from robottelo.logging import robottelo_root_dir
+
+SETTINGS_YAML = '''
+server:
+  hostname: sat.example.com
+ldap:
+  hostname: ldap.example.com
+robottelo:
+  settings:
+    ignore_validation_errors: {ignore}
+'''
+
+
+def lazy_settings(path, ignore=False):
+    path.joinpath('settings.yaml').write_text(SETTINGS_YAML.format(ignore=str(ignore).lower()))
+    settings = LazyValidatedSettings(
+        core_loaders=['YAML'],
+        root_path=str(path),
+        settings_file='settings.yaml',
+        envless_mode=True,
+        lowercase_read=True,
+    )
+    settings.register_validators(
+        {
+            'server': [Validator('server.port', default=443)],
+            'http_proxy': [
+                Validator(
+                    'http_proxy.url',
+                    default='http://proxy',
+                    when=Validator('server.port', eq=443),
+                )
+            ],
+            'ldap': [Validator('ldap.username', must_exist=True)],
+        }
+    )
+    return settings
+
+
+def test_sections_validated_on_first_access(tmp_path):
+    """Each section is validated, and gets its defaults, only when it is first read"""
+    settings = lazy_settings(tmp_path)
+    assert set(settings._pending_validators) == {'server', 'http_proxy', 'ldap'}
+    assert settings.server.port == 443
+    assert set(settings._pending_validators) == {'http_proxy', 'ldap'}
+    assert settings.get('http_proxy.url') == 'http://proxy'
+    assert set(settings._pending_validators) == {'ldap'}
+
+
+def test_invalid_section_raises_on_every_access(tmp_path):
+    """A failing section raises the dynaconf ValidationError each time it is read"""
+    settings = lazy_settings(tmp_path)
+    for _ in range(2):
+        with pytest.raises(ValidationError, match='ldap.username'):
+            settings.ldap  # noqa: B018
+    assert settings.server.hostname == 'sat.example.com'
+
+
+def test_invalid_section_ignored(tmp_path):
+    """Validation errors only warn when robottelo.settings.ignore_validation_errors is set"""
+    settings = lazy_settings(tmp_path, ignore=True)
+    assert settings['ldap'].hostname == 'ldap.example.com'
+    settings.validate_all()
+    assert not settings._pending_validators
+
+
+def test_settings_digest_tracks_inputs(tmp_path):
+    """The snapshot digest changes with the settings files and ROBOTTELO_* variables only"""
+    tmp_path.joinpath('conf').mkdir()
+    tmp_path.joinpath('settings.yaml').write_text('server: {}')
+    digest = settings_digest(tmp_path, environ={'HOME': '/root'})
+    assert settings_digest(tmp_path, environ={'HOME': '/home'}) == digest
+    assert settings_digest(tmp_path, environ={'ROBOTTELO_SERVER__PORT': '8443'}) != digest
+    tmp_path.joinpath('conf', 'ldap.yaml').write_text('ldap: {}')
+    assert settings_digest(tmp_path, environ={}) != digest
+
+
+@pytest.fixture
+def snapshot_root(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_ROOT', tmp_path / 'snapshots')
+    return tmp_path / 'snapshots'
+
+
+def test_settings_snapshot_roundtrip(tmp_path, snapshot_root):
+    """Settings loaded from a snapshot match the fully loaded settings"""
+    settings = lazy_settings(tmp_path)
+    digest = settings_digest(tmp_path, environ={})
+    write_snapshot(tmp_path, digest, settings.as_dict(), get_fresh=False)
+    data = read_snapshot(tmp_path, digest)
+    snapshot_settings = LazyValidatedSettings(
+        core_loaders=[], settings_file=[], envless_mode=True, lowercase_read=True
+    )
+    snapshot_settings.update(data)
+    assert snapshot_settings.as_dict() == settings.as_dict()
+    assert snapshot_settings.server.hostname == 'sat.example.com'
+    write_snapshot(tmp_path, 'newer', data, get_fresh=False)
+    assert read_snapshot(tmp_path, digest) is None
+
+
+def test_settings_snapshot_reuse(tmp_path, snapshot_root):
+    """get_fresh snapshots are only reused by xdist workers, unserializable ones not written"""
+    write_snapshot(tmp_path, 'fresh', {'SERVER': {'port': 443}}, get_fresh=True)
+    assert read_snapshot(tmp_path, 'fresh') is None
+    assert read_snapshot(tmp_path, 'fresh', worker=True) == {'SERVER': {'port': 443}}
+    write_snapshot(tmp_path, 'tuple', {'SERVER': {'ports': (80, 443)}}, get_fresh=False)
+    assert read_snapshot(tmp_path, 'tuple') is None
+
+
+def test_settings_snapshot_conf_templates(tmp_path, snapshot_root):
+    """The settings of the shipped conf templates, with integer keys, are stored privately"""
+    tmp_path.joinpath('settings.yaml').write_text('{}')
+    tmp_path.joinpath('conf').mkdir()
+    for template in Path(robottelo_root_dir, 'conf').glob('*.yaml.template'):
+        shutil.copy(template, tmp_path / 'conf' / template.name.removesuffix('.template'))
+    settings = LazyValidatedSettings(
+        core_loaders=['YAML'],
+        root_path=str(tmp_path),
+        settings_file='settings.yaml',
+        preload=['conf/*.yaml'],
+        envless_mode=True,
+        lowercase_read=True,
+    )
+    data = settings.as_dict()
+    assert 2016 in data['LDAP']['HOSTNAME']
+    digest = settings_digest(tmp_path, environ={})
+    write_snapshot(tmp_path, digest, data, get_fresh=False)
+    assert read_snapshot(tmp_path, digest) == data
+    path = snapshot_path(tmp_path, digest)
+    assert path.is_relative_to(snapshot_root)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert stat.S_IMODE(path.parent.stat().st_mode) == 0o700
+
+
+def test_configure_on_import(tmp_path, monkeypatch):
+    """The import hook configures a package right after its first import, and only once"""
+    tmp_path.joinpath('lazy_pkg').mkdir()
+    tmp_path.joinpath('lazy_pkg', '__init__.py').write_text('configured = []\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    calls = []
+    hook = _ConfigureOnImport('lazy_pkg', lambda: calls.append(sys.modules['lazy_pkg']))
+    monkeypatch.setattr(sys, 'meta_path', [hook, *sys.meta_path])
+    import lazy_pkg
+
+    assert calls == [lazy_pkg]
+    assert hook not in sys.meta_path
+    monkeypatch.delitem(sys.modules, 'lazy_pkg')
@@ -0,0 +1,124 @@
+"""Coordinate processes standing for test nodes, which share nothing but the coordination server"""
+
+import multiprocessing
+import os
+from pathlib import Path
+import tempfile
+import time
+
+import pytest
+
+from robottelo.utils import coordination
+from robottelo.utils.decorators import func_locker
+from robottelo.utils.decorators.func_shared.server_storage import ServerStorageHandler
+from robottelo.utils.shared_resource import SharedResource
+
+NODES = 4
+ROUNDS = 5
+
+
+@pytest.fixture
+def server():
+    server = coordination.CoordinationServer(host='127.0.0.1').start()
+    yield server
+    server.stop()
+
+
+def _client_args(server):
+    return server.server_address, server.token
+
+
+def run_node(address, token, target, *args):
+    coordination.configure(address, token)
+    # the nodes don't share their temporary directory
+    func_locker.LOCK_DIR = tempfile.mkdtemp()
+    target(*args)
+
+
+def run_nodes(server, target, *args):
+    ctx = multiprocessing.get_context('fork')
+    nodes = [
+        ctx.Process(target=run_node, args=(*_client_args(server), target, *args))
+        for _ in range(NODES)
+    ]
+    for node in nodes:
+        node.start()
+    for node in nodes:
+        node.join(60)
+    return [node.exitcode for node in nodes]
+
+
+@func_locker.lock_function(scope='coordination')
+def locked_increment(counter):
+    value = counter.value
+    time.sleep(0.01)
+    counter.value = value + 1
+
+
+def increment_locked_function(counter):
+    for _ in range(ROUNDS):
+        locked_increment(counter)
+
+
+def increment_shared_value():
+    handler = ServerStorageHandler()
+    for _ in range(ROUNDS):
+        with handler.lock('counter'):
+            handler.set('counter', (handler.get('counter') or 0) + 1)
+
+
+def count_action(counter):
+    with counter.get_lock():
+        counter.value += 1
+    return True
+
+
+def wait_for_action(registered, counter):
+    with SharedResource('test_coordination', count_action, counter=counter) as resource:
+        registered.wait()
+        resource.ready()
+
+
+def test_function_lock_across_nodes(server):
+    counter = multiprocessing.get_context('fork').RawValue('i', 0)
+    assert run_nodes(server, increment_locked_function, counter) == [0] * NODES
+    assert counter.value == NODES * ROUNDS
+
+
+def test_shared_value_across_nodes(server):
+    assert run_nodes(server, increment_shared_value) == [0] * NODES
+    handler = ServerStorageHandler(client=coordination.CoordinationClient(*_client_args(server)))
+    assert handler.get('counter') == NODES * ROUNDS
+
+
+def test_shared_resource_across_nodes(server):
+    ctx = multiprocessing.get_context('fork')
+    registered = ctx.Barrier(NODES, timeout=30)
+    counter = ctx.Value('i', 0)
+    assert run_nodes(server, wait_for_action, registered, counter) == [0] * NODES
+    assert counter.value == 1
+    assert not Path('/tmp/test_coordination.shared').exists()
+    assert server.state.resources['test_coordination']['removed']
+
+
+def test_locks_of_closed_connections_are_released(server):
+    ctx = multiprocessing.get_context('fork')
+
+    def acquire_and_exit():
+        client = coordination.CoordinationClient(*_client_args(server))
+        assert client.acquire('abandoned', timeout=1)
+        os._exit(0)
+
+    process = ctx.Process(target=acquire_and_exit)
+    process.start()
+    process.join()
+    client = coordination.CoordinationClient(*_client_args(server))
+    assert client.acquire('abandoned', timeout=10)
+    with pytest.raises(coordination.LockRecursionError):
+        client.acquire('abandoned', timeout=1)
+
+
+def test_invalid_token_is_rejected(server):
+    client = coordination.CoordinationClient(server.server_address, 'invalid')
+    with pytest.raises(coordination.CoordinationError, match='Invalid coordination token'):
+        client.call('get', key='counter')
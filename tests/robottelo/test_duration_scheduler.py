@@ -0,0 +1,50 @@
+import pytest
+
+from pytest_plugins.duration_scheduler import (
+    junit_key,
+    lpt_makespan,
+    predict_durations,
+    read_junit_durations,
+)
+
+JUNIT = '''<?xml version="1.0" encoding="utf-8"?>
+<testsuites><testsuite name="pytest">
+<testcase classname="tests.foreman.api.test_repo.TestRepo" name="test_sync[rhel9]" time="30.5"/>
+<testcase classname="tests.foreman.api.test_host" name="test_create" time="2"/>
+</testsuite></testsuites>
+'''
+
+
+def test_junit_durations(tmp_path):
+    """junit testcases are matched with the tests they were reported for"""
+    report = tmp_path / 'junit.xml'
+    report.write_text(JUNIT)
+    durations = read_junit_durations([report, tmp_path / 'missing.xml'])
+    assert (
+        durations[junit_key('tests/foreman/api/test_repo.py::TestRepo::test_sync[rhel9]')] == 30.5
+    )
+    assert durations[junit_key('tests/foreman/api/test_host.py::test_create')] == 2
+
+
+def test_predict_durations():
+    """Unknown tests are predicted from their module, or from the whole run"""
+    units = {
+        'test_a.py': ['test_a.py::test_1', 'test_a.py::test_2'],
+        'test_b.py': ['test_b.py::test_1'],
+        'test_c.py': ['test_c.py::test_1', 'test_c.py::test_2'],
+    }
+    predicted = predict_durations(
+        units,
+        {'test_a.py::test_1': 10, 'test_b.py::test_1': 4},
+        {junit_key('test_c.py::test_1'): 1},
+    )
+    assert predicted == {'test_a.py': 20, 'test_b.py': 4, 'test_c.py': 2}
+    assert predict_durations(units, {}) == {'test_a.py': 2, 'test_b.py': 1, 'test_c.py': 2}
+
+
+@pytest.mark.parametrize(
+    ('durations', 'workers', 'makespan'),
+    [([5, 4, 3, 3, 3], 2, 10), ([5, 4, 3, 3, 3], 3, 7), ([7], 4, 7), ([], 2, 0)],
+)
+def test_lpt_makespan(durations, workers, makespan):
+    assert lpt_makespan(durations, workers) == makespan
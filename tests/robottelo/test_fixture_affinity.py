@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+
+import pytest
+
+from pytest_plugins.fixture_affinity import affinity_groups
+
+SCOPES = {
+    'module_org': 'module',
+    'module_sat': 'module',
+    'class_host': 'class',
+    'target': 'session',
+}
+
+
+class FakeItem:
+    def __init__(self, nodeid, *fixturenames, indices=None):
+        self.nodeid = nodeid
+        self.fixturenames = fixturenames
+        self._fixtureinfo = SimpleNamespace(
+            name2fixturedefs={
+                name: [SimpleNamespace(scope=SCOPES.get(name, 'function'))] for name in fixturenames
+            }
+        )
+        if indices:
+            self.callspec = SimpleNamespace(indices=indices)
+
+    def getparent(self, cls):
+        parts = self.nodeid.split('::')
+        if cls is pytest.Module:
+            return SimpleNamespace(nodeid=parts[0])
+        if cls is pytest.Class and len(parts) == 3:
+            return SimpleNamespace(nodeid='::'.join(parts[:2]))
+        return None
+
+
+def test_affinity_groups():
+    """Tests sharing an expensive fixture instance are grouped, other tests stay alone"""
+    items = [
+        FakeItem('test_a.py::test_1', 'module_org', 'target'),
+        FakeItem('test_a.py::test_2', 'module_sat'),
+        FakeItem('test_a.py::test_3', 'module_org', 'module_sat'),
+        FakeItem('test_a.py::test_4', 'target', 'function_org'),
+        FakeItem('test_a.py::TestHost::test_5', 'class_host'),
+        FakeItem('test_a.py::TestHost::test_6', 'class_host'),
+        FakeItem('test_b.py::test_1[rhel8]', 'module_org', indices={'module_org': 0}),
+        FakeItem('test_b.py::test_1[rhel9]', 'module_org', indices={'module_org': 1}),
+        FakeItem('test_b.py::test_2', 'module_sat'),
+    ]
+    groups, users = affinity_groups(items, lambda name: name != 'module_sat')
+    assert groups['test_a.py::test_1'] == groups['test_a.py::test_3']
+    assert groups['test_a.py::test_2'] == 'test_a.py::test_2'
+    assert groups['test_a.py::test_4'] == 'test_a.py::test_4'
+    assert groups['test_a.py::TestHost::test_5'] == groups['test_a.py::TestHost::test_6']
+    assert groups['test_b.py::test_1[rhel8]'] != groups['test_b.py::test_1[rhel9]']
+    assert len(set(groups.values())) == 7
+    assert users == {
+        'test_a.py::module_org[0]': 2,
+        'test_a.py::TestHost::class_host[0]': 2,
+        'test_b.py::module_org[0]': 1,
+        'test_b.py::module_org[1]': 1,
+    }
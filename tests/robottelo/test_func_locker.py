@@ -2,10 +2,12 @@ import multiprocessing
 import os
 from pathlib import Path
 import tempfile
+import threading
 import time
 
 import pytest
 
+from pytest_plugins.func_locker_metrics import contended_locks, merge_lock_metrics
 from robottelo.utils.decorators import func_locker
 
 _this_module_name_string = 'tests.robottelo.test_func_locker'
@@ -422,3 +424,58 @@ class TestFuncLocker:
             func_locker.locking_function(simple_function_not_locked),
         ):
             pass
+
+
+def _hold_file_lock(lock_file_path, locked, release):
+    with func_locker.file_lock(lock_file_path):
+        locked.set()
+        release.wait(30)
+
+
+def test_file_lock_wakes_up_waiters(tmp_path):
+    """Waiters time out, or get the lock as soon as it is released, waits are recorded"""
+    lock_file_path = str(tmp_path / 'function.lock')
+    ctx = multiprocessing.get_context('fork')
+    locked, release = ctx.Event(), ctx.Event()
+    holder = ctx.Process(target=_hold_file_lock, args=(lock_file_path, locked, release))
+    holder.start()
+    assert locked.wait(30)
+    with (
+        pytest.raises(func_locker.FunctionLockerError),
+        func_locker.file_lock(lock_file_path, timeout=0.2),
+    ):
+        pass
+    threading.Timer(0.5, release.set).start()
+    started = time.monotonic()
+    with func_locker.file_lock(lock_file_path, timeout=30):
+        waited = time.monotonic() - started
+    holder.join(30)
+    assert 0.4 < waited < 0.6
+    metrics = func_locker.LOCK_METRICS[lock_file_path]
+    assert metrics['acquired'] == 1
+    assert metrics['max_wait'] == metrics['wait'] == pytest.approx(waited, abs=0.01)
+
+
+def test_contended_locks_report():
+    """Only the locks waited for at least MIN_REPORTED_WAIT are reported, longest wait first"""
+
+    def lock(wait, max_wait):
+        return {'acquired': 10, 'wait': wait, 'max_wait': max_wait, 'hold': 1.0}
+
+    metrics = merge_lock_metrics(
+        {'uncontended': lock(0.0, 0.0), 'brief': lock(0.5, 0.01)},
+        {'brief': lock(0.5, 0.02), 'contended': lock(3.0, 1.0), 'most': lock(60.0, 30.0)},
+    )
+    assert metrics['brief']['wait'] == 1.0
+    assert [path for path, _ in contended_locks(metrics)] == ['most', 'contended']
+
+
+def test_wait_blocking_lock_releases_abandoned_lock():
+    """A lock acquired after the timeout is released by the helper thread"""
+    lock = threading.Lock()
+    lock.acquire()
+    released = threading.Event()
+    assert not func_locker.wait_blocking_lock(lock.acquire, released.set, timeout=0.1)
+    lock.release()
+    assert released.wait(10)
+    assert func_locker.wait_blocking_lock(lambda: None, released.clear, timeout=10)
@@ -18,6 +18,7 @@ from robottelo.utils.decorators.func_shared.shared import (
     set_default_scope,
     shared,
 )
+from robottelo.utils.decorators.func_shared.sqlite_storage import SqliteStorageHandler
 
 DEFAULT_POOL_SIZE = 8
 SIMPLE_TIMEOUT_VALUE = 3
@@ -557,3 +558,45 @@ class TestFuncShared:
                 suffix=suffix, prefix=prefix, counter=counter_value
             )
             assert inc_string == inc_string_2
+
+
+def _sqlite_storage_increment(db_path, rounds):
+    """Increment the values of two keys, each under its key lock"""
+    handler = SqliteStorageHandler(db_path, lock_timeout=60)
+    for _ in range(rounds):
+        for key in ('first', 'second'):
+            with handler.lock(key):
+                handler.set(key, (handler.get(key) or 0) + 1)
+
+
+def _sqlite_storage_hold_lock(db_path, locked, release):
+    handler = SqliteStorageHandler(db_path)
+    with handler.lock('first'):
+        locked.set()
+        release.wait(30)
+
+
+def test_sqlite_storage_handler(tmp_path):
+    """Key locks serialize processes, values are shared, old values are swept"""
+    db_path = str(tmp_path / 'shared_functions.db')
+    ctx = multiprocessing.get_context('fork')
+    with ctx.Pool(DEFAULT_POOL_SIZE) as pool:
+        pool.starmap(_sqlite_storage_increment, [(db_path, 20)] * DEFAULT_POOL_SIZE)
+    handler = SqliteStorageHandler(db_path)
+    assert handler.get('first') == handler.get('second') == 20 * DEFAULT_POOL_SIZE
+    assert handler.get('third') is None
+
+    locked, release = ctx.Event(), ctx.Event()
+    holder = ctx.Process(target=_sqlite_storage_hold_lock, args=(db_path, locked, release))
+    holder.start()
+    assert locked.wait(30)
+    with pytest.raises(TimeoutError), handler.lock('first', timeout=0.2):
+        pass
+    # other keys are not locked
+    with handler.lock('second', timeout=0.2):
+        pass
+    release.set()
+    with handler.lock('first', timeout=30):
+        holder.join(30)
+    assert holder.exitcode == 0
+    assert handler.sweep(max_age=0) == 2
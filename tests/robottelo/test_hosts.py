@@ -0,0 +1,49 @@
+from broker.helpers import Result
+from packaging.version import Version
+import pytest
+
+from robottelo import hosts
+
+
+@pytest.fixture
+def satellites(monkeypatch):
+    """Stand in for the configured Satellite, return the instances created"""
+    created = []
+
+    class FakeSatellite:
+        version = '6.17.1'
+        os_version = Version('9.6')
+
+        def __init__(self):
+            created.append(self)
+
+        def execute(self, command):
+            return Result(
+                status=0, stdout='rubygem-foreman_rh_cloud\nrubygem-foreman_ansible\n', stderr=''
+            )
+
+    monkeypatch.setattr(hosts, 'Satellite', FakeSatellite)
+    monkeypatch.setattr(hosts, 'SAT_FACTS', None)
+    return created
+
+
+def test_sat_facts_gathered_once(satellites):
+    """The version helpers return the facts gathered once, from a single Satellite"""
+    assert hosts.get_sat_version() == Version('6.17.1')
+    assert hosts.get_sat_version().minor == 17
+    assert hosts.get_sat_rhel_version().major == 9
+    assert hosts.get_sat_facts()['plugins'] == [
+        'rubygem-foreman_ansible',
+        'rubygem-foreman_rh_cloud',
+    ]
+    assert len(satellites) == 1
+
+
+def test_sat_facts_handed_over(satellites):
+    """Facts handed over by the xdist controller are used without connecting to the Satellite"""
+    hosts.set_sat_facts(
+        {'version': '6.16.0', 'rhel_version': '8.10', 'network_type': 'ipv4', 'plugins': []}
+    )
+    assert hosts.get_sat_version() == Version('6.16.0')
+    assert hosts.get_sat_rhel_version() == Version('8.10')
+    assert not satellites
@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+
+from robottelo.config import settings
+from robottelo.logging import robottelo_root_dir
+
+# imported on first use only, UI tests, cloud provider fixtures and apidoc respectively
+LAZY_MODULES = ('airgun', 'selenium', 'wrapanapi', 'apypie')
+IMPORT_HOSTS = '''
+import json, sys, time
+start = time.perf_counter()
+import robottelo.hosts
+print(json.dumps({'seconds': time.perf_counter() - start, 'modules': sorted(sys.modules)}))
+'''
+
+
+def test_import_time_budget():
+    """Importing robottelo.hosts stays within robottelo.import_time_budget
+
+    Run ``scripts/import_benchmark.py`` to find the modules responsible for a regression.
+    """
+    result = subprocess.run(
+        [sys.executable, '-c', IMPORT_HOSTS],
+        cwd=robottelo_root_dir,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = json.loads(result.stdout.splitlines()[-1])
+    eager = {name.split('.')[0] for name in imported['modules']} & set(LAZY_MODULES)
+    assert not eager, f'robottelo.hosts imports {sorted(eager)} eagerly'
+    assert imported['seconds'] <= settings.robottelo.import_time_budget, (
+        f'import robottelo.hosts took {imported["seconds"]:.2f}s, '
+        f'budget is {settings.robottelo.import_time_budget}s'
+    )
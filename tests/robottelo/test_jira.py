@@ -0,0 +1,322 @@
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+from threading import Event, Lock, Thread, enumerate as threads
+import time
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+from box import Box
+import pytest
+
+from pytest_plugins import jira_comments
+from pytest_plugins.issue_handlers import referenced_issue_ids
+from robottelo.logging import robottelo_root_dir
+from robottelo.utils.issue_handlers import jira
+
+SEARCH_RESPONSE = robottelo_root_dir / 'tests/robottelo/data/jira_search_response.json'
+# the expressions sanitized_issue_data evaluated before the fields were compiled
+EVAL_FIELDS = {
+    'key': "{obj_name}['key']",
+    'summary': "{obj_name}['fields']['summary']",
+    'status': "{obj_name}['fields']['status']['name']",
+    'labels': "{obj_name}['fields']['labels']",
+    'resolution': "{obj_name}['fields']['resolution']['name'] "
+    "if {obj_name}['fields']['resolution'] else ''",
+    'fixVersions': "[ver['name'] for ver in {obj_name}['fields']['fixVersions']] "
+    "if {obj_name}['fields']['fixVersions'] else []",
+    'customfield_12313440': "{obj_name}['fields']['customfield_12313440']",
+}
+
+
+class JiraHandler(BaseHTTPRequestHandler):
+    """Jira search API returning at most 3 issues per page, rate limiting the first request
+
+    Issues are in the ``statuses`` status, New by default, and only the ``updated`` issues match
+    ``updated >=`` conditions. Label updates and comments are recorded in ``updates``.
+    """
+
+    page_limit = 3
+    lock = Lock()
+    requests = []
+    rate_limited = False
+    statuses = {}
+    updated = set()
+    updates = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with JiraHandler.lock:
+            JiraHandler.requests.append(query)
+            rate_limit = not JiraHandler.rate_limited
+            JiraHandler.rate_limited = True
+        if rate_limit:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        match = re.fullmatch(r'key in \((.*)\)( AND updated >= "-\d+m")?', query['jql'])
+        keys = match.group(1).split(', ')
+        if match.group(2):
+            keys = [key for key in keys if key in self.updated]
+        start = int(query['startAt'])
+        size = min(int(query['maxResults']), self.page_limit)
+        issues = [
+            {
+                'key': key,
+                'fields': {
+                    'summary': f'{key} summary',
+                    'status': {'name': self.statuses.get(key, 'New')},
+                    'labels': [],
+                    'resolution': None,
+                    'fixVersions': [{'name': 'sat-6.17.0'}],
+                },
+            }
+            for key in keys[start : start + size]
+        ]
+        body = json.dumps(
+            {'startAt': start, 'maxResults': size, 'total': len(keys), 'issues': issues}
+        ).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with JiraHandler.lock:
+            JiraHandler.updates.append((self.command, urlparse(self.path).path, body))
+        self.send_response(200 if self.command == 'PUT' else 201)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_POST = do_PUT
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def jira_server(monkeypatch):
+    JiraHandler.requests = []
+    JiraHandler.rate_limited = False
+    JiraHandler.statuses = {}
+    JiraHandler.updated = set()
+    JiraHandler.updates = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JiraHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        jira,
+        'settings',
+        Box(
+            jira={
+                'url': f'http://127.0.0.1:{server.server_port}',
+                'api_key': 'token',
+                'delta_sync': False,
+            }
+        ),
+    )
+    yield server
+    server.shutdown()
+
+
+def test_search_jira_pages(jira_server, monkeypatch):
+    """Issues are fetched in bounded queries, every page is fetched and merged"""
+    monkeypatch.setattr(jira, 'JIRA_BATCH_SIZE', 4)
+    issue_ids = [f'SAT-{number}' for number in range(1, 11)]
+    issues = jira.search_jira(issue_ids, jira.common_jira_fields)
+    assert [issue['key'] for issue in issues] == issue_ids
+    # one rate limited request, then 3 queries with 4, 4 and 2 issues in pages of 3
+    searches = {(query['jql'], query['startAt']) for query in JiraHandler.requests[1:]}
+    assert searches == {
+        ('key in (SAT-1, SAT-2, SAT-3, SAT-4)', '0'),
+        ('key in (SAT-1, SAT-2, SAT-3, SAT-4)', '3'),
+        ('key in (SAT-5, SAT-6, SAT-7, SAT-8)', '0'),
+        ('key in (SAT-5, SAT-6, SAT-7, SAT-8)', '3'),
+        ('key in (SAT-9, SAT-10)', '0'),
+    }
+    assert len(JiraHandler.requests) == 6
+    assert jira.sanitized_issue_data(issues[0], jira.common_jira_fields) == {
+        'key': 'SAT-1',
+        'summary': 'SAT-1 summary',
+        'status': 'New',
+        'labels': [],
+        'resolution': '',
+        'fixVersions': ['sat-6.17.0'],
+    }
+
+
+def test_sanitized_issue_data_matches_eval():
+    """Compiled field extractors return what the evaluated field expressions returned"""
+    fields = list(jira.mapped_response_fields)
+    for issue in json.loads(SEARCH_RESPONSE.read_text())['issues']:
+        expected = {field: eval(EVAL_FIELDS[field].format(obj_name=issue)) for field in fields}
+        assert jira.sanitized_issue_data(issue, fields) == expected
+
+
+def _update_cache(cache_db, worker):
+    cache = jira.JiraStatusCache(cache_db, cache_db.with_suffix('.json'), cache_ttl_days=7)
+    for number in range(50):
+        cache.update(f'SAT-{number}', {'key': f'SAT-{number}', 'worker': worker})
+        cache.update(f'SAT-{worker}-{number}', {'key': f'SAT-{worker}-{number}'})
+
+
+def test_jira_status_cache(tmp_path):
+    """The JSON cache is imported once, expired entries are ignored, processes share updates"""
+    cache_db, cache_file = tmp_path / 'jira.db', tmp_path / 'jira.json'
+    now = time.time()
+    cache_file.write_text(
+        json.dumps(
+            {
+                'issues': {
+                    'SAT-1': {'data': {'key': 'SAT-1', 'status': 'New'}, 'timestamp': now},
+                    'SAT-2': {'data': {'key': 'SAT-2'}, 'timestamp': now - 8 * 86400},
+                }
+            }
+        )
+    )
+    cache = jira.JiraStatusCache(cache_db, cache_file, cache_ttl_days=7)
+    assert cache.get('SAT-1')['data'] == {'key': 'SAT-1', 'status': 'New'}
+    assert cache.get_many(['SAT-1', 'SAT-2', 'SAT-3']).keys() == {'SAT-1', 'SAT-2', 'SAT-3'}
+    assert cache.get('SAT-2') is None
+    cache.update('SAT-2', {'key': 'SAT-2', 'status': 'Closed'})
+    assert cache.get('SAT-2')['data'] == {'key': 'SAT-2', 'status': 'Closed'}
+    # changes of the JSON file are not imported again
+    cache_file.write_text(json.dumps({'issues': {'SAT-4': {'data': {}, 'timestamp': now}}}))
+    assert jira.JiraStatusCache(cache_db, cache_file, cache_ttl_days=7).get('SAT-4') is None
+
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(_update_cache, [cache_db] * 4, range(4)))
+    issues = cache.get_many(
+        [f'SAT-{worker}-{number}' for worker in range(4) for number in range(50)]
+    )
+    assert all(issues.values())
+    assert cache.get('SAT-49')['data']['worker'] in range(4)
+
+
+def test_sync_jira_cache(jira_server, monkeypatch, tmp_path):
+    """Only the issues updated since the last sync are refreshed, missing issues are fetched"""
+    cache = jira.JiraStatusCache(tmp_path / 'jira.db', tmp_path / 'jira.json', cache_ttl_days=7)
+    monkeypatch.setattr(jira, 'jira_cache', cache)
+    assert cache.last_sync is None
+    assert jira.sync_jira_cache(['SAT-1', 'SAT-2']).keys() == {'SAT-1', 'SAT-2'}
+    assert cache.last_sync is not None
+
+    JiraHandler.requests = []
+    JiraHandler.statuses = {'SAT-1': 'Closed', 'SAT-2': 'Closed'}
+    JiraHandler.updated = {'SAT-2'}
+    refreshed = jira.sync_jira_cache(['SAT-1', 'SAT-2', 'SAT-3'])
+    assert {key: data['status'] for key, data in refreshed.items()} == {
+        'SAT-2': 'Closed',
+        'SAT-3': 'New',
+    }
+    assert [query['jql'] for query in JiraHandler.requests] == [
+        'key in (SAT-1, SAT-2) AND updated >= "-2m"',
+        'key in (SAT-3)',
+    ]
+    assert cache.get('SAT-1')['data']['status'] == 'New'
+    assert cache.get('SAT-2')['data']['status'] == 'Closed'
+
+
+def test_resolve_and_preload_jira_issues(jira_server, monkeypatch, tmp_path):
+    """Issues are resolved in one search, preloaded data is used without calling Jira"""
+    cache = jira.JiraStatusCache(tmp_path / 'jira.db', tmp_path / 'jira.json', cache_ttl_days=7)
+    monkeypatch.setattr(jira, 'jira_cache', cache)
+    monkeypatch.setattr(jira, 'CACHED_RESPONSES', jira.defaultdict(dict))
+    JiraHandler.statuses = {'SAT-2': 'Closed'}
+    issue_data = jira.resolve_jira_issues(['SAT-2', 'SAT-1', 'SAT-2'])
+    assert issue_data.keys() == {'SAT-1', 'SAT-2'}
+    assert [query['jql'] for query in JiraHandler.requests[1:]] == ['key in (SAT-1, SAT-2)']
+
+    # a worker, with its own empty cache and no access to Jira
+    worker_cache = jira.JiraStatusCache(tmp_path / 'w.db', tmp_path / 'w.json', cache_ttl_days=7)
+    monkeypatch.setattr(jira, 'jira_cache', worker_cache)
+    monkeypatch.setattr(jira, 'CACHED_RESPONSES', jira.defaultdict(dict))
+    jira_server.shutdown()
+    jira.preload_jira_data(json.loads(json.dumps(issue_data)))
+    assert jira.is_open_jira('SAT-1')
+    assert not jira.is_open_jira('SAT-2')
+
+
+def test_referenced_issue_ids(tmp_path):
+    """Issue ids are read from the sources of the test paths"""
+    (tmp_path / 'tests').mkdir()
+    (tmp_path / 'tests/test_a.py').write_text(
+        "def test_a():\n    \"\"\":BlockedBy: SAT-1\n\n    :Verifies: SAT-2\"\"\"\n"
+    )
+    (tmp_path / 'tests/test_b.py').write_text(
+        "@pytest.mark.skip_if_open('SAT-3')\ndef test_b():\n    assert is_open('SAT-4')\n"
+    )
+    config = SimpleNamespace(
+        args=['tests/test_a.py::test_a'],
+        rootpath=tmp_path,
+        invocation_params=SimpleNamespace(dir=tmp_path),
+    )
+    assert referenced_issue_ids(config) == {'SAT-1', 'SAT-2'}
+    config.args = []
+    assert referenced_issue_ids(config) == {'SAT-1', 'SAT-2', 'SAT-3', 'SAT-4'}
+
+
+def test_jira_comment_publisher(jira_server, monkeypatch):
+    """Results are aggregated per issue and commented once per issue, with labels"""
+    monkeypatch.setattr(pytest, 'jira_comments', True, raising=False)
+    monkeypatch.setitem(jira.settings.jira, 'enable_comment', True)
+    monkeypatch.setitem(jira_comments.settings.jira, 'issue_status', ['Testing'])
+    monkeypatch.setitem(jira_comments.settings.server.version, 'release', '6.17')
+    monkeypatch.setitem(jira_comments.settings.server.version, 'snap', 1)
+    monkeypatch.setattr(jira, 'CACHED_RESPONSES', jira.defaultdict(dict))
+    jira.preload_jira_data(
+        {
+            'SAT-1': {'key': 'SAT-1', 'status': 'Testing', 'labels': []},
+            'SAT-2': {'key': 'SAT-2', 'status': 'Testing', 'labels': ['tests-passed']},
+            'SAT-3': {'key': 'SAT-3', 'status': 'New', 'labels': []},
+        }
+    )
+    publisher = jira_comments.JiraCommentPublisher(timeout=30)
+    for nodeid, issues, outcome in [
+        ('tests/test_a.py::test_a[1]', ['SAT-1', 'SAT-2'], 'passed'),
+        ('tests/test_a.py::test_b', ['SAT-1'], 'failed'),
+        ('tests/test_a.py::test_c', ['SAT-2', 'SAT-3'], 'passed'),
+    ]:
+        publisher.pytest_runtest_logreport(
+            SimpleNamespace(
+                when='teardown', nodeid=nodeid, jira_issues=issues, jira_outcome=outcome
+            )
+        )
+    publisher.pytest_sessionfinish(SimpleNamespace(config=SimpleNamespace()))
+    summary = publisher.wait()
+    assert summary.startswith('jira comments: 1 posted, 2 not needed, 0 failed, 0 not posted')
+    (put, label_path, labels), (post, comment_path, comment) = JiraHandler.updates
+    assert (put, label_path) == ('PUT', '/rest/api/latest/issue/SAT-1/')
+    assert labels == {'update': {'labels': [{'add': 'tests-failed'}, {'remove': 'tests-passed'}]}}
+    assert (post, comment_path) == ('POST', '/rest/api/latest/issue/SAT-1/comment')
+    assert comment['body'].endswith(
+        'tests/test_a.py::test_b : {color:red}failed{color} \n'
+        'tests/test_a.py::test_a\\[1\\] : {color:green}passed{color} \n'
+    )
+
+
+def test_jira_comment_publisher_timeout(monkeypatch):
+    """Comments still being posted after the timeout don't keep the process running"""
+    release = Event()
+    monkeypatch.setattr(
+        jira_comments.JiraCommentPublisher, 'publish', lambda self, issue, tests: release.wait(30)
+    )
+    publisher = jira_comments.JiraCommentPublisher(timeout=0.2)
+    publisher.pytest_runtest_logreport(
+        SimpleNamespace(
+            when='teardown', nodeid='test_a', jira_issues=['SAT-1'], jira_outcome='passed'
+        )
+    )
+    publisher.pytest_sessionfinish(SimpleNamespace(config=SimpleNamespace()))
+    try:
+        assert '1 not posted within 0.2s' in publisher.wait()
+        assert all(thread.daemon for thread in threads() if thread.name.startswith('jira-comments'))
+    finally:
+        release.set()
@@ -0,0 +1,73 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+from threading import Thread
+
+from box import Box
+import pytest
+
+from robottelo.utils.ohsnap import OhsnapSession, dogfood_repository
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Ohsnap API answering with an ETag and ``304 Not Modified`` on a matching If-None-Match"""
+
+    requests = []
+
+    def do_GET(self):
+        Handler.requests.append((self.path, self.headers.get('If-None-Match')))
+        if not self.path.startswith('/api/'):
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        baseurl = f'http://127.0.0.1:{self.server.server_port}/sat/$basearch'
+        body = json.dumps([{'label': 'satellite', 'baseurl': baseurl}]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ohsnap():
+    Handler.requests = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield Box(
+        host=f'http://127.0.0.1:{server.server_port}',
+        request_retry={'timeout': 5, 'delay': 1},
+    )
+    server.shutdown()
+
+
+def test_ohsnap_session_revalidation(ohsnap):
+    """Cached responses are revalidated and not modified repositories are not checked again"""
+    cache = {}
+    with OhsnapSession(cache) as session:
+        repo = dogfood_repository(
+            ohsnap, 'satellite', 'satellite', '6.17.0', '9', snap='1.0', session=session
+        )
+    assert repo.baseurl == f'{ohsnap.host}/sat/x86_64'
+    assert [url for url, _ in Handler.requests] == [
+        '/api/releases/6.17.0/1.0/el9/satellite/repositories',
+        '/sat/x86_64',
+    ]
+    assert list(cache.values())[0]['etag'] == '"v1"'
+
+    Handler.requests = []
+    with OhsnapSession(cache) as session:
+        repo = dogfood_repository(
+            ohsnap, 'satellite', 'satellite', '6.17.0', '9', snap='1.0', session=session
+        )
+    assert repo.baseurl == f'{ohsnap.host}/sat/x86_64'
+    assert Handler.requests == [('/api/releases/6.17.0/1.0/el9/satellite/repositories', '"v1"')]
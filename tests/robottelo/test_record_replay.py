@@ -0,0 +1,125 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import subprocess
+import sys
+from threading import Thread
+
+from broker.helpers import Result
+import pytest
+import requests
+
+from robottelo.logging import robottelo_root_dir
+from robottelo.utils.record_replay import CassetteError, use_cassette
+
+CONFTEST = '''
+pytest_plugins = ['pytest_plugins.record_replay']
+'''
+TEST_MODULE = '''
+def test_recorded():
+    pass
+
+
+def test_not_recorded():
+    pass
+'''
+
+
+class FakeHost:
+    """Stand-in for ContentHost counting executed commands"""
+
+    executed = 0
+
+    def __init__(self, hostname):
+        self.hostname = hostname
+
+    def execute(self, command, timeout=None):
+        FakeHost.executed += 1
+        return Result(status=0, stdout=f'ran {command}', stderr='')
+
+
+class Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        Handler.hits += 1
+        body = f'{{"path": "{self.path}", "hits": {Handler.hits}}}'.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    Handler.hits = 0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def test_record_and_replay(http_server, tmp_path):
+    """Replayed calls return the recorded responses without reaching the server or host"""
+    cassette = tmp_path / 'test.json.gz'
+    targets = [(FakeHost, 'execute')]
+    FakeHost.executed = 0
+    with use_cassette(cassette, mode='record', ssh_targets=targets) as recorded:
+        first = requests.get(f'{http_server}/api/status').json()
+        second = requests.get(f'{http_server}/api/status').json()
+        result = FakeHost('sat.example.com').execute('hammer ping')
+    assert len(recorded.interactions) == 3
+    assert cassette.exists()
+    assert FakeHost.__dict__['execute'].__name__ == 'execute'
+
+    with use_cassette(cassette, mode='replay', ssh_targets=targets) as replayed:
+        assert requests.get(f'{http_server}/api/status').json() == first
+        assert requests.get(f'{http_server}/api/status').json() == second
+        replayed_result = FakeHost('sat.example.com').execute('hammer ping')
+    assert replayed.played == 3
+    assert Handler.hits == 2
+    assert FakeHost.executed == 1
+    assert (replayed_result.status, replayed_result.stdout) == (result.status, result.stdout)
+
+
+def test_replay_missing_interaction(http_server, tmp_path):
+    """Replaying a call that was not recorded raises CassetteError"""
+    cassette = tmp_path / 'test.json.gz'
+    with use_cassette(cassette, mode='record', ssh_targets=[]):
+        requests.get(f'{http_server}/api/status')
+    with (
+        use_cassette(cassette, mode='replay', ssh_targets=[]),
+        pytest.raises(CassetteError),
+    ):
+        requests.get(f'{http_server}/api/hosts')
+
+
+def run_recorded_tests(path, *args):
+    return subprocess.run(
+        [sys.executable, '-m', 'pytest', '-rs', '-p', 'no:cacheprovider', *args],
+        cwd=path,
+        env={**os.environ, 'PYTHONPATH': str(robottelo_root_dir)},
+        capture_output=True,
+        text=True,
+    )
+
+
+def test_replay_missing_cassette(tmp_path):
+    """A test without a cassette is skipped in replay mode, the other tests still run"""
+    (tmp_path / 'conftest.py').write_text(CONFTEST)
+    (tmp_path / 'test_module.py').write_text(TEST_MODULE)
+    recorded = run_recorded_tests(tmp_path, '--record-mode', 'record', '-k', 'test_recorded')
+    assert recorded.returncode == 0, recorded.stdout
+    assert (tmp_path / 'cassettes' / 'test_module.py' / 'test_recorded.json.gz').exists()
+
+    replayed = run_recorded_tests(tmp_path, '--record-mode', 'replay')
+    assert replayed.returncode == 0, replayed.stdout
+    assert 'INTERNALERROR' not in replayed.stdout
+    assert '1 passed, 1 skipped' in replayed.stdout
+    assert 'No cassette to replay: cassettes/test_module.py/test_not_recorded.json.gz' in (
+        replayed.stdout
+    )
+    assert '1 tests skipped without a cassette' in replayed.stdout
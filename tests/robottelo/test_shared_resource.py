@@ -23,6 +23,18 @@ def run_resource(resource_name):
         time.sleep(1)  # simulate cleanup actions
 
 
+def count_action(counter):
+    with counter.get_lock():
+        counter.value += 1
+    return True
+
+
+def wait_for_action(resource_name, registered, counter):
+    with SharedResource(resource_name, count_action, counter=counter) as resource:
+        registered.wait()
+        resource.ready()
+
+
 def test_shared_resource():
     """Test the SharedResource class."""
 
@@ -67,3 +79,26 @@ def test_shared_resource_multithreading():
     t2.join()
 
     assert not Path("/tmp/test_resource_th.shared").exists()
+
+
+def test_shared_resource_many_watchers():
+    """Test the watchers are woken up as soon as the action is done, not polling the resource."""
+    ctx = multiprocessing.get_context("fork")
+    registered = ctx.Barrier(8, timeout=30)
+    counter = ctx.Value("i", 0)
+    watchers = [
+        ctx.Process(target=wait_for_action, args=("test_resource_many", registered, counter))
+        for _ in range(8)
+    ]
+    start = time.monotonic()
+    for watcher in watchers:
+        watcher.start()
+    for watcher in watchers:
+        watcher.join()
+
+    # the non-main watchers would wait the 60s resource wait to see the main status change
+    assert time.monotonic() - start < 30
+    assert [watcher.exitcode for watcher in watchers] == [0] * 8
+    assert counter.value == 1
+    assert not Path("/tmp/test_resource_many.shared").exists()
+    assert not Path("/tmp/test_resource_many.shared.notify").exists()
@@ -0,0 +1,101 @@
+import importlib.util
+import inspect
+import os
+import textwrap
+
+from robottelo.utils.source_index import SourceScanCache, docstrings, function_sources
+
+SOURCE = textwrap.dedent(
+    '''
+    """Module docstring
+
+    :CaseComponent: Repositories
+    """
+    import pytest
+
+    if True:
+
+        @pytest.mark.tier1
+        def test_conditional():
+            """Conditionally defined
+
+                :CaseImportance: High
+            """
+
+
+    class TestClass:
+        """Class docstring"""
+
+        def test_method(self):
+            """  Method docstring"""
+
+        class TestNested:
+            def test_undocumented(self):
+                pass
+
+            def test_nested(self):
+                """Nested"""
+    '''
+)
+
+
+def test_docstrings_match_inspect():
+    """Statically read docstrings are those inspect.getdoc returns at runtime"""
+    namespace = {}
+    exec(compile(SOURCE, 'test_module.py', 'exec'), namespace)
+    found = docstrings(SOURCE)
+    assert set(found) == {
+        '',
+        'test_conditional',
+        'TestClass',
+        'TestClass.test_method',
+        'TestClass.TestNested.test_nested',
+    }
+    assert found[''] == inspect.cleandoc(namespace['__doc__'])
+    assert found['test_conditional'] == inspect.getdoc(namespace['test_conditional'])
+    assert found['TestClass.test_method'] == inspect.getdoc(namespace['TestClass'].test_method)
+    nested = namespace['TestClass'].TestNested.test_nested
+    assert found[nested.__qualname__] == inspect.getdoc(nested)
+
+
+def test_function_sources_match_inspect(tmp_path):
+    """Statically extracted function sources are those inspect.getsource returns"""
+    path = tmp_path / 'scanned_module.py'
+    path.write_text(SOURCE)
+    spec = importlib.util.spec_from_file_location('scanned_module', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    found = function_sources(path.read_text())
+    for function in (
+        module.test_conditional,
+        module.TestClass.test_method,
+        module.TestClass.TestNested.test_undocumented,
+    ):
+        assert found[function.__qualname__] == inspect.getsource(function)
+
+
+def test_source_scan_cache(tmp_path):
+    """Files are scanned again only when their content changes, also across instances"""
+    source = tmp_path / 'test_module.py'
+    source.write_text(SOURCE)
+    scanned = []
+
+    def scanner(text):
+        scanned.append(text)
+        return sorted(docstrings(text))
+
+    cache = SourceScanCache('docs', scanner, cache_dir=tmp_path / 'cache')
+    assert cache.get(source) == cache.get(source)
+    cache.save()
+    assert len(scanned) == 1
+
+    # a touched but unchanged file is only hashed
+    os.utime(source, ns=(0, 0))
+    cache = SourceScanCache('docs', scanner, cache_dir=tmp_path / 'cache')
+    assert '' in cache.get(source)
+    assert len(scanned) == 1
+
+    source.write_text('"""Changed"""')
+    cache = SourceScanCache('docs', scanner, cache_dir=tmp_path / 'cache')
+    assert cache.get(source) == ['']
+    assert len(scanned) == 2
@@ -0,0 +1,76 @@
+import pytest
+import requests
+
+from robottelo.cli import hammer
+from robottelo.cli.org import Org
+from robottelo.utils.standin import SatelliteStandin
+
+
+@pytest.fixture
+def standin():
+    with SatelliteStandin(task_polls=2) as standin:
+        yield standin
+
+
+def test_standin_api_crud(standin):
+    """Entities can be created, searched, updated and deleted through the API"""
+    org = requests.post(
+        f'{standin.url}/api/v2/organizations', json={'organization': {'name': 'org one'}}
+    ).json()
+    assert org['label'] == 'org_one'
+    product = requests.post(
+        f'{standin.url}/katello/api/v2/products',
+        json={'name': 'prod', 'organization_id': org['id']},
+    ).json()
+    assert product['organization'] == {'id': org['id'], 'name': 'org one'}
+    found = requests.get(
+        f'{standin.url}/katello/api/v2/products', json={'search': 'name="prod"'}
+    ).json()
+    assert found['subtotal'] == 1
+    assert found['results'][0]['id'] == product['id']
+    updated = requests.put(
+        f'{standin.url}/katello/api/v2/products/{product["id"]}', json={'description': 'new'}
+    ).json()
+    assert updated['description'] == 'new'
+    assert requests.delete(f'{standin.url}/katello/api/v2/products/{product["id"]}').ok
+    response = requests.get(f'{standin.url}/katello/api/v2/products/{product["id"]}')
+    assert response.status_code == 404
+
+
+def test_standin_task_polling(standin):
+    """Repository sync returns a task which stays running for task_polls reads"""
+    repo = standin.state.create('repositories', {'name': 'repo'})
+    response = requests.post(f'{standin.url}/katello/api/v2/repositories/{repo["id"]}/sync')
+    assert response.status_code == 202
+    task_id = response.json()['id']
+    states = [
+        requests.get(f'{standin.url}/foreman_tasks/api/tasks/{task_id}').json()['state']
+        for _ in range(3)
+    ]
+    assert states == ['running', 'running', 'stopped']
+
+
+def test_standin_hammer_formats(standin):
+    """Hammer shim output is parsed by the robottelo hammer helpers"""
+    created = standin.execute(
+        'hammer -v -u admin -p changeme --output=csv organization create --name="org"'
+    )
+    assert created.status == 0
+    org_id = hammer.parse_csv(created.stdout)[0]['id']
+    info = hammer.parse_info(standin.execute(f'hammer organization info --id="{org_id}"').stdout)
+    assert info['name'] == 'org'
+    listed = standin.execute('hammer --output=json organization list --search="name=org"')
+    assert hammer.parse_json(listed.stdout)[0]['id'] == org_id
+    missing = standin.execute('hammer organization info --id="999"')
+    assert missing.status == 65
+    assert standin.execute('rpm -q --qf "%{VERSION}" satellite').stdout == standin.version
+
+
+def test_standin_cli_end_to_end(standin):
+    """robottelo.cli entities run against the stand-in through ContentHost.execute"""
+    with standin.patch_hosts():
+        org_cli = type('Org', (Org,), {'hostname': standin.hostname})
+        org = org_cli.create({'name': 'cli org'})
+        assert org['name'] == 'cli org'
+        assert org_cli.exists(search=('name', 'cli org'))['id'] == org['id']
+        assert standin.state.find('organizations', 'cli org')['id'] == int(org['id'])